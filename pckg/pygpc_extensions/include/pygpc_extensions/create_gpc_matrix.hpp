@@ -1,6 +1,7 @@
 #ifndef PYGPC_EXTENSIONS_CREATE_GPC_MATRIX_H
 #define PYGPC_EXTENSIONS_CREATE_GPC_MATRIX_H
 
+#include <vector>
 
 template<typename T, typename U>
 int create_gpc_matrix_omp_t(T* ptr_arguments, T* ptr_coeffs, T* ptr_result,
@@ -89,5 +90,89 @@ int create_gpc_matrix_cpu_t(T* ptr_arguments, T* ptr_coeffs, T* ptr_result,
     return 0;
 }
 
+template<typename T, typename U>
+void create_gpc_matrix_gradient_row_t(T* ptr_arguments, T* ptr_coeffs,
+    T* ptr_result, T* ptr_values, T* ptr_derivatives, U n_dim, U n_basis)
+{
+    // coefficients of every basis function and dimension are stored as
+    // [order, coeffs (highest first), order_der, coeffs_der (highest first)]
+    T* local_ptr_coeffs = ptr_coeffs;
+    for(U i_basis = 0; i_basis < n_basis; ++i_basis) {
+        // evaluate every univariate polynomial and its derivative once
+        for(U i_dim = 0; i_dim < n_dim; ++i_dim) {
+            // get argument
+            T argument = ptr_arguments[i_dim];
+            // use horners method to evaluate the polynomial
+            U n_order = static_cast<U>(*local_ptr_coeffs++);
+            T evaluation_result = *local_ptr_coeffs++;
+            for(U i_coeff = 0; i_coeff < n_order; ++i_coeff) {
+                evaluation_result = evaluation_result*argument +
+                    *local_ptr_coeffs++;
+            }
+            // use horners method to evaluate the derivative
+            n_order = static_cast<U>(*local_ptr_coeffs++);
+            T evaluation_result_der = *local_ptr_coeffs++;
+            for(U i_coeff = 0; i_coeff < n_order; ++i_coeff) {
+                evaluation_result_der = evaluation_result_der*argument +
+                    *local_ptr_coeffs++;
+            }
+            ptr_values[i_dim] = evaluation_result;
+            ptr_derivatives[i_dim] = evaluation_result_der;
+        }
+        // partial derivative i_grad is the product of the derivative in i_grad
+        // and the values in all other dimensions, which is determined from
+        // prefix and suffix products of the values (no division by zero)
+        T* local_ptr_result = ptr_result + i_basis * n_dim;
+        T accumulated_result = 1;
+        for(U i_grad = 0; i_grad < n_dim; ++i_grad) {
+            local_ptr_result[i_grad] = accumulated_result *
+                ptr_derivatives[i_grad];
+            accumulated_result *= ptr_values[i_grad];
+        }
+        accumulated_result = 1;
+        for(U i_grad = n_dim; i_grad-- > 0;) {
+            local_ptr_result[i_grad] *= accumulated_result;
+            accumulated_result *= ptr_values[i_grad];
+        }
+    }
+}
+
+template<typename T, typename U>
+int create_gpc_matrix_gradient_omp_t(T* ptr_arguments, T* ptr_coeffs,
+    T* ptr_result, U n_arguments, U n_dim, U n_basis)
+{
+
+    #pragma omp parallel
+    {
+        std::vector<T> values(n_dim);
+        std::vector<T> derivatives(n_dim);
+
+        #pragma omp for schedule(static)
+        for(U i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
+            create_gpc_matrix_gradient_row_t<T, U>(
+                ptr_arguments + i_arguments * n_dim, ptr_coeffs,
+                ptr_result + i_arguments * n_basis * n_dim, values.data(),
+                derivatives.data(), n_dim, n_basis);
+        }
+    }
+    return 0;
+}
+
+template<typename T, typename U>
+int create_gpc_matrix_gradient_cpu_t(T* ptr_arguments, T* ptr_coeffs,
+    T* ptr_result, U n_arguments, U n_dim, U n_basis)
+{
+    std::vector<T> values(n_dim);
+    std::vector<T> derivatives(n_dim);
+
+    for(U i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
+        create_gpc_matrix_gradient_row_t<T, U>(
+            ptr_arguments + i_arguments * n_dim, ptr_coeffs,
+            ptr_result + i_arguments * n_basis * n_dim, values.data(),
+            derivatives.data(), n_dim, n_basis);
+    }
+    return 0;
+}
+
 
 #endif
@@ -1,33 +1,40 @@
 #ifndef PYGPC_EXTENSIONS_GET_APPROXIMATION_H
 #define PYGPC_EXTENSIONS_GET_APPROXIMATION_H
 
-#include <cstdio>
 
-template<typename T>
-int get_approximation_cpu_t(T* ptr_arguments, T* ptr_poly_coeffs,
-    T* ptr_gpc_coeffs, T* ptr_result, long int n_arguments, long int n_dim,
-    long int n_basis, long int n_gpc_coeffs) {
-    
-    for(long int i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
-        long int i_basis = 0;
+template<typename T, typename U>
+int get_approximation_omp_t(T* ptr_arguments, T* ptr_poly_coeffs,
+    T* ptr_gpc_coeffs, T* ptr_result, U n_arguments, U n_dim,
+    U n_basis, U n_gpc_coeffs)
+{
+
+    #pragma omp parallel for schedule(static)
+    for(U i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
+        U i_basis = 0;
         T* local_ptr_poly_coeffs = ptr_poly_coeffs;
+        T* local_ptr_result = ptr_result + i_arguments * n_gpc_coeffs;
+        // initialize row of result with zeros
+        for(U i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
+            ++i_gpc_coeffs) {
+            local_ptr_result[i_gpc_coeffs] = 0;
+        }
         while(i_basis != n_basis) {
-            long int i_dim = 0;
+            U i_dim = 0;
             T accumulated_result = 1;
             while(i_dim != n_dim) {
                 // get argument
                 T argument = ptr_arguments[i_arguments * n_dim + i_dim];
                 // get order of polynomial
-                // then to to first (highest) coefficient 
-                long int n_order = static_cast<long int>
+                // then to to first (highest) coefficient
+                U n_order = static_cast<U>
                     (*local_ptr_poly_coeffs++);
                 // initialize result variable with highest coefficient
                 // then go to next coefficient
                 T evaluation_result = *local_ptr_poly_coeffs++;
                 // use horners method to evaluate the polynomial
-                for(long int i_coeff = 0; i_coeff < n_order; ++i_coeff) {
+                for(U i_coeff = 0; i_coeff < n_order; ++i_coeff) {
                     evaluation_result = evaluation_result*argument +
-                        *local_ptr_poly_coeffs++; 
+                        *local_ptr_poly_coeffs++;
                 }
                 // accumulate to overall result
                 accumulated_result *= evaluation_result;
@@ -35,11 +42,12 @@ int get_approximation_cpu_t(T* ptr_arguments, T* ptr_poly_coeffs,
                 i_dim++;
             }
             // multiply accumulated_result with row of gpc coefficient matrix
-            for (long int i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
+            // and accumulate directly into the result (gpc matrix is not stored)
+            T* local_ptr_gpc_coeffs = ptr_gpc_coeffs + i_basis * n_gpc_coeffs;
+            for(U i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
                 ++i_gpc_coeffs) {
-                ptr_result[i_arguments * n_gpc_coeffs + i_gpc_coeffs] += 
-                    ptr_gpc_coeffs[i_basis * n_gpc_coeffs + i_gpc_coeffs] *
-                    accumulated_result;
+                local_ptr_result[i_gpc_coeffs] +=
+                    local_ptr_gpc_coeffs[i_gpc_coeffs] * accumulated_result;
             }
             // increment basis counter
             i_basis++;
@@ -48,32 +56,38 @@ int get_approximation_cpu_t(T* ptr_arguments, T* ptr_poly_coeffs,
     return 0;
 }
 
-template<typename T>
-int get_approximation_omp_t(T* ptr_arguments, T* ptr_poly_coeffs,
-    T* ptr_gpc_coeffs, T* ptr_result, long int n_arguments, long int n_dim,
-    long int n_basis, long int n_gpc_coeffs) {
-    
-    #pragma omp parallel for schedule(static)
-    for(long int i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
-        long int i_basis = 0;
+template<typename T, typename U>
+int get_approximation_cpu_t(T* ptr_arguments, T* ptr_poly_coeffs,
+    T* ptr_gpc_coeffs, T* ptr_result, U n_arguments, U n_dim,
+    U n_basis, U n_gpc_coeffs)
+{
+
+    for(U i_arguments = 0; i_arguments < n_arguments; ++i_arguments) {
+        U i_basis = 0;
         T* local_ptr_poly_coeffs = ptr_poly_coeffs;
+        T* local_ptr_result = ptr_result + i_arguments * n_gpc_coeffs;
+        // initialize row of result with zeros
+        for(U i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
+            ++i_gpc_coeffs) {
+            local_ptr_result[i_gpc_coeffs] = 0;
+        }
         while(i_basis != n_basis) {
-            long int i_dim = 0;
+            U i_dim = 0;
             T accumulated_result = 1;
             while(i_dim != n_dim) {
                 // get argument
                 T argument = ptr_arguments[i_arguments * n_dim + i_dim];
                 // get order of polynomial
-                // then to to first (highest) coefficient 
-                long int n_order = static_cast<long int>
+                // then to to first (highest) coefficient
+                U n_order = static_cast<U>
                     (*local_ptr_poly_coeffs++);
                 // initialize result variable with highest coefficient
                 // then go to next coefficient
                 T evaluation_result = *local_ptr_poly_coeffs++;
                 // use horners method to evaluate the polynomial
-                for(long int i_coeff = 0; i_coeff < n_order; ++i_coeff) {
+                for(U i_coeff = 0; i_coeff < n_order; ++i_coeff) {
                     evaluation_result = evaluation_result*argument +
-                        *local_ptr_poly_coeffs++; 
+                        *local_ptr_poly_coeffs++;
                 }
                 // accumulate to overall result
                 accumulated_result *= evaluation_result;
@@ -81,11 +95,12 @@ int get_approximation_omp_t(T* ptr_arguments, T* ptr_poly_coeffs,
                 i_dim++;
             }
             // multiply accumulated_result with row of gpc coefficient matrix
-            for (long int i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
+            // and accumulate directly into the result (gpc matrix is not stored)
+            T* local_ptr_gpc_coeffs = ptr_gpc_coeffs + i_basis * n_gpc_coeffs;
+            for(U i_gpc_coeffs = 0; i_gpc_coeffs < n_gpc_coeffs;
                 ++i_gpc_coeffs) {
-                ptr_result[i_arguments * n_gpc_coeffs + i_gpc_coeffs] += 
-                    ptr_gpc_coeffs[i_basis * n_gpc_coeffs + i_gpc_coeffs] *
-                    accumulated_result;
+                local_ptr_result[i_gpc_coeffs] +=
+                    local_ptr_gpc_coeffs[i_gpc_coeffs] * accumulated_result;
             }
             // increment basis counter
             i_basis++;
@@ -5,102 +5,189 @@
 
 
 #include "pygpc_extensions/create_gpc_matrix.hpp"
-//#include "pygpc_extensions/get_approximation.hpp"
+#include "pygpc_extensions/get_approximation.hpp"
 
 
-extern "C" {
-
-static PyObject* create_gpc_matrix_cpu(PyObject* self, PyObject* args)
+template<typename T>
+static void create_gpc_matrix_t(PyObject* py_arguments, PyObject* py_coeffs,
+    PyObject* py_result, int type_num, bool parallel, bool gradient)
 {
-    PyObject* py_arguments = NULL;
-    PyObject* py_result = NULL;
-    PyObject* py_coeffs = NULL;
-    PyObject* arguments = NULL;
-    PyObject* result = NULL;
-    PyObject* coeffs = NULL;
-
-    if (!PyArg_ParseTuple(args, "O!O!O!", &PyArray_Type, &py_arguments,
-        &PyArray_Type, &py_coeffs, &PyArray_Type, &py_result))
-        return NULL;
-    
-    arguments = PyArray_FROM_OTF(py_arguments, NPY_DOUBLE,
-        NPY_ARRAY_IN_ARRAY);
-    coeffs = PyArray_FROM_OTF(py_coeffs, NPY_DOUBLE,
-        NPY_ARRAY_IN_ARRAY);
-    result = PyArray_FROM_OTF(py_result, NPY_DOUBLE,
+    // arguments and coefficients are converted to the type of the result array
+    PyObject* arguments = PyArray_FROM_OTF(py_arguments, type_num,
+        NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+    PyObject* coeffs = PyArray_FROM_OTF(py_coeffs, type_num,
+        NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+    PyObject* result = PyArray_FROM_OTF(py_result, type_num,
         NPY_ARRAY_OUT_ARRAY);
 
-    npy_intp* ptr_dim_arguments = PyArray_DIMS((const PyArrayObject*)arguments);
+    npy_intp* ptr_dim_arguments = PyArray_DIMS((PyArrayObject*)arguments);
     npy_intp n_arguments = ptr_dim_arguments[0];
     npy_intp n_dim = ptr_dim_arguments[1];
-    double* ptr_arguments = (double*)PyArray_DATA((const PyArrayObject*)arguments);
+    T* ptr_arguments = (T*)PyArray_DATA((PyArrayObject*)arguments);
 
-    npy_intp* ptr_dim_result = PyArray_DIMS((const PyArrayObject*)result);
+    npy_intp* ptr_dim_result = PyArray_DIMS((PyArrayObject*)result);
     npy_intp n_basis = ptr_dim_result[1];
     npy_intp n_grad = ptr_dim_result[2];
-    double* ptr_result = (double*)PyArray_DATA((const PyArrayObject*)result);
+    T* ptr_result = (T*)PyArray_DATA((PyArrayObject*)result);
+
+    T* ptr_coeffs = (T*)PyArray_DATA((PyArrayObject*)coeffs);
+
+    // gradient gPC matrix from compact coefficient layout
+    // [order, coeffs, order_der, coeffs_der] (Basis.b_array_grad)
+    if (gradient && parallel)
+        create_gpc_matrix_gradient_omp_t<T, npy_intp>(ptr_arguments,
+            ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis);
+    else if (gradient)
+        create_gpc_matrix_gradient_cpu_t<T, npy_intp>(ptr_arguments,
+            ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis);
+    else if (parallel)
+        create_gpc_matrix_omp_t<T, npy_intp>(ptr_arguments,
+            ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis, n_grad);
+    else
+        create_gpc_matrix_cpu_t<T, npy_intp>(ptr_arguments,
+            ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis, n_grad);
 
-    double* ptr_coeffs = (double*)PyArray_DATA((const PyArrayObject*)coeffs);
+    Py_DECREF(arguments);
+    Py_DECREF(coeffs);
+    Py_DECREF(result);
+}
 
-    create_gpc_matrix_cpu_t<double, npy_intp>(ptr_arguments,
-        ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis, n_grad);
+template<typename T>
+static void get_approximation_t(PyObject* py_arguments,
+    PyObject* py_poly_coeffs, PyObject* py_gpc_coeffs, PyObject* py_result,
+    int type_num, bool parallel)
+{
+    // arguments and coefficients are converted to the type of the result array
+    PyObject* arguments = PyArray_FROM_OTF(py_arguments, type_num,
+        NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+    PyObject* poly_coeffs = PyArray_FROM_OTF(py_poly_coeffs, type_num,
+        NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+    PyObject* gpc_coeffs = PyArray_FROM_OTF(py_gpc_coeffs, type_num,
+        NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+    PyObject* result = PyArray_FROM_OTF(py_result, type_num,
+        NPY_ARRAY_OUT_ARRAY);
+
+    npy_intp* ptr_dim_arguments = PyArray_DIMS((PyArrayObject*)arguments);
+    npy_intp n_arguments = ptr_dim_arguments[0];
+    npy_intp n_dim = ptr_dim_arguments[1];
+    T* ptr_arguments = (T*)PyArray_DATA((PyArrayObject*)arguments);
+
+    T* ptr_poly_coeffs = (T*)PyArray_DATA((PyArrayObject*)poly_coeffs);
+
+    npy_intp* ptr_dim_gpc_coeffs = PyArray_DIMS((PyArrayObject*)gpc_coeffs);
+    npy_intp n_basis = ptr_dim_gpc_coeffs[0];
+    npy_intp n_gpc_coeffs = ptr_dim_gpc_coeffs[1];
+    T* ptr_gpc_coeffs = (T*)PyArray_DATA((PyArrayObject*)gpc_coeffs);
+
+    T* ptr_result = (T*)PyArray_DATA((PyArrayObject*)result);
+
+    if (parallel)
+        get_approximation_omp_t<T, npy_intp>(ptr_arguments, ptr_poly_coeffs,
+            ptr_gpc_coeffs, ptr_result, n_arguments, n_dim, n_basis,
+            n_gpc_coeffs);
+    else
+        get_approximation_cpu_t<T, npy_intp>(ptr_arguments, ptr_poly_coeffs,
+            ptr_gpc_coeffs, ptr_result, n_arguments, n_dim, n_basis,
+            n_gpc_coeffs);
 
     Py_DECREF(arguments);
-    Py_DECREF(coeffs);
+    Py_DECREF(poly_coeffs);
+    Py_DECREF(gpc_coeffs);
     Py_DECREF(result);
-    
-    Py_INCREF(Py_None);
-    return Py_None;
 }
 
-static PyObject* create_gpc_matrix_omp(PyObject* self, PyObject* args)
+extern "C" {
+
+static PyObject* create_gpc_matrix(PyObject* args, bool parallel,
+    bool gradient)
 {
     PyObject* py_arguments = NULL;
     PyObject* py_result = NULL;
     PyObject* py_coeffs = NULL;
-    PyObject* arguments = NULL;
-    PyObject* result = NULL;
-    PyObject* coeffs = NULL;
 
     if (!PyArg_ParseTuple(args, "O!O!O!", &PyArray_Type, &py_arguments,
         &PyArray_Type, &py_coeffs, &PyArray_Type, &py_result))
         return NULL;
-    
-    arguments = PyArray_FROM_OTF(py_arguments, NPY_DOUBLE,
-        NPY_ARRAY_IN_ARRAY);
-    coeffs = PyArray_FROM_OTF(py_coeffs, NPY_DOUBLE,
-        NPY_ARRAY_IN_ARRAY);
-    result = PyArray_FROM_OTF(py_result, NPY_DOUBLE,
-        NPY_ARRAY_OUT_ARRAY);
 
-    npy_intp* ptr_dim_arguments = PyArray_DIMS((const PyArrayObject*)arguments);
-    npy_intp n_arguments = ptr_dim_arguments[0];
-    npy_intp n_dim = ptr_dim_arguments[1];
-    double* ptr_arguments = (double*)PyArray_DATA((const PyArrayObject*)arguments);
+    // the precision is determined by the result array (float32 or float64)
+    if (PyArray_TYPE((PyArrayObject*)py_result) == NPY_FLOAT)
+        create_gpc_matrix_t<float>(py_arguments, py_coeffs, py_result,
+            NPY_FLOAT, parallel, gradient);
+    else
+        create_gpc_matrix_t<double>(py_arguments, py_coeffs, py_result,
+            NPY_DOUBLE, parallel, gradient);
 
-    npy_intp* ptr_dim_result = PyArray_DIMS((const PyArrayObject*)result);
-    npy_intp n_basis = ptr_dim_result[1];
-    npy_intp n_grad = ptr_dim_result[2];
-    double* ptr_result = (double*)PyArray_DATA((const PyArrayObject*)result);
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* create_gpc_matrix_cpu(PyObject* self, PyObject* args)
+{
+    return create_gpc_matrix(args, false, false);
+}
 
-    double* ptr_coeffs = (double*)PyArray_DATA((const PyArrayObject*)coeffs);
+static PyObject* create_gpc_matrix_omp(PyObject* self, PyObject* args)
+{
+    return create_gpc_matrix(args, true, false);
+}
 
-    create_gpc_matrix_omp_t<double, npy_intp>(ptr_arguments,
-        ptr_coeffs, ptr_result, n_arguments, n_dim, n_basis, n_grad);
+static PyObject* create_gpc_matrix_gradient_cpu(PyObject* self,
+    PyObject* args)
+{
+    return create_gpc_matrix(args, false, true);
+}
+
+static PyObject* create_gpc_matrix_gradient_omp(PyObject* self,
+    PyObject* args)
+{
+    return create_gpc_matrix(args, true, true);
+}
+
+static PyObject* get_approximation(PyObject* args, bool parallel)
+{
+    PyObject* py_arguments = NULL;
+    PyObject* py_result = NULL;
+    PyObject* py_poly_coeffs = NULL;
+    PyObject* py_gpc_coeffs = NULL;
+
+    if (!PyArg_ParseTuple(args, "O!O!O!O!", &PyArray_Type, &py_arguments,
+        &PyArray_Type, &py_poly_coeffs, &PyArray_Type, &py_gpc_coeffs,
+        &PyArray_Type, &py_result))
+        return NULL;
+
+    // the precision is determined by the result array (float32 or float64)
+    if (PyArray_TYPE((PyArrayObject*)py_result) == NPY_FLOAT)
+        get_approximation_t<float>(py_arguments, py_poly_coeffs,
+            py_gpc_coeffs, py_result, NPY_FLOAT, parallel);
+    else
+        get_approximation_t<double>(py_arguments, py_poly_coeffs,
+            py_gpc_coeffs, py_result, NPY_DOUBLE, parallel);
 
-    Py_DECREF(arguments);
-    Py_DECREF(coeffs);
-    Py_DECREF(result);
-    
     Py_INCREF(Py_None);
     return Py_None;
 }
 
+static PyObject* get_approximation_cpu(PyObject* self, PyObject* args)
+{
+    return get_approximation(args, false);
+}
+
+static PyObject* get_approximation_omp(PyObject* self, PyObject* args)
+{
+    return get_approximation(args, true);
+}
+
 
 static PyMethodDef methods[] =
 {
     {"create_gpc_matrix_cpu", create_gpc_matrix_cpu, METH_VARARGS, ""},
     {"create_gpc_matrix_omp", create_gpc_matrix_omp, METH_VARARGS, ""},
+    {"create_gpc_matrix_gradient_cpu", create_gpc_matrix_gradient_cpu,
+        METH_VARARGS, ""},
+    {"create_gpc_matrix_gradient_omp", create_gpc_matrix_gradient_omp,
+        METH_VARARGS, ""},
+    {"get_approximation_cpu", get_approximation_cpu, METH_VARARGS, ""},
+    {"get_approximation_omp", get_approximation_omp, METH_VARARGS, ""},
     {NULL, NULL, 0, NULL}
 };
 
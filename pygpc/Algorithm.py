@@ -95,6 +95,46 @@ class Algorithm(object):
             Added by jxz. For now there is only one choice for this option.
         options["backend"] : str, optional, default: "python"
             Default computing backend, certain functions can be computed with Multicore-CPU or GPU acceleration
+        options["n_cpu_basis"] : int, optional, default: None
+            Number of processes to initialize the basis functions in parallel. If None, the basis functions are
+            initialized in the current process, which is faster for most problems.
+        options["n_threads"] : int, optional, default: None
+            Number of worker threads used by the "threads" backend to construct the gPC matrix in row blocks.
+            If None, the number of CPUs is used. If set, the folds of the cross validation are solved concurrently
+            by n_threads worker threads (if None, sequentially, because the solvers use multithreaded BLAS).
+        options["cv_scheme"] : str, optional, default: "leave_p_out"
+            Cross validation scheme of the "loocv" error if it can not be determined in closed form (e.g. OMP and
+            LarsLasso without overdetermined support, LSQR, ME-gPC). The folds are solved concurrently.
+            - "kfold": The samples are split into options["cv_n_folds"] disjoint test sets
+            - "leave_p_out": Test sets of options["cv_p"] samples (at most options["cv_n_max"] test sets)
+        options["cv_n_folds"] : int, optional, default: 10
+            Number of folds of the "kfold" cross validation scheme
+        options["cv_p"] : int, optional, default: 1
+            Number of samples in the test sets of the "leave_p_out" cross validation scheme
+        options["cv_n_max"] : int, optional, default: 25
+            Maximum number of test sets of the "leave_p_out" cross validation scheme
+        options["cv_seed"] : int, optional, default: 1
+            Seed of the assignment of the samples to the test sets (reproducible cross validation error)
+        options["matrix_cache_dir"] : str, optional, default: None
+            Directory of a persistent on-disk cache of gPC matrices. gPC matrices are stored under a hash of the
+            basis functions and the coordinates and are reused in postprocessing and reruns (also across processes).
+            If None, gPC matrices are not cached.
+        options["matrix_cache_size"] : float, optional, default: 2**30
+            Maximum size (in bytes) of the gPC matrix cache. If exceeded, the least recently used matrices are deleted.
+        options["block_size"] : int, optional, default: None
+            Number of sample points, for which the gPC approximation is evaluated at once (e.g. in get_pdf or
+            get_samples). If None, the block size is determined from options["memory_limit"].
+        options["memory_limit"] : float, optional, default: 2**30
+            Maximum size (in bytes) of the gPC matrix, which is constructed at once when evaluating the gPC
+            approximation in a large number of sample points.
+        options["dtype"] : str, optional, default: "float64"
+            Floating point precision ("float64" or "float32") used to evaluate the gPC approximation (e.g. in
+            get_pdf, get_samples or for the Sobol indices). The coefficients are always determined in double precision.
+        options["sparse_tol"] : float or None, optional, default: 0.
+            Relative tolerance below which gPC coefficients are neglected when evaluating the gPC approximation.
+            Basis functions whose coefficients are negligible for all outputs are not evaluated (useful after
+            sparse solvers like "OMP" or "LarsLasso"). With 0, only exactly zero coefficients are skipped, None
+            evaluates all basis functions.
         options["lambda_eps_gradient"] : float, optional, default: 0.95
             Bound of principal components in %. All eigenvectors are included until lambda_eps of total sum of all
             eigenvalues is included in the system.
@@ -112,6 +152,11 @@ class Algorithm(object):
         options["n_samples_validation"] : int, optional, default: 1e4
             Number of validation points used to determine the NRMSD if chosen as "error_type". Does not create a
             validation set if there is already one present in the Problem instance (problem.validation).
+        options["validation_store"] : str, optional, default: None
+            Filename of a validation set store (.hdf5 file). Validation sets are stored under a hash of the problem
+            (model, constant parameters, random parameters and seed) and are reused by later runs of the same problem
+            (e.g. with different orders, grids or solvers). If more samples are requested than stored, the validation
+            set is extended and only the new samples are evaluated. If None, the validation set is always created.
         options["print_func_time"] : boolean, optional, default: False
             Print function evaluation time for every single run
         options["projection"] : boolean, optional, default: False
@@ -120,15 +165,33 @@ class Algorithm(object):
             Solver to determine the gPC coefficients
             - 'Moore-Penrose' ... Pseudoinverse of gPC matrix (SGPC.Reg, EGPC)
             - 'OMP' ... Orthogonal Matching Pursuit, sparse recovery approach (SGPC.Reg, EGPC)
+            - 'LarsLasso' ... Least-Angle Regression using Lasso model (SGPC.Reg, EGPC)
+            - 'LSQR' ... Iterative least squares solution (LSQR/LSMR) with a matrix-free gPC matrix (SGPC.Reg, EGPC)
+            - 'NormalEquations' ... Least squares solution of blockwise accumulated normal equations (SGPC.Reg, EGPC)
         options["settings"]: dict
             Solver settings
             - 'Moore-Penrose' ... None
-            - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0
+            - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0 or "sparsity": float 0...1
+                        and/or {"tol": float} Relative residual at which the iterations are stopped
+            - 'LarsLasso' ... {"alpha": float 0...1} Regularization parameter (default: 1e-5)
+                              or "cv" (determined for each output by cross validation along the LARS path)
+                              {"n_folds": int} Number of folds of the cross validation (default: 5)
+                              {"n_cpu": int} Number of processes to solve the outputs in parallel
+                              {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'LSQR' ... {"method": str} "lsqr" (default) or "lsmr"
+                         {"atol": float, "btol": float} Stopping tolerances (default: 1e-10)
+                         {"iter_lim": int} Maximum number of iterations (default: 10 * n_basis)
+                         {"precondition": bool} Scale the columns of the gPC matrix to unit norm (default: True)
+                         {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'NormalEquations' ... {"block_size": int} Number of rows accumulated at once
+                                   {"fn_hdf5": str} .hdf5 file of the gPC matrix (see GPC.solve_normal_equations)
         options["verbose"] : boolean, optional, default=True
             Print output of iterations and sub-iterations (True/False)
         options["backend"] : str
             Backend for performance intensive computations
             - "python" ... Use native python implementation
+            - "threads" ... Use native python implementation evaluated in row blocks by multiple threads
+              (fallback if the C/C++ or CUDA extensions are not installed)
             - "cpu" .. Use C Implementaion without multicore-support
         options["plot_basis"] : bool
             Plot basis functions and save as fn_results + _basis_iter#.png
@@ -187,8 +250,11 @@ class Algorithm(object):
                 self.options["settings"] = None
             elif self.options["method"] == "reg" and not (self.options["solver"] == "Moore-Penrose" or
                                                           self.options["solver"] == "OMP" or
-                                                          self.options["solver"] == "LarsLasso"):
-                raise AssertionError("Please specify 'Moore-Penrose' or 'OMP' as solver for 'reg' method")
+                                                          self.options["solver"] == "LarsLasso" or
+                                                          self.options["solver"] == "LSQR" or
+                                                          self.options["solver"] == "NormalEquations"):
+                raise AssertionError("Please specify 'Moore-Penrose', 'OMP', 'LarsLasso', 'LSQR' or "
+                                     "'NormalEquations' as solver for 'reg' method")
 
         if "n_cpu" in self.options.keys():
             self.n_cpu = self.options["n_cpu"]
@@ -199,6 +265,9 @@ class Algorithm(object):
         if "n_samples_validation" not in self.options.keys():
             self.options["n_samples_validation"] = 1e4
 
+        if "validation_store" not in self.options.keys():
+            self.options["validation_store"] = None
+
         if "save_session_format" not in self.options.keys():
             self.options["save_session_format"] = ".hdf5"
         elif self.options["save_session_format"] not in [".hdf5", ".pkl"]:
@@ -232,8 +301,9 @@ class Algorithm(object):
             self.options["settings"] = None
 
         if self.options["solver"] == "OMP" and ("settings" not in self.options.keys() or not (
-                "n_coeffs_sparse" not in self.options["settings"].keys() or
-                "sparsity" not in self.options["settings"].keys())):
+                "n_coeffs_sparse" in self.options["settings"].keys() or
+                "sparsity" in self.options["settings"].keys() or
+                "tol" in self.options["settings"].keys())):
             raise AssertionError("Please specify correct solver settings for OMP in 'settings'")
 
         if self.options["solver"] == "LarsLasso":
@@ -389,6 +459,149 @@ class Algorithm(object):
 
         return results, gradient_results, gradient_results_idx, grid
 
+    def init_gpc_matrix(self, gpc, gradient_idx=None):
+        """
+        Initializes the gPC matrix of the gPC (see GPC.init_gpc_matrix). The gPC matrix is not initialized for the
+        matrix-free solvers ("LSQR", "NormalEquations"), which evaluate it blockwise on the fly. In this case, only
+        the indices of the grid points with gradients and the number of grid points and basis functions are recorded
+        and gPC matrices of a previous basis or grid (e.g. determined during the construction of L1 or CO grids) are
+        removed.
+
+        Algorithm.init_gpc_matrix(gpc, gradient_idx=None)
+
+        Parameters
+        ----------
+        gpc : GPC object instance
+            GPC object
+        gradient_idx : ndarray of int [gradient_results.shape[0]], optional, default: None
+            Indices of grid points where the gradient in gradient_results is provided
+        """
+        if self.options["solver"] in ["LSQR", "NormalEquations"]:
+            if gpc.gradient_idx is None or gradient_idx is not None:
+                gpc.gradient_idx = gradient_idx
+
+            gpc.gpc_matrix = None
+            gpc.gpc_matrix_gradient = None
+            gpc.n_grid.append(gpc.grid.n_grid)
+            gpc.n_basis.append(gpc.basis.n_basis)
+        else:
+            gpc.init_gpc_matrix(gradient_idx=gradient_idx)
+
+    def update_gpc_matrix(self, gpc, gradient_idx=None):
+        """
+        Updates the gPC matrix of the gPC to its grid and basis (see GPC.update_gpc_matrix). The gPC matrix is not
+        updated for the matrix-free solvers ("LSQR", "NormalEquations"), see Algorithm.init_gpc_matrix.
+
+        Algorithm.update_gpc_matrix(gpc, gradient_idx=None)
+
+        Parameters
+        ----------
+        gpc : GPC object instance
+            GPC object
+        gradient_idx : ndarray of int [gradient_results.shape[0]], optional, default: None
+            Indices of grid points where the gradient in gradient_results is provided
+            (if None, gpc.gradient_idx is kept)
+        """
+        if self.options["solver"] in ["LSQR", "NormalEquations"]:
+            self.init_gpc_matrix(gpc=gpc, gradient_idx=gradient_idx)
+        else:
+            gpc.update_gpc_matrix(gradient_idx=gradient_idx)
+
+    @staticmethod
+    def solve_shared(gpc, matrix_factorizations, results, gradient_results=None, solver=None, settings=None,
+                     verbose=False):
+        """
+        Determines the gPC coefficients of QoI specific gPCs and shares the factorization of the gPC matrix between
+        the gPCs of the QoIs. The gPCs are grouped by their gPC matrices (same basis, grid and projection, see
+        GPC.get_matrix_key) and the results of the QoIs of a group are stacked and solved at once. The factorization of
+        the gPC matrix is shared by reference between the gPCs of a group and is kept in matrix_factorizations, such
+        that it is reused for the gPCs of further QoIs with an identical gPC matrix and the gPC matrix is factorized
+        only once.
+
+        coeffs = Algorithm.solve_shared(gpc, matrix_factorizations, results, gradient_results=None, solver=None,
+                                        settings=None, verbose=False)
+
+        Parameters
+        ----------
+        gpc : GPC object instance or list of GPC object instances [n_qoi]
+            GPC objects of the QoIs
+        matrix_factorizations : dict
+            Factorizations (LeastSquares objects) of the gPC matrices of the QoIs under their keys (updated in place)
+        results : ndarray of float [n_grid x n_out] or list of ndarray of float [n_qoi][n_grid x n_out]
+            Results of the QoIs
+        gradient_results : ndarray of float [n_gradient x n_out x dim] or list of ndarray of float [n_qoi], optional,
+            default: None
+            Gradient of results in original parameter space in specific grid points
+        solver : str, optional, default: None
+            Solver to determine the gPC coefficients (see GPC.solve)
+        settings : dict, optional, default: None
+            Solver settings (see GPC.solve)
+        verbose : bool, optional, default: False
+            Print progress
+
+        Returns
+        -------
+        coeffs : ndarray of float [n_basis x n_out] or list of ndarray of float [n_qoi][n_basis x n_out]
+            GPC coefficients of the QoIs
+        """
+        if isinstance(gpc, list):
+            gpc_list, results_list = gpc, results
+            gradient_results_list = gradient_results if gradient_results is not None else [None] * len(gpc)
+        else:
+            gpc_list, results_list, gradient_results_list = [gpc], [results], [gradient_results]
+
+        # group the gPCs by their gPC matrices
+        groups = dict()
+
+        for i_gpc, _gpc in enumerate(gpc_list):
+            groups.setdefault(_gpc.get_matrix_key(), []).append(i_gpc)
+
+        coeffs = [None for _ in gpc_list]
+
+        for matrix_key, idx_gpc in groups.items():
+            _gpc = gpc_list[idx_gpc[0]]
+
+            # reuse the factorization of an identical gPC matrix
+            if matrix_key in matrix_factorizations:
+                _gpc.matrix_factorization = matrix_factorizations[matrix_key]
+
+            # results of the QoIs of the group are solved at once
+            n_out = [results_list[i_gpc].shape[1] for i_gpc in idx_gpc]
+
+            if gradient_results_list[idx_gpc[0]] is not None:
+                _gradient_results = np.concatenate([gradient_results_list[i_gpc] for i_gpc in idx_gpc], axis=1)
+            else:
+                _gradient_results = None
+
+            _coeffs = _gpc.solve(results=np.hstack([results_list[i_gpc] for i_gpc in idx_gpc]),
+                                 gradient_results=_gradient_results,
+                                 solver=solver,
+                                 settings=settings,
+                                 verbose=verbose)
+
+            for i_gpc, i_out_start, i_out_stop in zip(idx_gpc, np.cumsum([0] + n_out[:-1]), np.cumsum(n_out)):
+                coeffs[i_gpc] = _coeffs[:, i_out_start:i_out_stop]
+
+            # remove factorizations, which were updated in place (they have no key anymore)
+            for key in [key for key, value in matrix_factorizations.items() if value.key != key]:
+                del matrix_factorizations[key]
+
+            # share the factorization of the gPC matrix
+            row_id, col_id = _gpc.get_matrix_ids(gradient=_gpc.gradient and _gpc.gpc_matrix_gradient is not None)
+
+            if row_id is not None and _gpc.is_matrix_factorization(shape=(len(row_id), len(col_id)),
+                                                                   row_id=row_id, col_id=col_id, key=matrix_key):
+                _gpc.matrix_factorization.key = matrix_key
+                matrix_factorizations[matrix_key] = _gpc.matrix_factorization
+
+                for i_gpc in idx_gpc[1:]:
+                    gpc_list[i_gpc].matrix_factorization = _gpc.matrix_factorization
+
+        if isinstance(gpc, list):
+            return coeffs
+        else:
+            return coeffs[0]
+
 
 class Static_IO(Algorithm):
     """
@@ -507,7 +720,7 @@ class Static_IO(Algorithm):
         gpc.grid = self.grid
 
         # Initialize gpc matrix
-        gpc.init_gpc_matrix()
+        self.init_gpc_matrix(gpc=gpc)
 
         # Compute gpc coefficients
         coeffs = gpc.solve(results=self.res,
@@ -544,8 +757,10 @@ class Static_IO(Algorithm):
 
                 f.create_dataset("coeffs", data=coeffs,
                                  maxshape=None, dtype="float64")
-                f.create_dataset("gpc_matrix", data=gpc.gpc_matrix,
-                                 maxshape=None, dtype="float64")
+
+                if gpc.gpc_matrix is not None:
+                    f.create_dataset("gpc_matrix", data=gpc.gpc_matrix,
+                                     maxshape=None, dtype="float64")
 
                 if gpc.gpc_matrix_gradient is not None:
                     f.create_dataset("gpc_matrix_gradient",
@@ -801,7 +1016,7 @@ class Static(Algorithm):
                                                                           com=com)
 
             # Initialize gpc matrix
-            gpc.init_gpc_matrix(gradient_idx=gradient_idx)
+            self.init_gpc_matrix(gpc=gpc, gradient_idx=gradient_idx)
 
             # Compute gpc coefficients
             coeffs = gpc.solve(results=res,
@@ -865,8 +1080,10 @@ class Static(Algorithm):
 
                 f.create_dataset("coeffs", data=coeffs,
                                  maxshape=None, dtype="float64")
-                f.create_dataset("gpc_matrix", data=gpc.gpc_matrix,
-                                 maxshape=None, dtype="float64")
+
+                if gpc.gpc_matrix is not None:
+                    f.create_dataset("gpc_matrix", data=gpc.gpc_matrix,
+                                     maxshape=None, dtype="float64")
 
                 if gpc.gpc_matrix_gradient is not None:
                     f.create_dataset("gpc_matrix_gradient",
@@ -1738,6 +1955,9 @@ class StaticProjection(Algorithm):
         i_grid = 0
         i_qoi = 0
 
+        # factorizations of the gPC matrices shared by the QoI specific gPCs
+        matrix_factorizations = dict()
+
         if self.options["qoi"] is not None and self.options["qoi"] != "all":
             q_idx = self.options["qoi"]
             qoi_idx = [q_idx]
@@ -1875,7 +2095,7 @@ class StaticProjection(Algorithm):
                 gpc[i_qoi].options = copy.deepcopy(self.options)
 
                 # Initialize gpc matrix
-                gpc[i_qoi].init_gpc_matrix(gradient_idx=gradient_idx)
+                self.init_gpc_matrix(gpc=gpc[i_qoi], gradient_idx=gradient_idx)
 
                 # Someone might not use the gradient to determine the gpc coeffs
                 if self.options["gradient_enhanced"]:
@@ -1883,12 +2103,14 @@ class StaticProjection(Algorithm):
                 else:
                     grad_res_3D_passed = None
 
-                # Compute gpc coefficients
-                coeffs[i_qoi] = gpc[i_qoi].solve(results=res,
-                                                 gradient_results=grad_res_3D_passed,
-                                                 solver=self.options["solver"],
-                                                 settings=self.options["settings"],
-                                                 verbose=self.options["verbose"])
+                # Compute gpc coefficients (reuse the factorization of an identical gPC matrix of another QoI)
+                coeffs[i_qoi] = self.solve_shared(gpc=gpc[i_qoi],
+                                                  matrix_factorizations=matrix_factorizations,
+                                                  results=res,
+                                                  gradient_results=grad_res_3D_passed,
+                                                  solver=self.options["solver"],
+                                                  settings=self.options["settings"],
+                                                  verbose=self.options["verbose"])
 
                 # validate gpc approximation (determine nrmsd or loocv specified in options["error_type"])
                 if self.options["error_type"] == "nrmsd" and gpc[0].validation is None:
@@ -1938,9 +2160,10 @@ class StaticProjection(Algorithm):
                                      data=coeffs[i_qoi],
                                      maxshape=None, dtype="float64")
 
-                    f.create_dataset("gpc_matrix" + hdf5_subfolder,
-                                     data=gpc[i_qoi].gpc_matrix,
-                                     maxshape=None, dtype="float64")
+                    if gpc[i_qoi].gpc_matrix is not None:
+                        f.create_dataset("gpc_matrix" + hdf5_subfolder,
+                                         data=gpc[i_qoi].gpc_matrix,
+                                         maxshape=None, dtype="float64")
 
                     if gpc[i_qoi].gpc_matrix_gradient is not None:
                         f.create_dataset("gpc_matrix_gradient" + hdf5_subfolder,
@@ -2580,7 +2803,7 @@ class RegAdaptive(Algorithm):
 
         # Initialize gpc matrix
         print("Initializing gPC matrix...")
-        gpc.init_gpc_matrix(gradient_idx=gradient_idx)
+        self.init_gpc_matrix(gpc=gpc, gradient_idx=gradient_idx)
         gpc.n_grid.pop(0)
         gpc.n_basis.pop(0)
 
@@ -2757,8 +2980,8 @@ class RegAdaptive(Algorithm):
 
                         i_grid = gpc.grid.coords.shape[0]
 
-                    # update gpc matrix
-                    gpc.init_gpc_matrix(gradient_idx=gradient_idx)
+                    # update gpc matrix (only new rows and columns are computed)
+                    self.update_gpc_matrix(gpc=gpc, gradient_idx=gradient_idx)
 
                     # determine gpc coefficients
                     coeffs = gpc.solve(results=res,
@@ -2825,9 +3048,11 @@ class RegAdaptive(Algorithm):
                         del f["gpc_matrix"]
                     except KeyError:
                         pass
-                    f.create_dataset("gpc_matrix",
-                                     data=gpc.gpc_matrix,
-                                     maxshape=None, dtype="float64")
+
+                    if gpc.gpc_matrix is not None:
+                        f.create_dataset("gpc_matrix",
+                                         data=gpc.gpc_matrix,
+                                         maxshape=None, dtype="float64")
 
                     if gpc.gpc_matrix_gradient is not None:
                         try:
@@ -2857,9 +3082,11 @@ class RegAdaptive(Algorithm):
                     del f["gpc_matrix"]
                 except KeyError:
                     pass
-                f.create_dataset("gpc_matrix",
-                                 data=gpc.gpc_matrix,
-                                 maxshape=None, dtype="float64")
+
+                if gpc.gpc_matrix is not None:
+                    f.create_dataset("gpc_matrix",
+                                     data=gpc.gpc_matrix,
+                                     maxshape=None, dtype="float64")
 
                 if gpc.gpc_matrix_gradient is not None:
                     try:
@@ -3590,7 +3817,7 @@ class MERegAdaptiveProjection(Algorithm):
                                                                    d=d,
                                                                    gradient_idx=megpc[i_qoi].gradient_idx)
 
-                        megpc[i_qoi].gpc[d].init_gpc_matrix(gradient_idx=gradient_idx_gpc)
+                        megpc[i_qoi].gpc[d].update_gpc_matrix(gradient_idx=gradient_idx_gpc)
 
                         # determine gpc coefficients with new basis but old samples
                         if self.options["gradient_enhanced"]:
@@ -3781,7 +4008,7 @@ class MERegAdaptiveProjection(Algorithm):
                                                                                d=d,
                                                                                gradient_idx=megpc[i_qoi].gradient_idx)
 
-                                    megpc[i_qoi].gpc[d].init_gpc_matrix(gradient_idx=gradient_idx_gpc)
+                                    megpc[i_qoi].gpc[d].update_gpc_matrix(gradient_idx=gradient_idx_gpc)
 
                                     # determine gpc coefficients
                                     if self.options["gradient_enhanced"]:
@@ -4248,8 +4475,13 @@ class RegAdaptiveProjection(Algorithm):
         self.problem_reduced = [None for _ in range(n_qoi)]
         gpc = [None for _ in range(n_qoi)]
         coeffs = [None for _ in range(n_qoi)]
+        results_qoi = [None for _ in range(n_qoi)]
+        gradient_results_qoi = [None for _ in range(n_qoi)]
         self.options["order_max"] = None
 
+        # factorizations of the gPC matrices shared by the QoI specific gPCs
+        matrix_factorizations = dict()
+
         # loop over qoi (projection is qoi specific)
         for i_qoi, q_idx in enumerate(qoi_idx):
 
@@ -4328,7 +4560,7 @@ class RegAdaptiveProjection(Algorithm):
             gpc[i_qoi].grid = project_grid(grid=grid_original, p_matrix=p_matrix, mode="reduce")
 
             # Initialize gpc matrix
-            gpc[i_qoi].init_gpc_matrix(gradient_idx=gradient_idx)
+            self.init_gpc_matrix(gpc=gpc[i_qoi], gradient_idx=gradient_idx)
             gpc[i_qoi].n_grid.pop(0)
             gpc[i_qoi].n_basis.pop(0)
 
@@ -4534,17 +4766,19 @@ class RegAdaptiveProjection(Algorithm):
                     # Someone might not use the gradient to determine the gpc coeffs
                     if gpc[i_qoi].gradient:
                         grad_res_3D_passed = grad_res_3D
-                        gpc[i_qoi].init_gpc_matrix(gradient_idx=gradient_idx)
+                        self.update_gpc_matrix(gpc=gpc[i_qoi], gradient_idx=gradient_idx)
                     else:
                         grad_res_3D_passed = None
-                        gpc[i_qoi].init_gpc_matrix(gradient_idx=None)
+                        self.update_gpc_matrix(gpc=gpc[i_qoi], gradient_idx=None)
 
-                    # determine gpc coefficients
-                    coeffs[i_qoi] = gpc[i_qoi].solve(results=res,
-                                                     gradient_results=grad_res_3D_passed,
-                                                     solver=gpc[i_qoi].solver,
-                                                     settings=gpc[i_qoi].settings,
-                                                     verbose=self.options["verbose"])
+                    # determine gpc coefficients (reuse the factorization of an identical gPC matrix of another QoI)
+                    coeffs[i_qoi] = self.solve_shared(gpc=gpc[i_qoi],
+                                                      matrix_factorizations=matrix_factorizations,
+                                                      results=res,
+                                                      gradient_results=grad_res_3D_passed,
+                                                      solver=gpc[i_qoi].solver,
+                                                      settings=gpc[i_qoi].settings,
+                                                      verbose=self.options["verbose"])
 
                     # Add a validation set if nrmsd is chosen and no validation set is yet present
                     if self.options["error_type"] == "nrmsd" and not isinstance(gpc[0].validation, ValidationSet):
@@ -4631,9 +4865,11 @@ class RegAdaptiveProjection(Algorithm):
                             del f["gpc_matrix" + hdf5_subfolder]
                         except KeyError:
                             pass
-                        f.create_dataset("gpc_matrix" + hdf5_subfolder,
-                                         data=gpc[i_qoi].gpc_matrix,
-                                         maxshape=None, dtype="float64")
+
+                        if gpc[i_qoi].gpc_matrix is not None:
+                            f.create_dataset("gpc_matrix" + hdf5_subfolder,
+                                             data=gpc[i_qoi].gpc_matrix,
+                                             maxshape=None, dtype="float64")
 
                         if gpc[i_qoi].gpc_matrix_gradient is not None:
                             try:
@@ -4652,16 +4888,36 @@ class RegAdaptiveProjection(Algorithm):
                                          data=eps,
                                          maxshape=None, dtype="float64")
 
-            # determine gpc coefficients
-            coeffs[i_qoi] = gpc[i_qoi].solve(results=res,
-                                             gradient_results=grad_res_3D_passed,
-                                             solver=gpc[i_qoi].solver,
-                                             settings=gpc[i_qoi].settings,
-                                             verbose=self.options["verbose"])
+            # results of the final gPC (solved together with the other QoIs after the last QoI)
+            results_qoi[i_qoi] = res
+            gradient_results_qoi[i_qoi] = grad_res_3D_passed
 
             # save original grid
             gpc[i_qoi].grid_original = copy.deepcopy(grid_original)
 
+            # reset iterators
+            eps = self.options["eps"] + 1.0
+            order = self.options["order_start"]
+            error = []
+            nrmsd = []
+            loocv = []
+
+        # determine gpc coefficients of all QoIs (QoIs with identical gPC matrices are solved at once)
+        coeffs = self.solve_shared(gpc=gpc,
+                                   matrix_factorizations=matrix_factorizations,
+                                   results=results_qoi,
+                                   gradient_results=gradient_results_qoi,
+                                   solver=self.options["solver"],
+                                   settings=self.options["settings"],
+                                   verbose=self.options["verbose"])
+
+        for i_qoi, q_idx in enumerate(qoi_idx):
+
+            if self.options["qoi"] != "all":
+                hdf5_subfolder = ""
+            else:
+                hdf5_subfolder = "/qoi_" + str(q_idx)
+
             # save gpc object gpc coeffs and projection matrix
             if self.options["fn_results"] is not None:
 
@@ -4686,25 +4942,19 @@ class RegAdaptiveProjection(Algorithm):
                         del f["p_matrix" + hdf5_subfolder]
                     except KeyError:
                         pass
-                    f.create_dataset("p_matrix" + hdf5_subfolder, data=p_matrix, maxshape=None, dtype="float64")
-
-                    f.create_dataset("misc/error_type", data=self.options["error_type"])
-
-                    if self.options["gradient_enhanced"] or gpc[-1].grid.coords_gradient is not None:
-                        f.create_dataset("grid/coords_gradient", data=gpc[-1].grid.coords_gradient,
-                                         maxshape=None, dtype="float64")
-                        f.create_dataset("grid/coords_gradient_norm", data=gpc[-1].grid.coords_gradient_norm,
-                                         maxshape=None, dtype="float64")
-
-            # reset iterators
-            eps = self.options["eps"] + 1.0
-            order = self.options["order_start"]
-            error = []
-            nrmsd = []
-            loocv = []
+                    f.create_dataset("p_matrix" + hdf5_subfolder, data=gpc[i_qoi].p_matrix, maxshape=None,
+                                     dtype="float64")
 
         if self.options["fn_results"] is not None:
             with h5py.File(fn_results + ".hdf5", "a") as f:
+                f.create_dataset("misc/error_type", data=self.options["error_type"])
+
+                if self.options["gradient_enhanced"] or gpc[-1].grid.coords_gradient is not None:
+                    f.create_dataset("grid/coords_gradient", data=gpc[-1].grid.coords_gradient,
+                                     maxshape=None, dtype="float64")
+                    f.create_dataset("grid/coords_gradient_norm", data=gpc[-1].grid.coords_gradient_norm,
+                                     maxshape=None, dtype="float64")
+
                 if gpc[0].validation is not None:
                     f.create_dataset("validation/model_evaluations/results", data=gpc[0].validation.results,
                                      maxshape=None, dtype="float64")
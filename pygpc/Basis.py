@@ -19,10 +19,13 @@ class Basis:
     """
     Basis class of gPC
 
+    The basis is stored in compact form by the multi-indices and tables of the univariate basis functions of every
+    parameter and order. The nested list of BasisFunction objects (Basis.b) is generated from it on demand.
+
     Attributes
     ----------
     b : list of list of BasisFunction object instances [n_basis][n_dim]
-        Parameter wise basis function objects used in gPC.
+        Parameter wise basis function objects used in gPC (read only view, generated from multi_indices).
         Multiplying all elements in a row at location xi = (x1, x2, ..., x_dim) yields the global basis function.
     b_array : ndarray of float [n_poly_coeffs]
         Polynomial coefficients of basis functions
@@ -38,12 +41,27 @@ class Basis:
         Total number of (global) basis function
     multi_indices: ndarray [n_basis x dim]
         Multi-indices of polynomial basis functions
+    multi_indices_idx: dict
+        Index of the basis, mapping the multi-indices (tuple of int [dim]) to the position of the basis functions
+        in self.b (used to detect duplicates when the basis is extended)
+    basis_function_types: list of str [dim]
+        Names of the univariate BasisFunction classes of the parameters (e.g. "Jacobi")
+    basis_function_params: list of dict [dim]
+        Parameters of the univariate basis functions of the parameters (without the order "i")
+    b_coeffs_table: ndarray of float [dim x n_order x n_order]
+        Polynomial coefficients (highest order first) of the univariate basis functions of every parameter and order
+    b_norm_table: ndarray of float [dim x n_order]
+        Normalization factors of the univariate basis functions of every parameter and order (0 if not initialized)
+    b_int_table: ndarray of float [dim x n_order]
+        Integrals of the univariate basis functions w.r.t. the pdf of every parameter and order
+    b_int_der_table: ndarray of float [dim x n_order]
+        Integrals of the derivatives of the univariate basis functions w.r.t. the pdf of every parameter and order
     """
     def __init__(self):
         """
         Constructor; initializes the Basis class
         """
-        self.b = None
+        self._b = None
         self.b_array = None
         self.b_array_grad = None
         self.b_id = None
@@ -52,6 +70,248 @@ class Basis:
         self.dim = None
         self.n_basis = 0
         self.multi_indices = None
+        self.multi_indices_idx = None
+        self.basis_function_types = None
+        self.basis_function_params = None
+        self.b_coeffs_table = None
+        self.b_norm_table = None
+        self.b_int_table = None
+        self.b_int_der_table = None
+
+    def __getstate__(self):
+        """
+        Returns the state of the Basis object (used by pickle, deepcopy and the .hdf5 export). The BasisFunction
+        objects (self.b) and the hash index of the multi-indices are omitted, they are restored on demand.
+        """
+        state = self.__dict__.copy()
+        state.pop("_b", None)
+        state.pop("multi_indices_idx", None)
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state of the Basis object (used by pickle and deepcopy). States of the former layout, which
+        contain the BasisFunction objects (b) instead of the tables of the univariate basis functions, are converted
+        to the compact layout.
+        """
+        b_legacy = state.pop("b", None)
+
+        self.__init__()
+        self.__dict__.update(state)
+        self._b = None
+        self.multi_indices_idx = None
+
+        if self.basis_function_types is None and b_legacy:
+            self.init_basis_legacy(b_legacy)
+
+    def init_basis_legacy(self, b):
+        """
+        Initializes the compact layout (multi-indices and tables of the univariate basis functions) from the
+        BasisFunction objects of a Basis object of the former layout. The IDs of the basis functions are kept.
+
+        Parameters
+        ----------
+        b : list of list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects
+        """
+        self.dim = len(b[0])
+        self.n_basis = len(b)
+        self.set_basis_function_types(b[0])
+
+        if self.multi_indices is None or np.asarray(self.multi_indices).size != self.n_basis * self.dim:
+            self.multi_indices = self.get_multi_indices_basis_functions(b)
+
+        self.multi_indices = np.asarray(self.multi_indices, dtype=int).reshape(self.n_basis, self.dim)
+        self.extend_basis_function_tables(np.max(self.multi_indices, axis=0))
+
+        if self.b_id is None or len(self.b_id) != self.n_basis:
+            self.b_id = [uuid.uuid4() for _ in range(self.n_basis)]
+
+        # the arrays of the polynomial coefficients of the former layout differ (gradient), they are reinitialized
+        self.init_basis_array()
+        self.init_basis_norm()
+
+    @property
+    def b(self):
+        """
+        Parameter wise basis function objects used in gPC [n_basis][n_dim]. The list is generated from the
+        multi-indices on first access. The univariate basis functions are shared between the global basis functions.
+        """
+        if self._b is None and self.multi_indices is not None and self.basis_function_types is not None:
+            self._b = self.get_basis_functions(self.multi_indices)
+
+        return self._b
+
+    def get_basis_functions(self, multi_indices):
+        """
+        Returns the BasisFunction objects of the global basis functions with the given multi-indices.
+
+        b = Basis.get_basis_functions(multi_indices)
+
+        Parameters
+        ----------
+        multi_indices : ndarray of int [n_basis x dim]
+            Multi-indices of the global basis functions
+
+        Returns
+        -------
+        b : list of list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects
+        """
+        multi_indices = np.asarray(multi_indices, dtype=int)
+
+        b_dim = [[get_basis_function(self.basis_function_types[i_dim], dict(self.basis_function_params[i_dim], i=o))
+                  for o in range(np.max(multi_indices[:, i_dim], initial=0) + 1)]
+                 for i_dim in range(multi_indices.shape[1])]
+
+        return [[b_dim[i_dim][o] for i_dim, o in enumerate(m)] for m in multi_indices.tolist()]
+
+    def set_basis_function_types(self, b_dim):
+        """
+        Sets the types and parameters of the univariate basis functions of the parameters and initializes the
+        (empty) tables of the univariate basis functions.
+
+        Parameters
+        ----------
+        b_dim : list of BasisFunction object instances [dim]
+            Univariate basis functions of the parameters (arbitrary order)
+        """
+        self.basis_function_types = [type(_b).__name__ for _b in b_dim]
+        self.basis_function_params = [{key: _b.p[key] for key in _b.p if key != "i"} for _b in b_dim]
+        self.b_coeffs_table = np.zeros((len(b_dim), 0, 0))
+        self.b_norm_table = np.zeros((len(b_dim), 0))
+        self.b_int_table = np.zeros((len(b_dim), 0))
+        self.b_int_der_table = np.zeros((len(b_dim), 0))
+
+    def extend_basis_function_tables(self, order_max):
+        """
+        Extends the tables of the univariate basis functions (polynomial coefficients, normalization factors and
+        integrals) such that they contain the orders 0 ... order_max[i_dim] of every parameter.
+
+        Parameters
+        ----------
+        order_max : ndarray of int [dim]
+            Maximum order of the univariate basis functions of every parameter
+        """
+        n_order_old = self.b_norm_table.shape[1]
+        n_order = max(n_order_old, int(np.max(order_max)) + 1)
+
+        if n_order > n_order_old:
+            # polynomial coefficients are aligned to the right (highest order first)
+            b_coeffs_table = np.zeros((self.b_coeffs_table.shape[0], n_order, n_order))
+            b_coeffs_table[:, :n_order_old, n_order - n_order_old:] = self.b_coeffs_table
+            self.b_coeffs_table = b_coeffs_table
+
+            for key in ["b_norm_table", "b_int_table", "b_int_der_table"]:
+                table = np.zeros((self.b_norm_table.shape[0], n_order))
+                table[:, :n_order_old] = getattr(self, key)
+                setattr(self, key, table)
+
+        for i_dim in range(self.b_norm_table.shape[0]):
+            n_order_dim = int(order_max[i_dim]) + 1
+
+            # normalization factors are > 0 for initialized basis functions
+            if (self.b_norm_table[i_dim, :n_order_dim] > 0).all():
+                continue
+
+            # normalization factors and integrals of all orders of the parameter
+            self.b_norm_table[i_dim, :n_order_dim], \
+                self.b_int_table[i_dim, :n_order_dim], \
+                self.b_int_der_table[i_dim, :n_order_dim] = get_basis_function_tables(
+                    self.basis_function_types[i_dim], self.basis_function_params[i_dim], n_order_dim - 1)
+
+            for o in range(n_order_dim):
+                _b = get_basis_function(self.basis_function_types[i_dim], dict(self.basis_function_params[i_dim], i=o))
+                self.b_coeffs_table[i_dim, o, n_order - len(_b.fun.c):] = _b.fun.c
+
+    def get_univariate_table(self, i_dim, knots, derivative=False):
+        """
+        Evaluates the univariate basis functions of parameter i_dim of all orders contained in the tables at the
+        1D knots (Horner scheme on the table of polynomial coefficients).
+
+        idx, table, table_der = Basis.get_univariate_table(i_dim, knots, derivative=False)
+
+        Parameters
+        ----------
+        i_dim : int
+            Index of parameter
+        knots : ndarray of float [n_knots]
+            Coordinates where the univariate basis functions are evaluated (normalized [-1, 1])
+        derivative : bool, optional, default: False
+            Additionally evaluate the derivatives of the univariate basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis]
+            Column indices of the univariate basis functions of the global basis functions in the table (order)
+        table : ndarray of float [n_knots x n_order]
+            Function values of the univariate basis functions at the knots
+        table_der : ndarray of float [n_knots x n_order] or None
+            Derivatives of the univariate basis functions at the knots (if derivative=True)
+        """
+        coeffs = self.b_coeffs_table[i_dim]
+        n_order = coeffs.shape[0]
+
+        table = np.zeros((knots.shape[0], n_order))
+        for i_coeff in range(n_order):
+            table = table * knots[:, np.newaxis] + coeffs[np.newaxis, :, i_coeff]
+
+        table_der = None
+        if derivative:
+            coeffs_der = coeffs[:, :-1] * np.arange(n_order - 1, 0, -1)[np.newaxis, :]
+            table_der = np.zeros((knots.shape[0], n_order))
+            for i_coeff in range(n_order - 1):
+                table_der = table_der * knots[:, np.newaxis] + coeffs_der[np.newaxis, :, i_coeff]
+            table_der = table_der.astype(knots.dtype, copy=False)
+
+        return self.multi_indices[:, i_dim], table.astype(knots.dtype, copy=False), table_der
+
+    def get_univariate_tables(self, x, derivative=False):
+        """
+        Evaluates the univariate basis functions of every parameter and order at every distinct coordinate of each
+        dimension using the tables of the polynomial coefficients (see GPC.get_univariate_tables):
+
+        psi[i_x, i_basis] = prod_i_dim tables[i_dim][idx_x[i_x, i_dim], idx[i_basis, i_dim]]
+
+        idx, tables, tables_der, idx_x = Basis.get_univariate_tables(x, derivative=False)
+
+        Parameters
+        ----------
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the basis functions are evaluated (normalized [-1, 1])
+        derivative : bool, optional, default: False
+            Additionally evaluate the derivatives of the univariate basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis x n_dim]
+            Column indices of the univariate basis functions in the tables (multi-indices)
+        tables : list of ndarray of float [n_dim][n_knots x n_order]
+            Function values of the univariate basis functions of each parameter at the distinct coordinates
+        tables_der : list of ndarray of float [n_dim][n_knots x n_order] or None
+            Derivatives of the univariate basis functions of each parameter at the distinct coordinates
+            (if derivative=True)
+        idx_x : ndarray of int [n_x x n_dim]
+            Row indices of the coordinates x in the tables
+        """
+        n_dim = x.shape[1]
+
+        idx_x = np.zeros((x.shape[0], n_dim), dtype=int)
+        tables = [0 for _ in range(n_dim)]
+        tables_der = [0 for _ in range(n_dim)] if derivative else None
+
+        for i_dim in range(n_dim):
+            # distinct coordinates (1D knots) in this dimension
+            knots, idx_x[:, i_dim] = np.unique(x[:, i_dim], return_inverse=True)
+
+            _, tables[i_dim], table_der = self.get_univariate_table(i_dim=i_dim,
+                                                                    knots=knots.astype(x.dtype),
+                                                                    derivative=derivative)
+            if derivative:
+                tables_der[i_dim] = table_der
+
+        return self.multi_indices, tables, tables_der, idx_x
 
     def set_basis(self, i_basis, problem):
         """
@@ -73,35 +333,20 @@ class Basis:
         b_a_ : ndarray of int
             Concatenated list of polynomial basis coefficients
         b_a_grad_ : ndarray of int
-            Concatenated list of polynomial basis coefficients for gradient evaluation
+            Concatenated list of polynomial basis coefficients and their derivatives for gradient evaluation
         """
 
         b_ = [0 for _ in range(problem.dim)]
-        b_a_ = []
-        b_a_grad_ = []
 
         for i_dim, p in enumerate(problem.parameters_random):   # OrderedDict of RandomParameter objects
             b_[i_dim] = problem.parameters_random[p].init_basis_function(order=self.multi_indices[i_basis, i_dim])
 
-        for i_dim in range(problem.dim):
-            for i_dim_inner in range(problem.dim):
-                if i_dim == 0:
-                    b_a_ = b_a_ + [np.array([b_[i_dim_inner].fun.order]),
-                                   b_[i_dim_inner].fun.c]
-                if i_dim == i_dim_inner:
-                    b_a_grad_ = b_a_grad_ + [np.array([b_[i_dim_inner].fun.deriv().order]),
-                                             b_[i_dim_inner].fun.deriv().c]
-                else:
-                    b_a_grad_ = b_a_grad_ + [np.array([b_[i_dim_inner].fun.order]),
-                                             b_[i_dim_inner].fun.c]
-
-        b_a_ = np.concatenate(b_a_)
-        b_a_grad_ = np.concatenate(b_a_grad_)
+        b_a_, b_a_grad_ = self.get_basis_array([b_])
 
         return b_, b_a_, b_a_grad_
 
     def init_basis_sgpc(self, problem, order, order_max, order_max_norm, interaction_order,
-                        interaction_order_current=None):
+                        interaction_order_current=None, n_cpu=None):
         """
         Initializes basis functions for standard gPC.
 
@@ -128,6 +373,10 @@ class Basis:
             Number of random variables currently interacting with respect to the highest order.
             (interaction_order_current <= interaction_order)
             The parameters for lower orders are all interacting with "interaction order".
+        n_cpu : int, optional, default: None
+            Number of processes to initialize the basis functions in parallel (multiprocessing.Pool).
+            If None, the basis functions are initialized in the current process, where the univariate basis
+            functions are created only once for every parameter and order (recommended).
 
         Notes
         -----
@@ -146,9 +395,9 @@ class Basis:
 
         Adds Attributes:
 
-        b: list of BasisFunction object instances [n_basis x n_dim]
-            Parameter wise basis function objects used in gPC.
-            Multiplying all elements in a row at location xi = (x1, x2, ..., x_dim) yields the global basis function.
+        multi_indices: ndarray [n_basis x dim]
+            Multi-indices of polynomial basis functions, which define the (lazily generated) basis functions
+            objects in self.b together with the tables of the univariate basis functions.
         """
 
         self.dim = problem.dim
@@ -166,23 +415,25 @@ class Basis:
         # get total number of basis functions
         self.n_basis = self.multi_indices.shape[0]
 
-        # construct 2D list with BasisFunction objects and array with coefficients and
+        # hash index of multi-indices
+        self.init_multi_indices_idx()
+
+        # tables of the univariate basis functions of the parameters up to the maximum order
+        self.set_basis_function_types([problem.parameters_random[p].init_basis_function(order=0)
+                                       for p in problem.parameters_random])
+        self.extend_basis_function_tables(np.max(self.multi_indices, axis=0))
+        self._b = None
+
         # initialize array of basis coefficients
-        workhorse_partial = partial(self.set_basis, problem=problem)
-
-        with multiprocessing.Pool(multiprocessing.cpu_count()) as pool:
-            out = pool.map(workhorse_partial, range(self.n_basis))
-            self.b = [o[0] for o in out]
-            self.b_array = np.concatenate([o[1] for o in out])
-            self.b_array_grad = np.concatenate([o[2] for o in out])
-
-        # This is the single core implementation:
-        # self.b = [[0 for _ in range(self.dim)] for _ in range(self.n_basis)]
-        #
-        # for i_basis in range(self.n_basis):
-        #     for i_dim, p in enumerate(problem.parameters_random):   # OrderedDict of RandomParameter objects
-        #         self.b[i_basis][i_dim] = problem.parameters_random[p].init_basis_function(
-        #             order=self.multi_indices[i_basis, i_dim])
+        if n_cpu is not None and n_cpu > 1:
+            workhorse_partial = partial(self.set_basis, problem=problem)
+
+            with multiprocessing.Pool(n_cpu) as pool:
+                out = pool.map(workhorse_partial, range(self.n_basis))
+                self.b_array = np.concatenate([o[1] for o in out])
+                self.b_array_grad = np.concatenate([o[2] for o in out])
+        else:
+            self.init_basis_array()
 
         # Generate unique IDs of basis functions
         self.b_id = [uuid.uuid4() for _ in range(self.n_basis)]
@@ -195,8 +446,8 @@ class Basis:
         Construct array of scaling factors self.b_norm [n_basis x dim] and self.b_norm_basis [n_basis x 1]
         to normalize basis functions <psi^2> = int(psi^2*p)dx
         """
-        # read individual normalization factors from function objects
-        self.b_norm = np.array([list(map(lambda x:x.fun_norm, _b)) for _b in self.b])
+        # read individual normalization factors from the tables of the parameters
+        self.b_norm = self.b_norm_table[np.arange(self.dim)[np.newaxis, :], self.multi_indices]
 
         # determine global normalization factor of basis function
         self.b_norm_basis = np.prod(self.b_norm, axis=1)
@@ -242,13 +493,8 @@ class Basis:
                                                   interaction_order_current=interaction_order_current)
 
         # delete multi-indices, which are already present
-        if self.b is not None:
-            multi_indices_all_current = np.array([list(map(lambda x: x.p["i"], _b)) for _b in self.b])
-
-            idx_old = np.hstack([np.where((multi_indices_all_current[i, :] == multi_indices_all_new).all(axis=1))
-                                 for i in range(multi_indices_all_current.shape[0])])
-
-            multi_indices_all_new = np.delete(multi_indices_all_new, idx_old, axis=0)
+        if self.multi_indices is not None:
+            multi_indices_all_new = multi_indices_all_new[self.get_basis_idx(multi_indices_all_new) < 0, :]
 
         if multi_indices_all_new.any():
 
@@ -261,7 +507,7 @@ class Basis:
                         order=multi_indices_all_new[i_basis, i_p])
 
             # extend basis
-            self.extend_basis(b_added)
+            self.extend_basis(b_added, multi_indices=multi_indices_all_new)
 
         return b_added
 
@@ -277,14 +523,11 @@ class Basis:
         problem : Problem class instance
             GPC Problem to analyze
         """
-        # delete multi-indices, which are already present
-        if self.b is not None:
-            multi_indices_all_current = np.array([list(map(lambda x: x.p["i"], _b)) for _b in self.b])
-
-            idx_old = np.hstack([np.where((multi_indices_all_current[i, :] == multi_indices).all(axis=1))
-                                 for i in range(multi_indices_all_current.shape[0])])
+        b_added = None
 
-            multi_indices = np.delete(multi_indices, idx_old, axis=0)
+        # delete multi-indices, which are already present
+        if self.multi_indices is not None:
+            multi_indices = multi_indices[self.get_basis_idx(multi_indices) < 0, :]
 
         if multi_indices.any():
             # construct 2D list with new BasisFunction objects
@@ -296,101 +539,271 @@ class Basis:
                         order=multi_indices[i_basis, i_p])
 
             # extend basis
-            self.extend_basis(b_added)
+            self.extend_basis(b_added, multi_indices=multi_indices)
 
         return b_added
 
-    def extend_basis(self, b_added):
+    @staticmethod
+    def get_multi_indices_basis_functions(b):
+        """
+        Determines the multi-indices of global polynomial basis functions from the orders of their univariate basis
+        functions.
+
+        multi_indices = Basis.get_multi_indices_basis_functions(b)
+
+        Parameters
+        ----------
+        b : list of list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects
+
+        Returns
+        -------
+        multi_indices : ndarray of int [n_basis x dim]
+            Multi-indices of the basis functions
         """
-        Extend set of basis functions. Skips basis functions, which are already present in self.b.
+        if any(["i" not in _b_dim.p for _b in b for _b_dim in _b]):
+            raise ValueError("The multi-indices of basis functions without order (e.g. StepUp, Rect, SigmoidUp) can "
+                             "not be determined, provide them explicitly (multi_indices)")
+
+        return np.array([[int(_b_dim.p["i"]) for _b_dim in _b] for _b in b], dtype=int).reshape(len(b), -1)
+
+    def extend_basis(self, b_added, multi_indices=None):
+        """
+        Extend set of basis functions. Skips basis functions, which are already present in self.b
+        (identified by their multi-indices using the hash index self.multi_indices_idx).
 
         Parameters
         ----------
         b_added: list of list of BasisFunction instances [n_b_added][dim]
             Individual BasisFunctions to add
+        multi_indices: ndarray of int [n_b_added x dim], optional, default: None
+            Multi-indices of the added basis functions (if None, they are determined from the orders of the
+            univariate basis functions)
         """
-        if self.b is None:
-            self.b = []
-
         if self.b_id is None:
             self.b_id = []
 
-        # add b_added to b (check for duplicates) and generate IDs
-        for i_row, _b in enumerate(b_added):
-            if _b not in self.b:
-                self.b.append(_b)
+        if self.multi_indices_idx is None:
+            self.init_multi_indices_idx()
+
+        if self.basis_function_types is None and len(b_added) > 0:
+            self.dim = len(b_added[0])
+            self.set_basis_function_types(b_added[0])
+
+        # add multi-indices of b_added (check for duplicates using the hash index of the multi-indices)
+        # and generate IDs
+        multi_indices_new = []
+
+        if multi_indices is None:
+            multi_indices = self.get_multi_indices_basis_functions(b_added)
+
+        for multi_index in np.asarray(multi_indices, dtype=int).reshape(len(b_added), -1).tolist():
+            multi_index = tuple(multi_index)
+
+            if multi_index not in self.multi_indices_idx:
+                self.multi_indices_idx[multi_index] = self.n_basis + len(multi_indices_new)
                 self.b_id.append(uuid.uuid4())
-                self.multi_indices = np.vstack((self.multi_indices,
-                                               np.array([_b[i_dim].p["i"] for i_dim in range(self.dim)])))
+                multi_indices_new.append(multi_index)
+
+        if multi_indices_new:
+            multi_indices_new = np.array(multi_indices_new, dtype=int)
+
+            self.extend_basis_function_tables(np.max(multi_indices_new, axis=0))
+
+            if self.multi_indices is None or len(self.multi_indices) == 0:
+                self.multi_indices = multi_indices_new
+            else:
+                self.multi_indices = np.vstack((self.multi_indices, multi_indices_new))
+
+            # extend the view of the BasisFunction objects if it was already generated
+            if self._b is not None:
+                self._b += self.get_basis_functions(multi_indices_new)
+
+            # extend array of basis coefficients
+            self.extend_basis_array(multi_indices_new)
 
         # update size
-        self.n_basis = len(self.b)
+        self.n_basis = 0 if self.multi_indices is None else len(self.multi_indices)
 
         # update normalization factors
         self.init_basis_norm()
 
-        # extend array of basis coefficients
-        self.extend_basis_array(b_added)
+    def init_multi_indices_idx(self):
+        """
+        Initializes the hash index self.multi_indices_idx, which maps the multi-indices of the basis functions
+        (tuple of int [dim]) to their position in self.b.
+        """
+        if self.multi_indices is None:
+            self.multi_indices_idx = dict()
+        else:
+            self.multi_indices_idx = {tuple(m): i for i, m in enumerate(np.asarray(self.multi_indices,
+                                                                                    dtype=int).tolist())}
+
+    def get_basis_idx(self, multi_indices):
+        """
+        Determines the position of basis functions in self.b from their multi-indices using the hash index.
+
+        idx = Basis.get_basis_idx(multi_indices)
+
+        Parameters
+        ----------
+        multi_indices : ndarray of int [n_basis_lookup x dim]
+            Multi-indices of the basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis_lookup]
+            Position of the basis functions in self.b (-1 if not present)
+        """
+        if self.multi_indices_idx is None:
+            self.init_multi_indices_idx()
+
+        return np.array([self.multi_indices_idx.get(tuple(m), -1)
+                         for m in np.asarray(multi_indices, dtype=int).tolist()], dtype=int)
 
     def init_basis_array(self):
         """
-        Initialize polynomial basis coefficients for fast processing. Converts list of lists of self.b
-        into np.ndarray that can be processed on multi core systems.
+        Initialize polynomial basis coefficients for fast processing. Converts the multi-indices and the tables of
+        the univariate basis functions into np.ndarray that can be processed on multi core systems.
+        """
+        self.b_array, self.b_array_grad = self.get_basis_array_multi_indices(self.multi_indices)
+
+    def extend_basis_array(self, multi_indices):
+        """
+        Extends polynomial basis coefficients for fast processing. Converts the multi-indices of the added basis
+        functions and the tables of the univariate basis functions into np.ndarray that can be processed on multi
+        core systems.
+
+        Parameters
+        ----------
+        multi_indices: ndarray of int [n_b_added x dim]
+            Multi-indices of the added basis functions
+        """
+        _b_array, _b_array_grad = self.get_basis_array_multi_indices(multi_indices)
+
+        if self.b_array is not None:
+            self.b_array = np.hstack((self.b_array, _b_array))
+        else:
+            self.b_array = _b_array
+
+        if self.b_array_grad is not None:
+            self.b_array_grad = np.hstack((self.b_array_grad, _b_array_grad))
+        else:
+            self.b_array_grad = _b_array_grad
+
+    def get_basis_array_multi_indices(self, multi_indices):
+        """
+        Converts multi-indices into concatenated arrays of polynomial basis coefficients using the tables of the
+        univariate basis functions (same layout as Basis.get_basis_array).
+
+        b_array, b_array_grad = Basis.get_basis_array_multi_indices(multi_indices)
+
+        Parameters
+        ----------
+        multi_indices : ndarray of int [n_basis x dim]
+            Multi-indices of the global basis functions
+
+        Returns
+        -------
+        b_array : ndarray of float [n_poly_coeffs]
+            Concatenated polynomial basis coefficients
+        b_array_grad : ndarray of float [n_poly_coeffs_grad]
+            Concatenated polynomial basis coefficients and coefficients of their derivatives for gradient evaluation
         """
+        multi_indices = np.asarray(multi_indices, dtype=int)
+
+        # [order, coeffs] and [order, coeffs, order_der, coeffs_der] of every parameter and order
+        segments = [[None for _ in range(self.b_coeffs_table.shape[1])] for _ in range(multi_indices.shape[1])]
+        for i_dim in range(multi_indices.shape[1]):
+            for o in np.unique(multi_indices[:, i_dim]):
+                fun = np.poly1d(self.b_coeffs_table[i_dim, o])
+                fun_der = fun.deriv()
+                segments[i_dim][o] = (np.array([fun.order]), fun.c, np.array([fun_der.order]), fun_der.c)
 
         _b_array = []
         _b_array_grad = []
-        for i_basis in range(self.n_basis):
-            for i_dim_outer in range(self.dim):
-                for i_dim_inner in range(self.dim):
-                    if i_dim_outer == 0:
-                        _b_array = _b_array + [np.array([self.b[i_basis][i_dim_inner].fun.order]),
-                                               self.b[i_basis][i_dim_inner].fun.c]
-                    if i_dim_outer == i_dim_inner:
-                        _b_array_grad = _b_array_grad + [np.array([self.b[i_basis][i_dim_inner].fun.deriv().order]),
-                                                         self.b[i_basis][i_dim_inner].fun.deriv().c]
-                    else:
-                        _b_array_grad = _b_array_grad + [np.array([self.b[i_basis][i_dim_inner].fun.order]),
-                                                         self.b[i_basis][i_dim_inner].fun.c]
 
-        self.b_array = np.concatenate(_b_array)
-        self.b_array_grad = np.concatenate(_b_array_grad)
+        for m in multi_indices.tolist():
+            for i_dim, o in enumerate(m):
+                _b_array += segments[i_dim][o][:2]
+                _b_array_grad += segments[i_dim][o]
+
+        return np.concatenate(_b_array), np.concatenate(_b_array_grad)
 
-    def extend_basis_array(self, b_added):
+    @staticmethod
+    def get_basis_array(b):
         """
-        Extends polynomial basis coefficients for fast processing. Converts list of lists of b_added
-        into np.ndarray that can be processed on multi core systems.
+        Converts list of lists of BasisFunction instances into concatenated arrays of polynomial basis coefficients,
+        which can be processed by the C/C++ and CUDA backends. For every basis function and parameter, the order
+        of the polynomial is followed by its coefficients (highest order first). In the compact gradient layout,
+        every polynomial is followed by its derivative, such that all partial derivatives of a basis function can be
+        determined in one pass: [order, coeffs, order_der, coeffs_der].
+
+        b_array, b_array_grad = Basis.get_basis_array(b)
 
         Parameters
         ----------
-        b_added: list of list of BasisFunction instances [n_b_added][dim]
-            Individual BasisFunctions to add
-        """
+        b : list of list of BasisFunction instances [n_basis][dim]
+            Individual BasisFunctions (e.g. Basis.b or a subset of it)
 
+        Returns
+        -------
+        b_array : ndarray of float [n_poly_coeffs]
+            Concatenated polynomial basis coefficients
+        b_array_grad : ndarray of float [n_poly_coeffs_grad]
+            Concatenated polynomial basis coefficients and coefficients of their derivatives for gradient evaluation
+        """
         _b_array = []
         _b_array_grad = []
-        for i_basis in range(len(b_added)):
-            for i_dim_outer in range(self.dim):
-                for i_dim_inner in range(self.dim):
-                    if i_dim_outer == 0:
-                        _b_array = _b_array + [np.array([b_added[i_basis][i_dim_inner].fun.order]),
-                                               b_added[i_basis][i_dim_inner].fun.c]
+
+        # coefficients of univariate basis functions, which are shared between global basis functions
+        coeffs = dict()
+
+        for _b in b:
+            for _b_dim in _b:
+                if id(_b_dim) not in coeffs:
+                    fun_der = _b_dim.fun.deriv()
+                    coeffs[id(_b_dim)] = (np.array([_b_dim.fun.order]), _b_dim.fun.c,
+                                          np.array([fun_der.order]), fun_der.c)
+                c = coeffs[id(_b_dim)]
+                _b_array += c[:2]
+                _b_array_grad += c
+
+        return np.concatenate(_b_array), np.concatenate(_b_array_grad)
+
+    @staticmethod
+    def get_basis_array_grad_expanded(b):
+        """
+        Converts list of lists of BasisFunction instances into concatenated arrays of polynomial basis coefficients
+        for gradient evaluation, where the coefficients of every basis function are repeated dim times (one copy per
+        derivative direction). This layout is used by the CUDA backend.
+
+        b_array_grad = Basis.get_basis_array_grad_expanded(b)
+
+        Parameters
+        ----------
+        b : list of list of BasisFunction instances [n_basis][dim]
+            Individual BasisFunctions (e.g. Basis.b or a subset of it)
+
+        Returns
+        -------
+        b_array_grad : ndarray of float [n_poly_coeffs_grad]
+            Concatenated polynomial basis coefficients for gradient evaluation
+        """
+        _b_array_grad = []
+
+        for _b in b:
+            dim = len(_b)
+            for i_dim_outer in range(dim):
+                for i_dim_inner in range(dim):
                     if i_dim_outer == i_dim_inner:
-                        _b_array_grad = _b_array_grad + [np.array([b_added[i_basis][i_dim_inner].fun.deriv().order]),
-                                                         b_added[i_basis][i_dim_inner].fun.deriv().c]
+                        _b_array_grad = _b_array_grad + [np.array([_b[i_dim_inner].fun.deriv().order]),
+                                                         _b[i_dim_inner].fun.deriv().c]
                     else:
-                        _b_array_grad = _b_array_grad + [np.array([b_added[i_basis][i_dim_inner].fun.order]),
-                                                         b_added[i_basis][i_dim_inner].fun.c]
+                        _b_array_grad = _b_array_grad + [np.array([_b[i_dim_inner].fun.order]),
+                                                         _b[i_dim_inner].fun.c]
 
-        if self.b_array is not None:
-            self.b_array = np.hstack((self.b_array, np.concatenate(_b_array)))
-        else:
-            self.b_array = np.concatenate(_b_array)
-
-        if self.b_array_grad is not None:
-            self.b_array_grad = np.hstack((self.b_array_grad, np.concatenate(_b_array_grad)))
-        else:
-            self.b_array_grad = np.concatenate(_b_array_grad)
+        return np.concatenate(_b_array_grad)
 
     def plot_basis(self, dims, fn_plot=None, dynamic_plot_update=False):
         """
@@ -412,7 +825,7 @@ class Basis:
         plt.rc('text', usetex=False)
         plt.rc('font', family='serif', size=14)
 
-        multi_indices = np.array([list(map(lambda x: x.p["i"], _b)) for _b in self.b])
+        multi_indices = self.multi_indices
 
         fig = plt.figure(figsize=[6, 6])
 
@@ -1,3 +1,6 @@
+import functools
+import threading
+import collections
 import scipy.special
 import scipy.stats
 import numpy as np
@@ -71,19 +74,12 @@ class Jacobi(BasisFunction):
 
         super(Jacobi, self).__init__(p)
 
-        # determine polynomial normalization factor
-        beta_norm = (scipy.special.gamma(self.p["q"]) * scipy.special.gamma(self.p["p"]) /
-                     scipy.special.gamma(self.p["p"] + self.p["q"]) * 2.0 ** (self.p["p"] + self.p["q"] - 1)) ** (-1)
-
-        jacobi_norm = 2 ** (self.p["p"] + self.p["q"] - 1) / (
-                      (2.0 * self.p["i"] + self.p["p"] + self.p["q"] - 1)) * (
-                      scipy.special.gamma(self.p["i"] + self.p["p"])) * (
-                      scipy.special.gamma(self.p["i"] + self.p["q"])) / (
-                              scipy.special.gamma(self.p["i"] + self.p["p"] + self.p["q"] - 1) *
-                              scipy.special.factorial(self.p["i"]))
-
-        # normalization factor of polynomial (to later normalize basis functions <psi^2> = int(psi^2*p)dx)
-        self.fun_norm = jacobi_norm * beta_norm
+        # normalization factor of polynomial (to later normalize basis functions <psi^2> = int(psi^2*p)dx) and
+        # integral of fun and fun_der w.r.t. pdf (tables are shared between all orders)
+        fun_norm, fun_int, fun_der_int = get_basis_function_tables(Jacobi, self.p, self.p["i"])
+        self.fun_norm = fun_norm[self.p["i"]]
+        self.fun_int = fun_int[self.p["i"]]
+        self.fun_der_int = fun_der_int[self.p["i"]]
 
         # define basis function
         self.fun = scipy.special.jacobi(self.p["i"],
@@ -94,10 +90,65 @@ class Jacobi(BasisFunction):
         # derivative of polynomial
         self.fun_der = np.polyder(self.fun)
 
-        # integral of fun and fun_der w.r.t. pdf (numerical integration with corresponding weights)
-        knots, weights = get_quadrature_jacobi_1d(n=10 * self.p["i"], p=self.p["p"] - 1, q=self.p["q"] - 1)
-        self.fun_int = np.dot(self.fun(knots), weights)
-        self.fun_der_int = np.dot(self.fun_der(knots), weights)
+    @staticmethod
+    def get_tables(p, order_max):
+        """
+        Determines the normalization factors of the Jacobi polynomials and the integrals of the polynomials and
+        their derivatives w.r.t. the pdf for the orders 0 ... order_max. Due to the orthogonality, only the
+        polynomial of order 0 has a non-zero integral. The integrals of the derivatives are determined with a single
+        Gauss-Jacobi quadrature, which is exact for all orders, using d/dx P_n^(a,b) = (n+a+b+1)/2 P_(n-1)^(a+1,b+1).
+
+        fun_norm, fun_int, fun_der_int = Jacobi.get_tables(p, order_max)
+
+        Parameters
+        ----------
+        p : dict
+            Parameters of the Jacobi polynomial (p["i"] is ignored)
+            - p["p"] ... first shape parameter
+            - p["q"] ... second shape parameter
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the polynomials
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the normalized polynomials w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the normalized polynomials w.r.t. the pdf
+        """
+        i = np.arange(order_max + 1)
+
+        # determine polynomial normalization factor
+        beta_norm = (scipy.special.gamma(p["q"]) * scipy.special.gamma(p["p"]) /
+                     scipy.special.gamma(p["p"] + p["q"]) * 2.0 ** (p["p"] + p["q"] - 1)) ** (-1)
+
+        jacobi_norm = 2 ** (p["p"] + p["q"] - 1) / (
+                      (2.0 * i + p["p"] + p["q"] - 1)) * (
+                      scipy.special.gamma(i + p["p"])) * (
+                      scipy.special.gamma(i + p["q"])) / (
+                              scipy.special.gamma(i + p["p"] + p["q"] - 1) *
+                              scipy.special.factorial(i))
+
+        fun_norm = jacobi_norm * beta_norm
+
+        # the weights of the Gauss-Jacobi quadrature sum up to 2
+        fun_int = np.zeros(order_max + 1)
+        fun_int[0] = 2. / np.sqrt(fun_norm[0])
+
+        fun_der_int = np.zeros(order_max + 1)
+
+        if order_max > 0:
+            a = p["q"] - 1.
+            b = p["p"] - 1.
+
+            knots, weights = get_quadrature_jacobi_1d(n=order_max, p=p["p"] - 1, q=p["q"] - 1)
+            fun_der = ((i[1:] + a + b + 1) / 2.)[:, np.newaxis] * \
+                scipy.special.eval_jacobi(i[1:, np.newaxis] - 1, a + 1, b + 1, knots[np.newaxis, :])
+            fun_der_int[1:] = np.dot(fun_der, weights) / np.sqrt(fun_norm[1:])
+
+        return fun_norm, fun_int, fun_der_int
 
 
 class Hermite(BasisFunction):
@@ -118,8 +169,12 @@ class Hermite(BasisFunction):
 
         super(Hermite, self).__init__(p)
 
-        # normalization factor of polynomial (to later normalize basis functions <psi^2> = int(psi^2*p)dx)
-        self.fun_norm = np.float64(scipy.special.factorial(p["i"]))
+        # normalization factor of polynomial (to later normalize basis functions <psi^2> = int(psi^2*p)dx) and
+        # integral of fun and fun_der w.r.t. pdf (tables are shared between all orders)
+        fun_norm, fun_int, fun_der_int = get_basis_function_tables(Hermite, self.p, self.p["i"])
+        self.fun_norm = fun_norm[self.p["i"]]
+        self.fun_int = fun_int[self.p["i"]]
+        self.fun_der_int = fun_der_int[self.p["i"]]
 
         # define basis function
         self.fun = scipy.special.hermitenorm(p["i"], monic=False) / np.sqrt(self.fun_norm)
@@ -127,14 +182,42 @@ class Hermite(BasisFunction):
         # derivative of polynomial
         self.fun_der = np.polyder(self.fun)
 
-        # integral of fun and fun_der w.r.t. pdf (numerical integration with corresponding weights)
-        if self.p["i"] == 0:
-            self.fun_int = 1.0
-            self.fun_der_int = 0.0
-        else:
-            knots, weights = get_quadrature_hermite_1d(n=10 * self.p["i"])
-            self.fun_int = np.dot(self.fun(knots), weights)
-            self.fun_der_int = np.dot(self.fun_der(knots), weights)
+    @staticmethod
+    def get_tables(p, order_max):
+        """
+        Determines the normalization factors of the Hermite polynomials and the integrals of the polynomials and
+        their derivatives w.r.t. the pdf for the orders 0 ... order_max in closed form. Due to the orthogonality and
+        d/dx He_n = n He_(n-1), only the polynomial of order 0 and the derivative of order 1 have non-zero integrals.
+
+        fun_norm, fun_int, fun_der_int = Hermite.get_tables(p, order_max)
+
+        Parameters
+        ----------
+        p : dict
+            Parameters of the Hermite polynomial (p["i"] is ignored)
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the polynomials
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the normalized polynomials w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the normalized polynomials w.r.t. the pdf
+        """
+        fun_norm = scipy.special.factorial(np.arange(order_max + 1)).astype(np.float64)
+
+        fun_int = np.zeros(order_max + 1)
+        fun_int[0] = 1.0
+
+        # the weights of the Gauss-Hermite quadrature sum up to 2
+        fun_der_int = np.zeros(order_max + 1)
+        if order_max > 0:
+            fun_der_int[1] = 2. / np.sqrt(fun_norm[1])
+
+        return fun_norm, fun_int, fun_der_int
 
 
 class Laguerre(BasisFunction):
@@ -158,8 +241,12 @@ class Laguerre(BasisFunction):
 
         super(Laguerre, self).__init__(p)
 
-        self.fun_norm = (scipy.special.factorial(p["i"]+p["alpha"]) / scipy.special.factorial(p["i"])) / \
-                        scipy.special.gamma(p["alpha"] + 1)
+        # normalization factor of polynomial (to later normalize basis functions <psi^2> = int(psi^2*p)dx) and
+        # integral of fun and fun_der w.r.t. pdf (tables are shared between all orders)
+        fun_norm, fun_int, fun_der_int = get_basis_function_tables(Laguerre, self.p, self.p["i"])
+        self.fun_norm = fun_norm[self.p["i"]]
+        self.fun_int = fun_int[self.p["i"]]
+        self.fun_der_int = fun_der_int[self.p["i"]]
 
         # define basis function
         self.fun = scipy.special.genlaguerre(p["i"], alpha=p["alpha"], monic=False) / np.sqrt(self.fun_norm)
@@ -167,14 +254,47 @@ class Laguerre(BasisFunction):
         # derivative of polynomial
         self.fun_der = np.polyder(self.fun)
 
-        # integral of fun and fun_der w.r.t. pdf (numerical integration with corresponding weights)
-        if self.p["i"] == 0:
-            self.fun_int = 1.0
-            self.fun_der_int = 0.0
-        else:
-            knots, weights = get_quadrature_laguerre_1d(n=10 * self.p["i"], alpha=p["alpha"])
-            self.fun_int = np.dot(self.fun(knots), weights)
-            self.fun_der_int = np.dot(self.fun_der(knots), weights)
+    @staticmethod
+    def get_tables(p, order_max):
+        """
+        Determines the normalization factors of the Laguerre polynomials and the integrals of the polynomials and
+        their derivatives w.r.t. the pdf for the orders 0 ... order_max in closed form. Due to the orthogonality,
+        only the polynomial of order 0 has a non-zero integral. The derivatives d/dx L_n^(a) = -sum_(k<n) L_k^(a)
+        contain the polynomial of order 0 with coefficient -1.
+
+        fun_norm, fun_int, fun_der_int = Laguerre.get_tables(p, order_max)
+
+        Parameters
+        ----------
+        p : dict
+            Parameters of the Laguerre polynomial (p["i"] is ignored)
+            - p["alpha"] ... shape parameter (alpha_poly = alpha_pdf - 1)
+            - p["beta"] ... rate parameter
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the polynomials
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the normalized polynomials w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the normalized polynomials w.r.t. the pdf
+        """
+        i = np.arange(order_max + 1)
+
+        fun_norm = (scipy.special.factorial(i + p["alpha"]) / scipy.special.factorial(i)) / \
+            scipy.special.gamma(p["alpha"] + 1)
+
+        fun_int = np.zeros(order_max + 1)
+        fun_int[0] = 1.0
+
+        # the weights of the Gauss-Laguerre quadrature sum up to gamma(alpha + 1)
+        fun_der_int = np.zeros(order_max + 1)
+        fun_der_int[1:] = -scipy.special.gamma(p["alpha"] + 1) / np.sqrt(fun_norm[1:])
+
+        return fun_norm, fun_int, fun_der_int
 
 
 class StepUp(BasisFunction):
@@ -319,3 +439,97 @@ class SigmoidDown(BasisFunction):
         # derivative
         self.fun_der = lambda x: (- p["r"] * np.exp(-p["r"] * (- x + p["xs"]))) / (1 + np.exp(-p["r"] *
                                  (- x + p["xs"])))**2
+
+
+@functools.lru_cache(maxsize=2**12)
+def _get_basis_function(basis_function_type, p_items):
+    """
+    Initializes the univariate basis function of get_basis_function (bounded memo of the least recently used basis
+    functions).
+    """
+    return basis_function_type(dict(p_items))
+
+
+def get_basis_function(basis_function_type, p):
+    """
+    Memoized factory of univariate basis functions. Basis functions of the same type with the same parameters
+    (e.g. shape parameters and order) are initialized only once and are shared between the global basis functions.
+    The memo is bounded and discards the least recently used basis functions. The returned basis functions are shared
+    and have to be treated as immutable.
+
+    basis_function = get_basis_function(basis_function_type, p)
+
+    Parameters
+    ----------
+    basis_function_type : BasisFunction class or str
+        Type of the basis function or its name (e.g. Jacobi, Hermite, Laguerre)
+    p : dict
+        Parameters of the basis function (see BasisFunction subclasses for details)
+
+    Returns
+    -------
+    basis_function : BasisFunction object instance
+        Univariate basis function
+    """
+    if isinstance(basis_function_type, str):
+        basis_function_type = globals()[basis_function_type]
+
+    return _get_basis_function(basis_function_type, tuple(sorted(p.items())))
+
+
+# tables of the normalization factors and integrals of the univariate basis functions (see get_basis_function_tables),
+# bounded memo of the least recently used tables
+_basis_function_tables = collections.OrderedDict()
+_basis_function_tables_maxsize = 2**10
+_basis_function_tables_lock = threading.Lock()
+
+
+def get_basis_function_tables(basis_function_type, p, order_max):
+    """
+    Memoized tables of the normalization factors and the integrals of the univariate polynomial basis functions and
+    their derivatives w.r.t. the pdf for the orders 0 ... order_max. The tables are determined only once for every
+    type and parameters of the basis functions and are extended if a higher order is requested (the tables of lower
+    orders are always slices of the same tables). The memo is bounded and discards the least recently used tables.
+    The returned tables are shared and read-only.
+
+    fun_norm, fun_int, fun_der_int = get_basis_function_tables(basis_function_type, p, order_max)
+
+    Parameters
+    ----------
+    basis_function_type : BasisFunction class or str
+        Type of the basis function or its name (Jacobi, Hermite or Laguerre)
+    p : dict
+        Parameters of the basis function (see BasisFunction subclasses for details, p["i"] is ignored)
+    order_max : int
+        Maximum order
+
+    Returns
+    -------
+    fun_norm : ndarray of float [order_max + 1]
+        Normalization factors of the basis functions
+    fun_int : ndarray of float [order_max + 1]
+        Integrals of the basis functions w.r.t. the pdf
+    fun_der_int : ndarray of float [order_max + 1]
+        Integrals of the derivatives of the basis functions w.r.t. the pdf
+    """
+    if isinstance(basis_function_type, str):
+        basis_function_type = globals()[basis_function_type]
+
+    order_max = int(order_max)
+    key = (basis_function_type.__name__, tuple(sorted([(k, v) for k, v in p.items() if k != "i"])))
+
+    with _basis_function_tables_lock:
+        if key not in _basis_function_tables or _basis_function_tables[key][0].shape[0] <= order_max:
+            tables = basis_function_type.get_tables(p, order_max)
+
+            for table in tables:
+                table.flags.writeable = False
+
+            _basis_function_tables[key] = tables
+
+        _basis_function_tables.move_to_end(key)
+
+        while len(_basis_function_tables) > _basis_function_tables_maxsize:
+            _basis_function_tables.popitem(last=False)
+
+        return tuple([table[:order_max + 1] for table in _basis_function_tables[key]])
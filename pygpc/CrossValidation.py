@@ -0,0 +1,177 @@
+import itertools
+import numpy as np
+from scipy.special import comb
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CrossValidation(object):
+    """
+    Cross validation of a regression, which is repeated for several test sets (folds). For every fold, the
+    coefficients are determined without the samples of the test set and the approximation is compared to the results
+    in the test set. The test sets are assigned once from a seeded random permutation of the samples, such that the
+    cross validation error is reproducible. The folds are independent and can be solved concurrently by a pool of
+    n_threads threads (the solvers spend most of the time in LAPACK/BLAS routines, which release the GIL). The
+    LAPACK/BLAS routines are multithreaded themselves, such that the folds are solved sequentially by default.
+
+    Parameters
+    ----------
+    scheme : str, optional, default: "leave_p_out"
+        Cross validation scheme
+        - "kfold" ... The samples are split into n_folds disjoint test sets of (almost) equal size
+        - "leave_p_out" ... Test sets of p samples. If the number of possible test sets exceeds n_max, n_max test
+          sets are drawn at random (disjoint if n_max * p <= n_samples)
+    n_folds : int, optional, default: 10
+        Number of folds of the "kfold" scheme (limited to the number of samples)
+    p : int, optional, default: 1
+        Number of samples in the test sets of the "leave_p_out" scheme
+    n_max : int, optional, default: 25
+        Maximum number of test sets of the "leave_p_out" scheme
+    seed : int, optional, default: 1
+        Seed of the random assignment of the samples to the test sets
+    n_threads : int, optional, default: None
+        Number of worker threads solving the folds concurrently (if None, the folds are solved sequentially)
+    error_norm : str, optional, default: "relative"
+        Decide if the error of the samples is determined "relative" or "absolute"
+    """
+
+    def __init__(self, scheme="leave_p_out", n_folds=10, p=1, n_max=25, seed=1, n_threads=None,
+                 error_norm="relative"):
+        """
+        Constructor; Initializes the CrossValidation object
+        """
+        if scheme not in ["kfold", "leave_p_out"]:
+            raise ValueError("Cross validation scheme '{}' not implemented (use 'kfold' or 'leave_p_out')".format(
+                scheme))
+
+        self.scheme = scheme
+        self.n_folds = n_folds
+        self.p = p
+        self.n_max = n_max
+        self.seed = seed
+        self.n_threads = n_threads
+        self.error_norm = error_norm
+
+    def get_folds(self, n_samples):
+        """
+        Assigns the samples to the test sets of the cross validation.
+
+        folds = CrossValidation.get_folds(n_samples)
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples
+
+        Returns
+        -------
+        folds : list of ndarray of int [n_folds][n_test]
+            Indices of the samples in the test sets
+        """
+        rng = np.random.RandomState(self.seed)
+        perm = rng.permutation(n_samples)
+
+        if self.scheme == "kfold":
+            return [np.sort(f) for f in np.array_split(perm, max(1, min(self.n_folds, n_samples)))]
+
+        p = max(1, min(self.p, n_samples - 1))
+
+        # all test sets
+        if comb(n_samples, p, exact=True) <= self.n_max:
+            return [np.array(f) for f in itertools.combinations(range(n_samples), p)]
+
+        # disjoint test sets
+        if self.n_max * p <= n_samples:
+            return [np.sort(f) for f in perm[:self.n_max * p].reshape(self.n_max, p)]
+
+        return [np.sort(rng.choice(n_samples, p, replace=False)) for _ in range(self.n_max)]
+
+    def run(self, fun, results, folds=None):
+        """
+        Performs the cross validation and determines the error statistics of the outputs.
+
+        statistics = CrossValidation.run(fun, results, folds=None)
+
+        Parameters
+        ----------
+        fun : function
+            Function fun(test_idx) -> ndarray of float [n_test x n_out] returning the approximation in the samples
+            test_idx, whose coefficients were determined without these samples
+        results : ndarray of float [n_samples x n_out]
+            Results in the samples
+        folds : list of ndarray of int [n_folds][n_test], optional, default: None
+            Test sets (if None, they are determined by get_folds)
+
+        Returns
+        -------
+        statistics : dict
+            Error statistics of the cross validation
+            - "error" : float ... Mean (relative) norm of the residuals of the tested samples (mean over samples of
+              ||y_i - y_cv_i|| / ||y_i||)
+            - "error_mean" : ndarray of float [n_out] ... Mean absolute residual of the outputs
+            - "error_rms" : ndarray of float [n_out] ... Root mean square residual of the outputs
+            - "error_max" : ndarray of float [n_out] ... Maximum absolute residual of the outputs
+            - "error_normalized" : ndarray of float [n_out] ... Mean square residual of the outputs normalized by
+              their variance (1 - Q^2)
+            - "sample_idx" : ndarray of int [n_tested] ... Indices of the tested samples
+            - "residuals" : ndarray of float [n_tested x n_out] ... Residuals of the tested samples
+        """
+        results = results.reshape(results.shape[0], -1)
+
+        if folds is None:
+            folds = self.get_folds(results.shape[0])
+
+        n_threads = self.n_threads if self.n_threads is not None else 1
+
+        if n_threads > 1 and len(folds) > 1:
+            with ThreadPoolExecutor(max_workers=min(n_threads, len(folds))) as executor:
+                approximations = list(executor.map(fun, folds))
+        else:
+            approximations = [fun(test_idx) for test_idx in folds]
+
+        sample_idx = np.concatenate(folds)
+        residuals = results[sample_idx, :] - np.concatenate([a.reshape(len(f), -1)
+                                                             for a, f in zip(approximations, folds)])
+
+        return self.get_statistics(residuals=residuals, results=results, sample_idx=sample_idx)
+
+    def get_statistics(self, residuals, results, sample_idx=None):
+        """
+        Determines the error statistics of the outputs from the cross validation residuals of the tested samples.
+
+        statistics = CrossValidation.get_statistics(residuals, results, sample_idx=None)
+
+        Parameters
+        ----------
+        residuals : ndarray of float [n_tested x n_out]
+            Cross validation residuals of the tested samples
+        results : ndarray of float [n_samples x n_out]
+            Results in all samples
+        sample_idx : ndarray of int [n_tested], optional, default: None
+            Indices of the tested samples (if None, all samples were tested)
+
+        Returns
+        -------
+        statistics : dict
+            Error statistics of the cross validation (see CrossValidation.run)
+        """
+        results = results.reshape(results.shape[0], -1)
+        residuals = residuals.reshape(residuals.shape[0], -1)
+
+        if sample_idx is None:
+            sample_idx = np.arange(results.shape[0])
+
+        if self.error_norm == "relative":
+            norm = np.linalg.norm(results[sample_idx, :], axis=1)
+        else:
+            norm = 1.
+
+        var = np.var(results, axis=0, ddof=1) if results.shape[0] > 1 else np.zeros(results.shape[1])
+        var[var == 0] = 1
+
+        return {"error": np.mean(np.linalg.norm(residuals, axis=1) / norm),
+                "error_mean": np.mean(np.abs(residuals), axis=0),
+                "error_rms": np.sqrt(np.mean(residuals ** 2, axis=0)),
+                "error_max": np.max(np.abs(residuals), axis=0),
+                "error_normalized": np.mean(residuals ** 2, axis=0) / var,
+                "sample_idx": sample_idx,
+                "residuals": residuals}
@@ -1,10 +1,14 @@
 import numpy as np
 import scipy.stats
 import copy
+import os
 import h5py
 import time
 import random
 import sys
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from sklearn import linear_model
 from scipy.signal import savgol_filter
 from .misc import get_cartesian_product
@@ -13,6 +17,11 @@ from .misc import nrmsd
 from .misc import mat2ten
 from .misc import ten2mat
 from .ValidationSet import *
+from .MatrixCache import MatrixCache
+from .LeastSquares import LeastSquares
+from .NormalEquations import NormalEquations
+from .GPCMatrixOperator import GPCMatrixOperator
+from .CrossValidation import CrossValidation
 from .Computation import *
 from .Grid import *
 
@@ -50,8 +59,16 @@ class GPC(object):
         Generalized polynomial chaos matrix
     gpc_matrix_gradient: [N_samples * dim x N_poly] ndarray of float
         Derivative of generalized polynomial chaos matrix
-    matrix_inv: [N_poly (+ N_gradient) x N_samples] ndarray of float
-        Pseudo inverse of the generalized polynomial chaos matrix (with or without gradient)
+    matrix_factorization: LeastSquares object
+        Factorization (QR or SVD) of the generalized polynomial chaos matrix (with or without gradient) of the last
+        least squares solve ("Moore-Penrose" solver), reused for further right hand sides
+    lars_lasso_coeffs: [N_poly x N_out] ndarray of float
+        GPC coefficients of the last "LarsLasso" solve with "warm_start", initial values of the next solve
+    lars_lasso_alpha: [N_out] ndarray of float
+        Regularization parameters of the outputs of the last "LarsLasso" solve (determined by cross validation if
+        "alpha" is "cv")
+    lsqr_coeffs: [N_poly x N_out] ndarray of float
+        GPC coefficients of the last "LSQR" solve with "warm_start", initial values of the next solve
     p_matrix: [dim_red x dim] ndarray of float
         Projection matrix to reduce number of efficient dimensions (\\eta = p_matrix * \\xi)
     p_matrix_norm: [dim_red] ndarray of float
@@ -63,6 +80,21 @@ class GPC(object):
         UUID4() IDs of grid points the gPC matrix derived with
     gpc_matrix_b_id: list of UUID4()
         UUID4() IDs of basis functions the gPC matrix derived with
+    gpc_matrix_gradient_coords_id: list of UUID4()
+        UUID4() IDs of grid points the gPC gradient matrix derived with (only points with gradient information)
+    gpc_matrix_gradient_b_id: list of UUID4()
+        UUID4() IDs of basis functions the gPC gradient matrix derived with
+    gpc_matrix_p_matrix: [dim_red x dim] ndarray of float
+        Projection matrix the gPC matrices derived with (None if no projection was applied)
+    validation_matrix: [N_validation x N_poly] ndarray of float
+        Cached gPC matrix of the validation set (see get_validation_matrix, not saved)
+    validation_matrix_b_id: list of UUID4()
+        UUID4() IDs of basis functions the cached gPC matrix of the validation set derived with
+    validation_matrix_key: str
+        Fingerprint of the coordinates of the validation set and the projection matrix of the cached gPC matrix
+    grid_tensor_knots: tuple (coords_norm, coords_id, knots_dim_list, idx_tensor)
+        Result of the tensor product detection of the grid points (see get_grid_tensor_knots) and the normalized
+        coordinates and UUID4() IDs of the grid points it was derived with (not saved)
     n_basis: int or list of int
         Number of basis functions (for iterative solvers, this is a list of its history)
     n_grid: int or list of int
@@ -72,13 +104,61 @@ class GPC(object):
         - 'Moore-Penrose' ... Pseudoinverse of gPC matrix (SGPC.Reg, EGPC)
         - 'OMP' ... Orthogonal Matching Pursuit, sparse recovery approach (SGPC.Reg, EGPC)
         - 'LarsLasso' ... {"alpha": float 0...1} Regularization parameter
+                          or "cv" (determined for each output by cross validation along the LARS path)
+                          {"n_folds": int} Number of folds of the cross validation (default: 5)
+                          {"n_cpu": int} Number of processes to solve the outputs in parallel
+                          {"warm_start": bool} Start from the previous solution if the basis only grew
+        - 'LSQR' ... Iterative least squares solution (LSQR/LSMR) with a matrix-free gPC matrix (SGPC.Reg, EGPC)
+        - 'NormalEquations' ... Least squares solution of blockwise accumulated normal equations (SGPC.Reg, EGPC)
         - 'NumInt' ... Numerical integration, spectral projection (SGPC.Quad)
     verbose: bool
         Boolean value to determine if to print out the progress into the standard output
+    n_cpu_basis: int or None
+        Number of processes to initialize the basis functions in parallel (if None, in the current process)
+    n_threads: int or None
+        Number of worker threads of the "threads" backend (if None, the number of CPUs is used) and of the cross
+        validation (if None, the folds are solved sequentially)
+    matrix_cache_dir: str or None
+        Directory of the persistent on-disk cache of gPC matrices (if None, gPC matrices are not cached)
+    matrix_cache_size: float
+        Maximum size of the gPC matrix cache in bytes
+    block_size: int or None
+        Number of sample points evaluated at once in get_approximation (if None, it is determined from memory_limit)
+    memory_limit: float
+        Maximum size of the gPC matrix in bytes, which is constructed at once in get_approximation
+    dtype: str
+        Floating point precision ("float64" or "float32") used to evaluate the gPC approximation
+        (get_approximation, get_samples, get_pdf, ...). The gPC matrices to determine the coefficients are always
+        constructed in double precision.
+    sparse_tol: float or None
+        Relative tolerance below which gPC coefficients are neglected when evaluating the gPC approximation.
+        With 0, only basis functions whose coefficients are zero for all outputs are skipped (exact).
+        If None, all basis functions are evaluated.
+    sparse_basis_idx: ndarray of int [n_basis_sparse]
+        Indices of the basis functions retained in the (cached) sparse basis
+    sparse_basis_b_array: ndarray of float [n_poly_coeffs_sparse]
+        Polynomial coefficients of the basis functions in the sparse basis
+    sparse_basis_error: ndarray of float [n_out]
+        Upper bound of the L2 truncation error of the sparse basis for each output
+    sparse_basis_key: str
+        Fingerprint of the coefficients and the basis the sparse basis was derived from
     fn_results : string, optional, default=None
         If provided, model evaluations are saved in fn_results.hdf5 file and gpc object in fn_results.pkl file
     relative_error_loocv: list of float
         Relative error of the leave-one-out-cross-validation
+    loocv_statistics: dict
+        Error statistics of the outputs of the last cross validation (see CrossValidation.run)
+    cv_scheme: str
+        Cross validation scheme if the leave-one-out error can not be determined in closed form
+        ("kfold" or "leave_p_out")
+    cv_n_folds: int
+        Number of folds of the "kfold" cross validation scheme
+    cv_p: int
+        Number of samples in the test sets of the "leave_p_out" cross validation scheme
+    cv_n_max: int
+        Maximum number of test sets of the "leave_p_out" cross validation scheme
+    cv_seed: int
+        Seed of the assignment of the samples to the test sets of the cross validation
     relative_error_nrmsd: list of float
         Normalized root mean square deviation between model and gpc approximation
     options : dict
@@ -99,7 +179,14 @@ class GPC(object):
         # arrays
         self.gpc_matrix = None
         self.gpc_matrix_gradient = None
-        self.matrix_inv = None
+        self.matrix_factorization = None
+        self.lars_lasso_coeffs = None
+        self.lars_lasso_alpha = None
+        self.lsqr_coeffs = None
+        self.loocv_statistics = None
+        self.validation_matrix = None
+        self.validation_matrix_b_id = None
+        self.validation_matrix_key = None
         self.p_matrix = None
         self.p_matrix_norm = None
         self.nan_elm = []
@@ -107,6 +194,8 @@ class GPC(object):
         self.gpc_matrix_b_id = None
         self.gpc_matrix_gradient_coords_id = None
         self.gpc_matrix_gradient_b_id = None
+        self.gpc_matrix_p_matrix = None
+        self.grid_tensor_knots = None
         self.n_basis = []
         self.n_grid = []
         self.relative_error_nrmsd = []
@@ -114,6 +203,10 @@ class GPC(object):
         self.error = []
         self.n_out = []
         self.gradient_idx = None
+        self.sparse_basis_idx = None
+        self.sparse_basis_b_array = None
+        self.sparse_basis_error = None
+        self.sparse_basis_key = None
 
         # options
         if options is not None:
@@ -129,16 +222,84 @@ class GPC(object):
             if "backend" not in options.keys():
                 options["backend"] = "omp"
 
+            if "n_cpu_basis" not in options.keys():
+                options["n_cpu_basis"] = None
+
+            if "n_threads" not in options.keys():
+                options["n_threads"] = None
+
+            if "matrix_cache_dir" not in options.keys():
+                options["matrix_cache_dir"] = None
+
+            if "matrix_cache_size" not in options.keys():
+                options["matrix_cache_size"] = 2**30
+
+            if "block_size" not in options.keys():
+                options["block_size"] = None
+
+            if "memory_limit" not in options.keys():
+                options["memory_limit"] = 2**30
+
+            if "dtype" not in options.keys():
+                options["dtype"] = "float64"
+
+            if "sparse_tol" not in options.keys():
+                options["sparse_tol"] = 0.
+
+            if "validation_store" not in options.keys():
+                options["validation_store"] = None
+
+            if "cv_scheme" not in options.keys():
+                options["cv_scheme"] = "leave_p_out"
+
+            if "cv_n_folds" not in options.keys():
+                options["cv_n_folds"] = 10
+
+            if "cv_p" not in options.keys():
+                options["cv_p"] = 1
+
+            if "cv_n_max" not in options.keys():
+                options["cv_n_max"] = 25
+
+            if "cv_seed" not in options.keys():
+                options["cv_seed"] = 1
+
             self.gradient = options["gradient_enhanced"]
             self.fn_results = options["fn_results"]
             self.matlab_model = options["matlab_model"]
             self.backend = options["backend"]
+            self.n_cpu_basis = options["n_cpu_basis"]
+            self.n_threads = options["n_threads"]
+            self.matrix_cache_dir = options["matrix_cache_dir"]
+            self.matrix_cache_size = options["matrix_cache_size"]
+            self.block_size = options["block_size"]
+            self.memory_limit = options["memory_limit"]
+            self.dtype = np.dtype(options["dtype"]).name
+            self.sparse_tol = options["sparse_tol"]
+            self.cv_scheme = options["cv_scheme"]
+            self.cv_n_folds = options["cv_n_folds"]
+            self.cv_p = options["cv_p"]
+            self.cv_n_max = options["cv_n_max"]
+            self.cv_seed = options["cv_seed"]
 
         else:
             self.gradient = None
             self.fn_results = None
             self.matlab_model = False
             self.backend = "omp"
+            self.n_cpu_basis = None
+            self.n_threads = None
+            self.matrix_cache_dir = None
+            self.matrix_cache_size = 2**30
+            self.block_size = None
+            self.memory_limit = 2**30
+            self.dtype = "float64"
+            self.sparse_tol = 0.
+            self.cv_scheme = "leave_p_out"
+            self.cv_n_folds = 10
+            self.cv_p = 1
+            self.cv_n_max = 25
+            self.cv_seed = 1
 
         self.solver = None
         self.settings = None
@@ -146,6 +307,29 @@ class GPC(object):
 
         self.options = options
 
+    def __getstate__(self):
+        """
+        Returns the state of the GPC object (used by pickle, copy and the .hdf5 export). The factorization of the gPC
+        matrix, the cached gPC matrix of the validation set and the tensor product detection of the grid are omitted,
+        they are determined again by GPC.solve, GPC.get_validation_matrix and GPC.get_grid_tensor_knots.
+        """
+        state = self.__dict__.copy()
+        state.pop("matrix_factorization", None)
+        state.pop("validation_matrix", None)
+        state.pop("validation_matrix_b_id", None)
+        state.pop("validation_matrix_key", None)
+        state.pop("grid_tensor_knots", None)
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state of the GPC object (used by pickle and copy). Attributes missing in the state (e.g. of
+        objects pickled by former versions) are initialized with their defaults.
+        """
+        GPC.__init__(self, problem=state.get("problem"), options=None)
+        self.__dict__.update(state)
+
     def init_gpc_matrix(self, gradient_idx=None):
         """
         Sets self.gpc_matrix and self.gpc_matrix_gradient with given self.basis and self.grid
@@ -166,16 +350,18 @@ class GPC(object):
         self.n_basis.append(self.gpc_matrix.shape[1])
         self.gpc_matrix_coords_id = copy.deepcopy(self.grid.coords_id)
         self.gpc_matrix_b_id = copy.deepcopy(self.basis.b_id)
+        self.gpc_matrix_p_matrix = copy.deepcopy(self.p_matrix)
 
         if self.gradient and self.gradient_idx is not None:
             self.gpc_matrix_gradient = self.create_gpc_matrix(b=self.basis.b,
                                                               x=self.grid.coords_norm,
                                                               gradient=True)
             self.gpc_matrix_gradient = ten2mat(self.gpc_matrix_gradient)
-            self.gpc_matrix_gradient_coords_id = copy.deepcopy(self.grid.coords_id)
+            self.gpc_matrix_gradient_coords_id = [copy.deepcopy(self.grid.coords_id[i]) for i in self.gradient_idx]
             self.gpc_matrix_gradient_b_id = copy.deepcopy(self.basis.b_id)
 
-    def create_gpc_matrix(self, b, x, gradient=False, gradient_idx=None, weighted=False, verbose=False):
+    def create_gpc_matrix(self, b, x, gradient=False, gradient_idx=None, weighted=False, verbose=False,
+                          dtype="float64"):
         """
         Construct the gPC matrix or its derivative.
 
@@ -194,6 +380,8 @@ class GPC(object):
             Weight gPC matrix with (row 2-norm)^-1
         verbose : bool, optional, default: False
             boolean value to determine if to print out the progress into the standard output
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
 
         Returns
         -------
@@ -207,41 +395,120 @@ class GPC(object):
 
         iprint('Constructing gPC matrix...', verbose=verbose, tab=0)
 
-        if self.backend not in ["cpu", "omp", "cuda", "python"]:
+        # coordinates of tensor grids are constructed by Kronecker products of 1D tables
+        knots_dim_list, idx_tensor = None, None
+
+        if self.backend in ["cpu", "omp", "python", "threads"] and self.grid is not None and \
+                x is self.grid.coords_norm:
+            knots_dim_list, idx_tensor = self.get_grid_tensor_knots()
+
+        if gradient:
+            x = x[self.gradient_idx, :]
+
+            if idx_tensor is not None:
+                idx_tensor = idx_tensor[self.gradient_idx]
+
+        if self.matrix_cache_dir is not None:
+            # reuse gPC matrices computed before (also by other processes) for the same basis and coordinates
+            matrix_cache = MatrixCache(path=self.matrix_cache_dir, max_size=self.matrix_cache_size)
+            key = matrix_cache.get_key(b=b, x=x, gradient=gradient, dtype=dtype)
+            gpc_matrix = matrix_cache.get(key)
+
+            if gpc_matrix is None:
+                gpc_matrix = self._create_gpc_matrix(b=b, x=x, gradient=gradient, dtype=dtype,
+                                                     knots_dim_list=knots_dim_list, idx_tensor=idx_tensor)
+                matrix_cache.put(key, gpc_matrix)
+        else:
+            gpc_matrix = self._create_gpc_matrix(b=b, x=x, gradient=gradient, dtype=dtype,
+                                                 knots_dim_list=knots_dim_list, idx_tensor=idx_tensor)
+
+        if weighted:
+            gpc_matrix = gpc_matrix / np.linalg.norm(gpc_matrix, axis=1)[:, np.newaxis]
+
+        return gpc_matrix
+
+    def _create_gpc_matrix(self, b, x, gradient=False, dtype="float64", b_array=None, knots_dim_list=None,
+                           idx_tensor=None):
+        """
+        Evaluates the basis functions b (or their derivatives) at the coordinates x using the selected backend.
+        The C/C++ and CUDA backends use the precomputed polynomial coefficients in self.basis.b_array if b is the
+        complete basis self.basis.b. For subsets of the basis (e.g. newly added basis functions), the coefficients
+        are collected on the fly. If the coordinates are a tensor product of 1D knots (see get_grid_tensor_knots),
+        the gPC matrix is constructed by Kronecker products of 1D tables (see create_gpc_matrix_tensor).
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b or a subset of it)
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+        gradient : bool, optional, default: False
+            Determine gradient gPC matrix.
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
+        b_array : ndarray of float [n_poly_coeffs], optional, default: None
+            Precomputed polynomial coefficients of b (gradient=False) for the C/C++ and CUDA backends
+        knots_dim_list : list of ndarray of float [n_dim][n_knots], optional, default: None
+            1D knots in each dimension if x is a tensor product of them (see get_tensor_knots)
+        idx_tensor : ndarray of int [n_x], optional, default: None
+            Row indices of x in the tensor product get_cartesian_product(knots_dim_list) (see get_tensor_knots)
+
+        Returns
+        -------
+        gpc_matrix: ndarray of float [n_x x n_basis] or [n_x x n_basis x n_dim]
+            GPC matrix (gradient=False) or gradient gPC matrix in tensor form (gradient=True)
+        """
+        if self.backend not in ["cpu", "omp", "cuda", "python", "threads"]:
             raise NotImplementedError(f"Backend {self.backend} is not implemented")
 
+        x = np.asarray(x, dtype=dtype)
+
+        if knots_dim_list is not None and self.backend in ["cpu", "omp", "python", "threads"]:
+            return self.create_gpc_matrix_tensor(b=b,
+                                                 knots_dim_list=knots_dim_list,
+                                                 gradient=gradient,
+                                                 dtype=dtype)[idx_tensor, ]
+
+        if self.backend in ["cpu", "omp", "cuda"]:
+            if b is self.basis.b:
+                b_array, b_array_grad = self.basis.b_array, self.basis.b_array_grad
+            elif b_array is None or gradient:
+                b_array, b_array_grad = self.basis.get_basis_array(b)
+
         if self.backend == "cpu":
             # CPU backend (CPU single core)
             try:
-                from .pygpc_extensions import create_gpc_matrix_cpu
+                from .pygpc_extensions import create_gpc_matrix_cpu, create_gpc_matrix_gradient_cpu
                 if not gradient:
                     # the third dimension is important and should not be removed
                     # otherwise the code could produce undefined behaviour
-                    gpc_matrix = np.empty([x.shape[0], len(b), 1])
-                    create_gpc_matrix_cpu(x, self.basis.b_array, gpc_matrix)
-                    gpc_matrix = np.squeeze(gpc_matrix)
+                    gpc_matrix = np.empty([x.shape[0], len(b), 1], dtype=dtype)
+                    create_gpc_matrix_cpu(x, b_array, gpc_matrix)
+                    gpc_matrix = gpc_matrix[:, :, 0]
                 else:
-                    gpc_matrix = np.empty([len(self.gradient_idx), len(b), self.problem.dim])
-                    create_gpc_matrix_cpu(x[self.gradient_idx, :], self.basis.b_array_grad, gpc_matrix)
+                    # all partial derivatives of a basis function are determined in one pass
+                    gpc_matrix = np.empty([x.shape[0], len(b), self.problem.dim], dtype=dtype)
+                    create_gpc_matrix_gradient_cpu(x, b_array_grad, gpc_matrix)
             except (ImportError):
-                print("The CPU-extension is not installed. Fall back to pure Python as backend.")
-                self.backend = "python"
+                print("The CPU-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
         elif self.backend == "omp":
             # OpenMP backend (CPU multi core)
             try:
-                from .pygpc_extensions import create_gpc_matrix_omp
+                from .pygpc_extensions import create_gpc_matrix_omp, create_gpc_matrix_gradient_omp
                 if not gradient:
                     # the third dimension is important and should not be removed
                     # otherwise the code could produce undefined behaviour
-                    gpc_matrix = np.empty([x.shape[0], len(b), 1])
-                    create_gpc_matrix_omp(x, self.basis.b_array, gpc_matrix)
-                    gpc_matrix = np.squeeze(gpc_matrix)
+                    gpc_matrix = np.empty([x.shape[0], len(b), 1], dtype=dtype)
+                    create_gpc_matrix_omp(x, b_array, gpc_matrix)
+                    gpc_matrix = gpc_matrix[:, :, 0]
                 else:
-                    gpc_matrix = np.empty([len(self.gradient_idx), len(b), self.problem.dim])
-                    create_gpc_matrix_omp(x[self.gradient_idx, :], self.basis.b_array_grad, gpc_matrix)
+                    # all partial derivatives of a basis function are determined in one pass
+                    gpc_matrix = np.empty([x.shape[0], len(b), self.problem.dim], dtype=dtype)
+                    create_gpc_matrix_gradient_omp(x, b_array_grad, gpc_matrix)
             except (ImportError):
-                print("The OMP-extension is not installed. Fall back to pure Python as backend.")
-                self.backend = "python"
+                print("The OMP-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
         elif self.backend == "cuda":
             # CUDA backend (GPU multi core)
             try:
@@ -250,56 +517,461 @@ class GPC(object):
                     # the third dimension is important and should not be removed
                     # otherwise the code could produce undefined behaviour
                     gpc_matrix = np.empty([x.shape[0], len(b), 1])
-                    create_gpc_matrix_cuda(x, self.basis.b_array, gpc_matrix)
-                    gpc_matrix = np.squeeze(gpc_matrix)
+                    create_gpc_matrix_cuda(x, b_array, gpc_matrix)
+                    gpc_matrix = gpc_matrix[:, :, 0].astype(dtype)
                 else:
-                    gpc_matrix = np.empty([len(self.gradient_idx), len(b), self.problem.dim])
-                    create_gpc_matrix_cuda(x[self.gradient_idx, :], self.basis.b_array_grad, gpc_matrix)
+                    gpc_matrix = np.empty([x.shape[0], len(b), self.problem.dim])
+                    create_gpc_matrix_cuda(x, self.basis.get_basis_array_grad_expanded(b), gpc_matrix)
+                    gpc_matrix = gpc_matrix.astype(dtype)
             except (ImportError):
-                print("The CUDA-extension is not installed. Fall back to pure Python as backend.")
-                self.backend = "python"
-                
-        if self.backend == "python":
-            # Python backend
-            if not gradient:
-                gpc_matrix = np.ones([x.shape[0], len(b)])
-                for i_basis in range(len(b)):
-                    for i_dim in range(self.problem.dim):
-                        gpc_matrix[:, i_basis] *= b[i_basis][i_dim](x[:, i_dim])
+                print("The CUDA-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
+
+        if self.backend == "threads":
+            # Python backend evaluated in row blocks by a pool of threads (NumPy releases the GIL)
+            gpc_matrix = self._create_gpc_matrix_threads(b=b, x=x, gradient=gradient, dtype=dtype)
+
+        elif self.backend == "python":
+            gpc_matrix = self._create_gpc_matrix_python(b=b, x=x, gradient=gradient, dtype=dtype)
+
+        return gpc_matrix
+
+    def _create_gpc_matrix_python(self, b, x, gradient=False, dtype="float64"):
+        """
+        Evaluates the basis functions b (or their derivatives) at the coordinates x in pure Python. The univariate
+        basis functions are evaluated only once at the distinct coordinates of each dimension and gathered afterwards,
+        which is very efficient for tensor and sparse grids.
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b or a subset of it)
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+        gradient : bool, optional, default: False
+            Determine gradient gPC matrix.
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
+
+        Returns
+        -------
+        gpc_matrix: ndarray of float [n_x x n_basis] or [n_x x n_basis x n_dim]
+            GPC matrix (gradient=False) or gradient gPC matrix in tensor form (gradient=True)
+        """
+        # the complete basis is evaluated using the tables of the polynomial coefficients of the parameters
+        if self.basis is not None and b is self.basis.b:
+            get_univariate_tables = partial(self.basis.get_univariate_tables, x=x)
+        else:
+            get_univariate_tables = partial(self.get_univariate_tables, b=b, x=x)
+
+        if not gradient:
+            idx, tables, _, idx_x = get_univariate_tables(derivative=False)
+
+            gpc_matrix = np.ones([x.shape[0], len(b)], dtype=dtype)
+            for i_dim in range(self.problem.dim):
+                gpc_matrix *= tables[i_dim][idx_x[:, i_dim][:, np.newaxis], idx[:, i_dim][np.newaxis, :]]
+        else:
+            idx, tables, tables_der, idx_x = get_univariate_tables(derivative=True)
+
+            def get_values(t, i_dim):
+                return t[i_dim][idx_x[:, i_dim][:, np.newaxis], idx[:, i_dim][np.newaxis, :]]
+
+            # all partial derivatives are determined in one pass using prefix and suffix products of the
+            # univariate basis functions: d/dx_i = (prod_{j<i} psi_j) * dpsi_i/dx_i * (prod_{j>i} psi_j)
+            gpc_matrix = np.empty([x.shape[0], len(b), self.problem.dim], dtype=dtype)
+            accumulated = np.ones([x.shape[0], len(b)], dtype=dtype)
+            for i_dim in range(self.problem.dim):
+                gpc_matrix[:, :, i_dim] = accumulated * get_values(tables_der, i_dim)
+                accumulated *= get_values(tables, i_dim)
+
+            accumulated = np.ones([x.shape[0], len(b)], dtype=dtype)
+            for i_dim in reversed(range(self.problem.dim)):
+                gpc_matrix[:, :, i_dim] *= accumulated
+                accumulated *= get_values(tables, i_dim)
+
+        return gpc_matrix
+
+    def _create_gpc_matrix_threads(self, b, x, gradient=False, dtype="float64"):
+        """
+        Evaluates the basis functions b (or their derivatives) at the coordinates x with the Python backend.
+        The rows of x are split into blocks, which are evaluated concurrently by a pool of self.n_threads threads
+        and written into the preallocated gPC matrix.
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b or a subset of it)
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+        gradient : bool, optional, default: False
+            Determine gradient gPC matrix.
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
+
+        Returns
+        -------
+        gpc_matrix: ndarray of float [n_x x n_basis] or [n_x x n_basis x n_dim]
+            GPC matrix (gradient=False) or gradient gPC matrix in tensor form (gradient=True)
+        """
+        n_threads = self.n_threads if self.n_threads is not None else os.cpu_count()
+        n_blocks = max(1, min(n_threads, x.shape[0]))
+
+        if n_blocks == 1:
+            return self._create_gpc_matrix_python(b=b, x=x, gradient=gradient, dtype=dtype)
+
+        if not gradient:
+            gpc_matrix = np.empty([x.shape[0], len(b)], dtype=dtype)
+        else:
+            gpc_matrix = np.empty([x.shape[0], len(b), self.problem.dim], dtype=dtype)
+
+        idx_block = np.linspace(0, x.shape[0], n_blocks + 1).astype(int)
+
+        def evaluate_block(i_block):
+            start, stop = idx_block[i_block], idx_block[i_block + 1]
+            gpc_matrix[start:stop, ] = self._create_gpc_matrix_python(b=b, x=x[start:stop, ],
+                                                                      gradient=gradient, dtype=dtype)
+
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            # consume the iterator to propagate exceptions raised in the threads
+            list(executor.map(evaluate_block, range(n_blocks)))
+
+        return gpc_matrix
+
+    @staticmethod
+    def get_univariate_tables(b, x, derivative=False):
+        """
+        Evaluates every distinct univariate basis function (parameter and order) contained in b only once at every
+        distinct coordinate of each dimension. For tensor and sparse grids, the coordinates are composed of a few
+        1D knots per dimension, such that only these have to be evaluated. The global basis functions can be
+        constructed afterwards by gathering and multiplying the entries of the tables using the returned indices:
+
+        psi[i_x, i_basis] = prod_i_dim tables[i_dim][idx_x[i_x, i_dim], idx[i_basis, i_dim]]
+
+        idx, tables, tables_der, idx_x = GPC.get_univariate_tables(b, x, derivative=False)
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b)
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the basis functions are evaluated (normalized [-1, 1])
+        derivative : bool, optional, default: False
+            Additionally evaluate the derivatives of the univariate basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis x n_dim]
+            Column indices of the univariate basis functions in the tables
+        tables : list of ndarray of float [n_dim][n_knots x n_unique]
+            Function values of the distinct univariate basis functions of each parameter at the distinct coordinates
+        tables_der : list of ndarray of float [n_dim][n_knots x n_unique] or None
+            Derivatives of the distinct univariate basis functions of each parameter at the distinct coordinates
+            (if derivative=True)
+        idx_x : ndarray of int [n_x x n_dim]
+            Row indices of the coordinates x in the tables
+        """
+        n_basis = len(b)
+        n_dim = x.shape[1]
+
+        idx = np.zeros((n_basis, n_dim), dtype=int)
+        idx_x = np.zeros((x.shape[0], n_dim), dtype=int)
+        tables = [0 for _ in range(n_dim)]
+        tables_der = [0 for _ in range(n_dim)] if derivative else None
+
+        for i_dim in range(n_dim):
+            # distinct coordinates (1D knots) in this dimension
+            knots, idx_x[:, i_dim] = np.unique(x[:, i_dim], return_inverse=True)
+
+            idx[:, i_dim], tables[i_dim], table_der = GPC._get_univariate_table(b=b,
+                                                                                i_dim=i_dim,
+                                                                                knots=knots.astype(x.dtype),
+                                                                                derivative=derivative)
+            if derivative:
+                tables_der[i_dim] = table_der
+
+        return idx, tables, tables_der, idx_x
+
+    @staticmethod
+    def _get_univariate_table(b, i_dim, knots, derivative=False):
+        """
+        Evaluates the distinct univariate basis functions of parameter i_dim contained in b at the 1D knots.
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b)
+        i_dim : int
+            Index of parameter
+        knots : ndarray of float [n_knots]
+            Coordinates where the univariate basis functions are evaluated (normalized [-1, 1])
+        derivative : bool, optional, default: False
+            Additionally evaluate the derivatives of the univariate basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis]
+            Column indices of the univariate basis functions in the table
+        table : ndarray of float [n_knots x n_unique]
+            Function values of the distinct univariate basis functions at the knots
+        table_der : ndarray of float [n_knots x n_unique] or None
+            Derivatives of the distinct univariate basis functions at the knots (if derivative=True)
+        """
+        idx, b_unique = GPC._get_univariate_basis_functions(b=b, i_dim=i_dim)
+
+        table = np.ones((knots.shape[0], len(b_unique)), dtype=knots.dtype)
+        for i_unique, _b in enumerate(b_unique):
+            table[:, i_unique] = _b(knots)
+
+        table_der = None
+        if derivative:
+            table_der = np.ones((knots.shape[0], len(b_unique)), dtype=knots.dtype)
+            for i_unique, _b in enumerate(b_unique):
+                table_der[:, i_unique] = _b(knots, derivative=True)
+
+        return idx, table, table_der
+
+    def _get_univariate_table_extension(self, b, i_dim, knots, derivative=False):
+        """
+        Evaluates the distinct univariate basis functions of parameter i_dim contained in b at the 1D knots using the
+        C/C++ extension of the "cpu" or "omp" backend (see _get_univariate_table). The univariate basis functions are
+        evaluated as global basis functions of a single parameter.
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b)
+        i_dim : int
+            Index of parameter
+        knots : ndarray of float [n_knots]
+            Coordinates where the univariate basis functions are evaluated (normalized [-1, 1])
+        derivative : bool, optional, default: False
+            Additionally evaluate the derivatives of the univariate basis functions
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis]
+            Column indices of the univariate basis functions in the table
+        table : ndarray of float [n_knots x n_unique]
+            Function values of the distinct univariate basis functions at the knots
+        table_der : ndarray of float [n_knots x n_unique] or None
+            Derivatives of the distinct univariate basis functions at the knots (if derivative=True)
+        """
+        try:
+            if self.backend == "omp":
+                from .pygpc_extensions import create_gpc_matrix_omp as create_gpc_matrix_ext
+                from .pygpc_extensions import create_gpc_matrix_gradient_omp as create_gpc_matrix_gradient_ext
             else:
-                gpc_matrix = np.ones([len(self.gradient_idx), len(b), self.problem.dim])
-                for i_dim_gradient in range(self.problem.dim):
-                    for i_basis in range(len(b)):
-                        for i_dim in range(self.problem.dim):
-                            if i_dim == i_dim_gradient:
-                                derivative = True
-                            else:
-                                derivative = False
-                            gpc_matrix[:, i_basis, i_dim_gradient] *= b[i_basis][i_dim](x[self.gradient_idx, i_dim],
-                                                                                        derivative=derivative)
-
-        if gpc_matrix.ndim == 1 and x.shape[0] == 1:
-            gpc_matrix = gpc_matrix[np.newaxis, :]
-        elif gpc_matrix.ndim == 1 and self.basis.n_basis == 1:
-            gpc_matrix = gpc_matrix[:, np.newaxis]
+                from .pygpc_extensions import create_gpc_matrix_cpu as create_gpc_matrix_ext
+                from .pygpc_extensions import create_gpc_matrix_gradient_cpu as create_gpc_matrix_gradient_ext
+        except ImportError:
+            print("The {}-extension is not installed. Fall back to multi-threaded Python as backend.".format(
+                self.backend.upper()))
+            self.backend = "threads"
+            return self._get_univariate_table(b=b, i_dim=i_dim, knots=knots, derivative=derivative)
+
+        idx, b_unique = self._get_univariate_basis_functions(b=b, i_dim=i_dim)
+        b_array, b_array_grad = self.basis.get_basis_array([[_b] for _b in b_unique])
+        x = np.ascontiguousarray(knots[:, np.newaxis])
+
+        # the third dimension is important and should not be removed
+        # otherwise the code could produce undefined behaviour
+        table = np.empty([knots.shape[0], len(b_unique), 1], dtype=knots.dtype)
+        create_gpc_matrix_ext(x, b_array, table)
+
+        table_der = None
+        if derivative:
+            table_der = np.empty([knots.shape[0], len(b_unique), 1], dtype=knots.dtype)
+            create_gpc_matrix_gradient_ext(x, b_array_grad, table_der)
+            table_der = table_der[:, :, 0]
+
+        return idx, table[:, :, 0], table_der
+
+    @staticmethod
+    def _get_univariate_basis_functions(b, i_dim):
+        """
+        Determines the distinct univariate basis functions of parameter i_dim contained in b.
 
-        if weighted:
-            w = np.diag(1/np.linalg.norm(gpc_matrix, axis=1))
-            gpc_matrix = np.matmul(w, gpc_matrix)
+        idx, b_unique = GPC._get_univariate_basis_functions(b, i_dim)
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b)
+        i_dim : int
+            Index of parameter
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis]
+            Indices of the univariate basis functions of the global basis functions in b_unique
+        b_unique : list of BasisFunction object instances [n_unique]
+            Distinct univariate basis functions of parameter i_dim
+        """
+        idx = np.zeros(len(b), dtype=int)
+
+        # polynomial basis functions are identified by their order, all others by their object identity
+        b_unique = dict()
+        for i_basis in range(len(b)):
+            _b = b[i_basis][i_dim]
+            key = _b.p["i"] if "i" in _b.p else id(_b)
+
+            if key not in b_unique:
+                b_unique[key] = (len(b_unique), _b)
+
+            idx[i_basis] = b_unique[key][0]
+
+        return idx, [_b for _, _b in b_unique.values()]
+
+    @staticmethod
+    def get_tensor_knots(x):
+        """
+        Detects if the coordinates x are a tensor product of 1D knots (e.g. TensorGrid or the sub-grids of a
+        SparseGrid) in arbitrary order.
+
+        knots_dim_list, idx_tensor = GPC.get_tensor_knots(x)
+
+        Parameters
+        ----------
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim)
+
+        Returns
+        -------
+        knots_dim_list : list of ndarray of float [n_dim][n_knots] or None
+            Sorted 1D knots in each dimension (None if x is not a tensor product)
+        idx_tensor : ndarray of int [n_x] or None
+            Row indices of x in the tensor product get_cartesian_product(knots_dim_list)
+            (None if x is not a tensor product)
+        """
+        if x.shape[0] < 2 or x.shape[1] < 2:
+            return None, None
+
+        knots_dim_list = []
+        idx_x = np.zeros(x.shape, dtype=int)
+
+        for i_dim in range(x.shape[1]):
+            knots, idx_x[:, i_dim] = np.unique(x[:, i_dim], return_inverse=True)
+            knots_dim_list.append(knots)
+
+        n_knots = [k.shape[0] for k in knots_dim_list]
+
+        if np.prod(n_knots, dtype=float) != x.shape[0]:
+            return None, None
+
+        idx_tensor = np.ravel_multi_index(tuple(idx_x.transpose()), n_knots)
+
+        if np.unique(idx_tensor).size != x.shape[0]:
+            return None, None
+
+        return knots_dim_list, idx_tensor
+
+    def get_grid_tensor_knots(self):
+        """
+        Detects if the grid points are a tensor product of 1D knots (see get_tensor_knots). The detection is done once
+        per grid and is repeated only if the coordinates of the grid (e.g. a projected grid) or its grid points
+        (identified by their UUIDs) changed.
+
+        knots_dim_list, idx_tensor = GPC.get_grid_tensor_knots()
+
+        Returns
+        -------
+        knots_dim_list : list of ndarray of float [n_dim][n_knots] or None
+            Sorted 1D knots in each dimension (None if the grid points are not a tensor product)
+        idx_tensor : ndarray of int [n_grid] or None
+            Row indices of the grid points in the tensor product get_cartesian_product(knots_dim_list)
+            (None if the grid points are not a tensor product)
+        """
+        coords_norm = self.grid.coords_norm
+        coords_id = self.grid.coords_id
+
+        if self.grid_tensor_knots is None or coords_id is None or self.grid_tensor_knots[0] is not coords_norm or \
+                self.grid_tensor_knots[1] != coords_id:
+            knots_dim_list, idx_tensor = self.get_tensor_knots(coords_norm)
+            self.grid_tensor_knots = (coords_norm, copy.copy(coords_id), knots_dim_list, idx_tensor)
+
+        return self.grid_tensor_knots[2], self.grid_tensor_knots[3]
+
+    def create_gpc_matrix_tensor(self, b, knots_dim_list, gradient=False, dtype="float64"):
+        """
+        Construct the gPC matrix or its derivative at the tensor product of 1D knots. The univariate basis functions
+        are evaluated at the 1D knots only (using the C/C++ extension for the "cpu" and "omp" backends) and the
+        columns of the gPC matrix are assembled as Kronecker products of the 1D tables by successive broadcasting over
+        the dimensions. This requires approximately n_x * n_basis multiplications instead of
+        n_x * n_basis * n_dim * order for the point-wise evaluation.
+
+        gpc_matrix = GPC.create_gpc_matrix_tensor(b, knots_dim_list, gradient=False, dtype="float64")
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b)
+        knots_dim_list : list of ndarray of float [n_dim][n_knots]
+            1D knots in each dimension (normalized [-1, 1])
+        gradient : bool, optional, default: False
+            Determine gradient gPC matrix.
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
+
+        Returns
+        -------
+        gpc_matrix: ndarray of float [n_x x n_basis] or [n_x x n_basis x n_dim]
+            GPC matrix (gradient=False) or gradient gPC matrix in tensor form (gradient=True), where the rows
+            correspond to the coordinates in get_cartesian_product(knots_dim_list)
+        """
+        n_dim = len(knots_dim_list)
+        tables = [0 for _ in range(n_dim)]
+        tables_der = [0 for _ in range(n_dim)]
+
+        # the complete basis is evaluated using the tables of the polynomial coefficients of the parameters
+        if self.backend in ["cpu", "omp"]:
+            get_univariate_table = partial(self._get_univariate_table_extension, b=b)
+        elif self.basis is not None and b is self.basis.b:
+            get_univariate_table = self.basis.get_univariate_table
+        else:
+            get_univariate_table = partial(self._get_univariate_table, b=b)
+
+        for i_dim in range(n_dim):
+            idx, table, table_der = get_univariate_table(i_dim=i_dim,
+                                                         knots=np.asarray(knots_dim_list[i_dim], dtype=dtype),
+                                                         derivative=gradient)
+            tables[i_dim] = table[:, idx]
+
+            if gradient:
+                tables_der[i_dim] = table_der[:, idx]
+
+        def kron_columns(tables_columns):
+            # column wise Kronecker product (last dimension varies fastest)
+            _matrix = tables_columns[0]
+            for _table in tables_columns[1:]:
+                _matrix = (_matrix[:, np.newaxis, :] * _table[np.newaxis, :, :]).reshape(-1, len(b))
+            return _matrix
+
+        if not gradient:
+            gpc_matrix = kron_columns(tables)
+        else:
+            gpc_matrix = np.stack([kron_columns([tables_der[i_dim] if i_dim == i_dim_gradient else tables[i_dim]
+                                                 for i_dim in range(n_dim)])
+                                   for i_dim_gradient in range(n_dim)], axis=2)
 
         return gpc_matrix
 
     def get_loocv(self, coeffs, results, gradient_results=None, error_norm="relative"):
         """
         Perform leave-one-out cross validation of gPC approximation and add error value to self.relative_error_loocv.
-        The loocv error is calculated analytically after eq. (35) in [1] but omitting the "1 - " term, i.e. it
-        corresponds to 1 - Q^2.
+        In case of the least squares solver ("Moore-Penrose"), the leave-one-out residuals of all samples are
+        determined in closed form from a single QR decomposition of the gPC matrix using the diagonal of the hat matrix
+        (eq. (35) in [1]). In case of the sparse solvers ("OMP", "LarsLasso"), the leave-one-out residuals of the
+        least squares refit on the selected basis functions (support) are determined. If the closed form is not
+        applicable (e.g. the system is not overdetermined), the regression is repeated for the test sets of the
+        cross validation scheme (options "cv_scheme", "cv_n_folds", "cv_p", "cv_n_max", "cv_seed"), which are solved
+        concurrently (see CrossValidation). The error is the mean of the relative norms of the residuals of the tested
+        samples. The error statistics of the outputs are stored in self.loocv_statistics.
 
         relative_error_loocv = GPC.loocv(sim_results, coeffs)
 
         .. math::
-           \\epsilon_{LOOCV} = \\frac{\\frac{1}{N}\sum_{i=1}^N \\left( \\frac{y(\\xi_i) - \hat{y}(\\xi_i)}{1-h_i}
-           \\right)^2}{\\frac{1}{N-1}\sum_{i=1}^N \\left( y(\\xi_i) - \\bar{y} \\right)^2}
+           \\epsilon_{LOOCV} = \\frac{1}{N}\\sum_{i=1}^N \\frac{\\| \\mathbf{y}(\\xi_i) - \\hat{\\mathbf{y}}(\\xi_i) \\|}
+           {(1-h_i) \\| \\mathbf{y}(\\xi_i) \\|}
 
         with
 
@@ -327,79 +999,86 @@ class GPC(object):
         .. [1] Blatman, G., & Sudret, B. (2010). An adaptive algorithm to build up sparse polynomial chaos expansions
            for stochastic finite element analysis. Probabilistic Engineering Mechanics, 25(2), 183-197.
         """
-        # if self.options["gradient_enhanced"]:
-        #     matrix = np.vstack((self.gpc_matrix, self.gpc_matrix_gradient))
-        #
-        #     # transform gradient of results in case of projection
-        #     if self.p_matrix is not None:
-        #         gradient_results = np.matmul(gradient_results,
-        #                                   self.p_matrix.transpose() * self.p_matrix_norm[np.newaxis, :])
-        #
-        #     results_complete = np.vstack((results, ten2mat(gradient_results)))
-        # else:
-        #     matrix = self.gpc_matrix
-        #     results_complete = results
-
-        # matrix = self.gpc_matrix
-        # results_complete = results
-
-        # Analytical error estimation in case of overdetermined systems
-        # if matrix.shape[0] > 2*matrix.shape[1]:
-            # determine Psi (Psi^T Psi)^-1 Psi^T
-            # h = np.matmul(np.matmul(matrix, np.linalg.inv(np.matmul(matrix.transpose(), matrix))), matrix.transpose())
-            #
-            # # determine loocv error
-            # err = np.mean(((results_complete - np.matmul(matrix, coeffs)) /
-            #                (1 - np.diag(h))[:, np.newaxis]) ** 2, axis=0)
-            #
-            # if error_norm == "relative":
-            #     norm = np.var(results_complete, axis=0, ddof=1)
-            # else:
-            #     norm = 1.
-            #
-            # # normalize
-            # relative_error_loocv = np.mean(err / norm)
-
-        # else:
-        # perform manual loocv without gradient
         matrix = self.gpc_matrix
         results_complete = results
 
-        n_loocv = 25
+        # matrix-free solvers ("LSQR", "NormalEquations") do not initialize the gPC matrix
+        if matrix is None:
+            matrix = self.create_gpc_matrix(b=self.basis.b, x=self.grid.coords_norm, gradient=False)
 
-        # define number of performed cross validations (max 100)
-        n_loocv_points = np.min((results_complete.shape[0], n_loocv))
+        start = time.time()
 
-        # make list of indices, which are randomly sampled
-        loocv_point_idx = random.sample(list(range(results_complete.shape[0])), n_loocv_points)
+        # closed form leave-one-out residuals of the least squares (re-)fit using the diagonal of the hat matrix
+        loo_residuals = None
 
-        start = time.time()
-        relative_error = np.zeros(n_loocv_points)
-        for i in range(n_loocv_points):
-            # get mask of eliminated row
-            mask = np.arange(results_complete.shape[0]) != loocv_point_idx[i]
-
-            # determine gpc coefficients (this takes a lot of time for large problems)
-            coeffs_loo = self.solve(results=results_complete[mask, :],
-                                    solver=self.options["solver"],
-                                    matrix=matrix[mask, :],
-                                    settings=self.options["settings"],
-                                    verbose=False)
-
-            sim_results_temp = results_complete[loocv_point_idx[i], :]
-
-            if error_norm == "relative":
-                norm = scipy.linalg.norm(sim_results_temp)
+        if self.options["solver"] in ["Moore-Penrose", "OMP", "LarsLasso"]:
+            matrix_loo = matrix
+
+            # sparse solvers: least squares refit on the selected basis functions
+            if self.options["solver"] != "Moore-Penrose" and coeffs.shape[0] == matrix.shape[1]:
+                support = np.abs(coeffs).reshape(coeffs.shape[0], -1).max(axis=1) > 0
+                matrix_loo = matrix[:, support]
+
+            # row weights of the solver (see GPC.solve)
+            if isinstance(self.grid, CO) or (isinstance(self.grid, L1) and not (["D"] in self.grid.criterion)):
+                w = (1 / np.linalg.norm(matrix, axis=1))[:, np.newaxis]
             else:
-                norm = 1.
+                w = np.ones((matrix.shape[0], 1))
+
+            if matrix_loo.shape[0] > matrix_loo.shape[1] > 0:
+                # reuse the factorization of the solver if it factorized the same matrix
+                row_id, col_id = self.get_matrix_ids()
+
+                if matrix_loo is matrix and self.matrix_factorization is not None and \
+                        self.is_matrix_factorization(shape=matrix.shape, row_id=row_id, col_id=col_id,
+                                                     key=self.get_matrix_key()):
+                    least_squares = self.matrix_factorization
+                else:
+                    least_squares = LeastSquares(w * matrix_loo)
+
+                loo_residuals = least_squares.get_loo_residuals(
+                    w * results_complete.reshape(results_complete.shape[0], -1))
+
+                if loo_residuals is not None:
+                    loo_residuals = loo_residuals / w
+
+        cross_validation = CrossValidation(scheme=self.cv_scheme,
+                                           n_folds=self.cv_n_folds,
+                                           p=self.cv_p,
+                                           n_max=self.cv_n_max,
+                                           seed=self.cv_seed,
+                                           n_threads=self.n_threads,
+                                           error_norm=error_norm)
 
-            relative_error[i] = scipy.linalg.norm(sim_results_temp - np.matmul(matrix[loocv_point_idx[i], :],
-                                                                            coeffs_loo))\
-                                / norm
-            display_fancy_bar("LOOCV", int(i + 1), int(n_loocv_points))
+        if loo_residuals is not None:
+            self.loocv_statistics = cross_validation.get_statistics(residuals=loo_residuals,
+                                                                    results=results_complete)
+        else:
+            # cross validation without gradient (the folds are solved on shallow copies of the gPC, which keep the
+            # solver state, e.g. the factorization, of this gPC untouched). The folds may be solved in worker
+            # threads, which must not start processes (e.g. LarsLasso with n_cpu > 1).
+            settings = self.options["settings"]
+
+            if settings is not None and "n_cpu" in settings:
+                settings = {key: value for key, value in settings.items() if key != "n_cpu"}
+
+            def approximate_fold(test_idx):
+                mask = np.ones(results_complete.shape[0], dtype=bool)
+                mask[test_idx] = False
+
+                # determine gpc coefficients (this takes a lot of time for large problems)
+                coeffs_fold = copy.copy(self).solve(results=results_complete[mask, :],
+                                                    solver=self.options["solver"],
+                                                    matrix=matrix[mask, :],
+                                                    settings=settings,
+                                                    verbose=False)
+
+                return np.matmul(matrix[test_idx, :], coeffs_fold)
+
+            self.loocv_statistics = cross_validation.run(fun=approximate_fold, results=results_complete)
 
         # store result in relative_error_loocv
-        relative_error_loocv = np.mean(relative_error)
+        relative_error_loocv = self.loocv_statistics["error"]
         iprint("LOOCV computation time: {} sec".format(time.time() - start), tab=0, verbose=True)
 
         return relative_error_loocv
@@ -445,7 +1124,7 @@ class GPC(object):
         # always determine nrmsd if a validation set is present
         if isinstance(self.validation, ValidationSet):
 
-            gpc_results = self.get_approximation(coeffs, self.validation.grid.coords_norm, output_idx=None)
+            gpc_results = np.matmul(self.get_validation_matrix(), coeffs)
 
             if gpc_results.ndim == 1:
                 gpc_results = gpc_results[:, np.newaxis]
@@ -475,6 +1154,56 @@ class GPC(object):
 
         return self.error[-1]
 
+    def get_validation_matrix(self):
+        """
+        Returns the gPC matrix of the validation set (self.validation), which is cached in self.validation_matrix.
+        The columns of basis functions, which were already evaluated (identified by their UUIDs in
+        self.validation_matrix_b_id), are reused and only the columns of new basis functions are computed. The cache is
+        rebuilt if the coordinates of the validation set or the projection matrix have changed.
+
+        validation_matrix = GPC.get_validation_matrix()
+
+        Returns
+        -------
+        validation_matrix: ndarray of float [n_validation x n_basis]
+            gPC matrix of the validation set (columns in the order of self.basis.b)
+        """
+        key = hashlib.sha1()
+        key.update(np.ascontiguousarray(self.validation.grid.coords_norm, dtype=float).tobytes())
+
+        if self.p_matrix is not None:
+            key.update(np.ascontiguousarray(self.p_matrix, dtype=float).tobytes())
+            key.update(np.ascontiguousarray(self.p_matrix_norm, dtype=float).tobytes())
+
+        key = key.hexdigest()
+
+        if self.validation_matrix is None or self.validation_matrix_key != key:
+            self.validation_matrix = np.zeros((self.validation.grid.coords_norm.shape[0], 0))
+            self.validation_matrix_b_id = []
+            self.validation_matrix_key = key
+
+        b_id_lookup = {_id: i for i, _id in enumerate(self.validation_matrix_b_id)}
+        idx_b_new = [i for i, _id in enumerate(self.basis.b_id) if _id not in b_id_lookup]
+
+        if len(idx_b_new) > 0:
+            x = self._prepare_coords(copy.deepcopy(self.validation.grid.coords_norm))
+
+            # columns of existing basis functions are appended at the end (reordered below)
+            self.validation_matrix = np.hstack((self.validation_matrix,
+                                                self._create_gpc_matrix(b=[self.basis.b[i] for i in idx_b_new],
+                                                                        x=x)))
+            self.validation_matrix_b_id = self.validation_matrix_b_id + [self.basis.b_id[i] for i in idx_b_new]
+            b_id_lookup = {_id: i for i, _id in enumerate(self.validation_matrix_b_id)}
+
+        idx_b = np.array([b_id_lookup[_id] for _id in self.basis.b_id], dtype=int)
+
+        # drop columns of deleted basis functions and sort columns in the order of the basis
+        if idx_b.size != len(self.validation_matrix_b_id) or not (idx_b == np.arange(idx_b.size)).all():
+            self.validation_matrix = self.validation_matrix[:, idx_b]
+            self.validation_matrix_b_id = list(self.basis.b_id)
+
+        return self.validation_matrix
+
     def get_pdf(self, coeffs, n_samples, output_idx=None, filter=True, return_samples=False):
         """ Determine the estimated pdfs of the output quantities
 
@@ -585,11 +1314,13 @@ class GPC(object):
 
         return grid.coords_norm, pce
 
-    def get_approximation(self, coeffs, x, output_idx=None):
+    def get_approximation(self, coeffs, x, output_idx=None, block_size=None):
         """
         Calculates the gPC approximation in points with output_idx and normalized parameters xi (interval: [-1, 1]).
+        The gPC matrix is constructed blockwise for block_size sample points at a time, such that only the
+        [n_x x n_out] result is kept in memory.
 
-        pce = GPC.get_approximation(coeffs, x, output_idx=None)
+        pce = GPC.get_approximation(coeffs, x, output_idx=None, block_size=None)
 
         Parameters
         ----------
@@ -600,54 +1331,288 @@ class GPC(object):
             The coordinates will be transformed in case of projected gPC.
         output_idx: ndarray of int, optional, default=None [n_out]
             Indices of output quantities to consider (Default: all).
+        block_size: int, optional, default: None
+            Number of sample points evaluated at once (Default: self.block_size or determined from self.memory_limit)
 
         Returns
         -------
         pce: ndarray of float [n_x x n_out]
-            GPC approximation at normalized coordinates x.
+            GPC approximation at normalized coordinates x (in precision self.dtype).
         """
+        x, coeffs, b, b_array = self._prepare_approximation(coeffs=coeffs, x=x, output_idx=output_idx)
+        block_size = self.get_block_size(block_size=block_size, n_basis=len(b))
 
-        if len(x.shape) == 1:
-            x = x[:, np.newaxis]
+        pce = np.empty([x.shape[0], coeffs.shape[1]], dtype=self.dtype)
 
-        # crop coordinates to gPC boundaries (values outside do not yield meaningful values)
-        for i_dim, key in enumerate(list(self.problem.parameters_random.keys())):
-            xmin = self.problem.parameters_random[key].pdf_limits_norm[0]
-            xmax = self.problem.parameters_random[key].pdf_limits_norm[1]
-            x[x[:, i_dim] < xmin, i_dim] = xmin
-            x[x[:, i_dim] > xmax, i_dim] = xmax
+        for i_start in range(0, x.shape[0], block_size):
+            pce[i_start:i_start + block_size, :] = self._get_approximation(coeffs=coeffs,
+                                                                          x=x[i_start:i_start + block_size, :],
+                                                                          b=b,
+                                                                          b_array=b_array)
 
-        if output_idx is not None:
-            # convert to 1d array
-            output_idx = np.asarray(output_idx).flatten().astype(int)
+        return pce
 
-            # crop coeffs array if output index is specified
-            coeffs = coeffs[:, output_idx]
+    def get_approximation_blocks(self, coeffs, x, output_idx=None, block_size=None):
+        """
+        Generator version of get_approximation. Yields the gPC approximation block by block (rows of x in ascending
+        order), which allows streaming reductions (e.g. histograms or moments) over very large numbers of samples.
 
-        if coeffs.ndim == 1:
+        for pce_block in GPC.get_approximation_blocks(coeffs, x, output_idx=None, block_size=None): ...
+
+        Parameters
+        ----------
+        coeffs: ndarray of float [n_basis x n_out]
+            GPC coefficients for each output variable
+        x: ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1]).
+            The coordinates will be transformed in case of projected gPC.
+        output_idx: ndarray of int, optional, default=None [n_out]
+            Indices of output quantities to consider (Default: all).
+        block_size: int, optional, default: None
+            Number of sample points evaluated at once (Default: self.block_size or determined from self.memory_limit)
+
+        Yields
+        ------
+        pce_block: ndarray of float [block_size x n_out]
+            GPC approximation at normalized coordinates x[i_start:i_start+block_size, :]
+        """
+        x, coeffs, b, b_array = self._prepare_approximation(coeffs=coeffs, x=x, output_idx=output_idx)
+        block_size = self.get_block_size(block_size=block_size, n_basis=len(b))
+
+        for i_start in range(0, x.shape[0], block_size):
+            yield self._get_approximation(coeffs=coeffs, x=x[i_start:i_start + block_size, :], b=b, b_array=b_array)
+
+    def get_block_size(self, block_size=None, n_basis=None):
+        """
+        Determines the number of sample points, for which the gPC matrix is constructed at once during the evaluation
+        of the gPC approximation.
+
+        block_size = GPC.get_block_size(block_size=None, n_basis=None)
+
+        Parameters
+        ----------
+        block_size: int, optional, default: None
+            Requested block size (Default: self.block_size or determined from self.memory_limit)
+        n_basis: int, optional, default: None
+            Number of evaluated basis functions (Default: self.basis.n_basis)
+
+        Returns
+        -------
+        block_size : int
+            Number of sample points evaluated at once
+        """
+        if block_size is None:
+            block_size = self.block_size
+
+        if n_basis is None:
+            n_basis = self.basis.n_basis
+
+        if block_size is None:
+            block_size = self.memory_limit / (np.dtype(self.dtype).itemsize * max(n_basis, 1))
+
+        return int(max(block_size, 1))
+
+    def _prepare_approximation(self, coeffs, x, output_idx=None):
+        """
+        Crops the coordinates to the gPC boundaries, transforms them in case of projected gPC and selects the
+        coefficients of the requested output quantities. If self.sparse_tol is not None, the basis functions with
+        negligible coefficients are removed (see get_sparse_basis).
+
+        Parameters
+        ----------
+        coeffs: ndarray of float [n_basis x n_out]
+            GPC coefficients for each output variable
+        x: ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) (normalized [-1, 1])
+        output_idx: ndarray of int, optional, default=None [n_out]
+            Indices of output quantities to consider (Default: all).
+
+        Returns
+        -------
+        x: ndarray of float [n_x x n_dim_red]
+            Cropped (and transformed) coordinates
+        coeffs: ndarray of float [n_basis(_sparse) x n_out]
+            GPC coefficients of the considered output quantities and basis functions (in precision self.dtype)
+        b : list of BasisFunction object instances [n_basis(_sparse)][n_dim]
+            Basis functions to evaluate
+        b_array : ndarray of float [n_poly_coeffs(_sparse)]
+            Polynomial coefficients of the basis functions to evaluate
+        """
+        x = self._prepare_coords(x)
+
+        if output_idx is not None:
+            # convert to 1d array
+            output_idx = np.asarray(output_idx).flatten().astype(int)
+
+            # crop coeffs array if output index is specified
+            coeffs = coeffs[:, output_idx]
+
+        if coeffs.ndim == 1:
             coeffs = coeffs[:, np.newaxis]
 
+        # skip basis functions with negligible coefficients
+        b = self.basis.b
+        b_array = self.basis.b_array
+
+        if self.sparse_tol is not None:
+            idx, _ = self.get_sparse_basis(coeffs=coeffs, tol=self.sparse_tol)
+
+            if idx.size < self.basis.n_basis:
+                b = [self.basis.b[i] for i in idx]
+                b_array = self.sparse_basis_b_array
+                coeffs = coeffs[idx, :]
+
+        coeffs = coeffs.astype(self.dtype, copy=False)
+
+        return x, coeffs, b, b_array
+
+    def _prepare_coords(self, x):
+        """
+        Crops the coordinates to the gPC boundaries and transforms them in case of projected gPC.
+
+        Parameters
+        ----------
+        x: ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) (normalized [-1, 1])
+
+        Returns
+        -------
+        x: ndarray of float [n_x x n_dim_red]
+            Cropped (and transformed) coordinates
+        """
+        if len(x.shape) == 1:
+            x = x[:, np.newaxis]
+
+        # crop coordinates to gPC boundaries (values outside do not yield meaningful values)
+        for i_dim, key in enumerate(list(self.problem.parameters_random.keys())):
+            xmin = self.problem.parameters_random[key].pdf_limits_norm[0]
+            xmax = self.problem.parameters_random[key].pdf_limits_norm[1]
+            x[x[:, i_dim] < xmin, i_dim] = xmin
+            x[x[:, i_dim] > xmax, i_dim] = xmax
+
         # transform variables from xi to eta space if gpc model is reduced
         if self.p_matrix is not None:
             x = np.matmul(x, self.p_matrix.transpose() / self.p_matrix_norm[np.newaxis, :])
 
-        if self.backend == "cuda":
+        return x
+
+    def get_sparse_basis(self, coeffs, tol=0.):
+        """
+        Determines the basis functions needed to evaluate a sparse gPC expansion, i.e. the basis functions with
+        non-zero coefficients (tol=0) or coefficients larger than tol times the largest absolute coefficient of
+        the respective output (tol>0) in at least one output. Since the basis functions are orthonormal, the
+        L2 truncation error of neglecting the remaining coefficients is bounded by the norm of the neglected
+        coefficients. The sparse basis is cached and only recomputed if the coefficients, the tolerance or the basis
+        change.
+
+        idx, error = GPC.get_sparse_basis(coeffs, tol=0.)
+
+        Parameters
+        ----------
+        coeffs: ndarray of float [n_basis x n_out]
+            GPC coefficients for each output variable
+        tol: float, optional, default: 0.
+            Relative tolerance below which coefficients are neglected
+
+        Returns
+        -------
+        idx : ndarray of int [n_basis_sparse]
+            Indices of the retained basis functions in self.basis.b
+        error : ndarray of float [n_out]
+            Upper bound of the L2 truncation error of each output (zero if tol=0)
+        """
+        if coeffs.ndim == 1:
+            coeffs = coeffs[:, np.newaxis]
+
+        fingerprint = hashlib.sha1(np.ascontiguousarray(coeffs).view(np.uint8))
+        fingerprint.update("{}_{}_{}_{}".format(coeffs.shape, coeffs.dtype, tol, self.basis.n_basis).encode())
+        if self.basis.b_id is not None:
+            fingerprint.update("".join(str(_id) for _id in self.basis.b_id).encode())
+        key = fingerprint.hexdigest()
+
+        if key != self.sparse_basis_key:
+            coeffs_abs = np.abs(coeffs)
+            mask = (~(coeffs_abs <= tol * np.max(coeffs_abs, axis=0)[np.newaxis, :])).any(axis=1)
+
+            # keep at least one basis function
+            if not mask.any():
+                mask[0] = True
+
+            self.sparse_basis_idx = np.where(mask)[0]
+            self.sparse_basis_error = np.sqrt(np.sum(np.square(coeffs[~mask, :]), axis=0))
+
+            if self.sparse_basis_idx.size < self.basis.n_basis:
+                self.sparse_basis_b_array, _ = \
+                    self.basis.get_basis_array([self.basis.b[i] for i in self.sparse_basis_idx])
+            else:
+                self.sparse_basis_b_array = None
+
+            self.sparse_basis_key = key
+
+        return self.sparse_basis_idx, self.sparse_basis_error
+
+    def _get_approximation(self, coeffs, x, b=None, b_array=None):
+        """
+        Calculates the gPC approximation at the (already cropped and transformed) coordinates x.
+
+        Parameters
+        ----------
+        coeffs: ndarray of float [n_basis x n_out]
+            GPC coefficients for each output variable
+        x: ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+        b : list of BasisFunction object instances [n_basis][n_dim], optional, default: self.basis.b
+            Basis functions corresponding to the coefficients
+        b_array : ndarray of float [n_poly_coeffs], optional, default: self.basis.b_array
+            Polynomial coefficients of b
+
+        Returns
+        -------
+        pce: ndarray of float [n_x x n_out]
+            GPC approximation at normalized coordinates x.
+        """
+        if b is None:
+            b, b_array = self.basis.b, self.basis.b_array
+
+        if self.backend == "cpu":
+            # CPU backend (CPU single core), the gPC matrix is not stored
+            try:
+                from .pygpc_extensions import get_approximation_cpu
+                pce = np.empty([x.shape[0], coeffs.shape[1]], dtype=self.dtype)
+                get_approximation_cpu(x, b_array, coeffs, pce)
+            except ImportError:
+                print("The CPU-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
+        elif self.backend == "omp":
+            # OpenMP backend (CPU multi core), the gPC matrix is not stored
+            try:
+                from .pygpc_extensions import get_approximation_omp
+                pce = np.empty([x.shape[0], coeffs.shape[1]], dtype=self.dtype)
+                get_approximation_omp(x, b_array, coeffs, pce)
+            except ImportError:
+                print("The OMP-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
+        elif self.backend == "cuda":
             try:
                 from .pygpc_extensions_cuda import get_approximation_cuda
                 pce = np.empty([x.shape[0], coeffs.shape[1]])
-                get_approximation_cuda(x, self.basis.b_array, coeffs, pce)
+                get_approximation_cuda(x, b_array, coeffs, pce)
+                pce = pce.astype(self.dtype, copy=False)
             except ImportError:
-                print("The CUDA-extension is not installed. Fall back to pure Python as backend.")
-                self.backend = "python"
+                print("The CUDA-extension is not installed. Fall back to multi-threaded Python as backend.")
+                self.backend = "threads"
 
-        if self.backend == 'python' or self.backend == 'cpu' or self.backend == 'omp':
+        if self.backend in ["python", "threads"]:
             # determine gPC matrix at coordinates x
-            gpc_matrix = self.create_gpc_matrix(self.basis.b, x, gradient=False)
+            if b is self.basis.b:
+                gpc_matrix = self.create_gpc_matrix(b, x, gradient=False, dtype=self.dtype)
+            else:
+                gpc_matrix = self._create_gpc_matrix(b, x, gradient=False, dtype=self.dtype, b_array=b_array)
 
             # multiply with gPC coeffs
             pce = np.matmul(gpc_matrix, coeffs)
 
-        else:
+        elif self.backend not in ["cpu", "omp", "cuda"]:
             raise NotImplementedError
 
         return pce
@@ -686,125 +1651,122 @@ class GPC(object):
                                                          x=new_grid_points.coords_norm,
                                                          gradient=False)
 
-    def update_gpc_matrix(self):
+    def update_gpc_matrix(self, gradient_idx=None):
         """
         Update gPC matrix and gPC matrix gradient according to existing self.grid and self.basis.
 
         Call this method when self.gpc_matrix does not fit to self.grid and self.basis objects anymore
         The old gPC matrix with their self.gpc_matrix_b_id and self.gpc_matrix_coords_id is compared
-        to self.basis.b_id and self.grid.coords_id. New rows and columns are computed if differences are found.
+        to self.basis.b_id and self.grid.coords_id. Only new rows (grid points) and columns (basis functions) are
+        computed, existing entries are reused. Deleted grid points and basis functions are removed. If no gPC matrix
+        exists yet or the projection matrix has changed, the gPC matrices are initialized from scratch.
+
+        Parameters
+        ----------
+        gradient_idx : ndarray of int [gradient_results.shape[0]], optional, default: None
+            Indices of grid points where the gradient in gradient_results is provided
+            (if None, self.gradient_idx is kept)
         """
+        if self.gradient_idx is None or gradient_idx is not None:
+            self.gradient_idx = gradient_idx
+
+        p_matrix_changed = (self.p_matrix is None) != (self.gpc_matrix_p_matrix is None) or \
+                           (self.p_matrix is not None and
+                            (self.p_matrix.shape != self.gpc_matrix_p_matrix.shape or
+                             not (self.p_matrix == self.gpc_matrix_p_matrix).all()))
+
+        if self.gpc_matrix is None or self.gpc_matrix_coords_id is None or p_matrix_changed:
+            self.init_gpc_matrix(gradient_idx=self.gradient_idx)
+            return
+
         self._update_gpc_matrix(gradient=False)
+        self.n_grid.append(self.gpc_matrix.shape[0])
+        self.n_basis.append(self.gpc_matrix.shape[1])
 
-        if self.gradient:
+        if self.gradient and self.gradient_idx is not None:
             self._update_gpc_matrix(gradient=True)
 
     def _update_gpc_matrix(self, gradient=False):
         """
-        Update gPC matrix or gPC gradient matrix
+        Update gPC matrix or gPC gradient matrix by reusing the entries of existing grid points and basis functions
+        (identified by their UUIDs) and computing the remaining entries only.
+
+        Parameters
+        ----------
+        gradient : bool, optional, default: False
+            Update gradient gPC matrix (True) or gPC matrix (False)
         """
-        if self.backend == "python":
-            # initialize updated matrix and variables
-            if gradient:
+        coords_id_ref = self.grid.coords_id
+        b_id_ref = self.basis.b_id
+
+        if gradient:
+            coords_id_ref = [coords_id_ref[i] for i in self.gradient_idx]
+            coords_norm = self.grid.coords_norm[self.gradient_idx, :]
+            coords_id = self.gpc_matrix_gradient_coords_id
+            b_id = self.gpc_matrix_gradient_b_id
+            ge_str = "(gradient)"
+
+            if self.gpc_matrix_gradient is None or coords_id is None:
+                matrix = np.zeros((0, 0, self.problem.dim))
+                coords_id, b_id = [], []
+            else:
                 # reshape gpc gradient matrix from 2D to 3D representation [n_grid x n_basis x n_dim]
                 matrix = mat2ten(mat=self.gpc_matrix_gradient, incr=self.problem.dim)
-                matrix_updated = np.zeros((len(self.gradient_idx), len(self.basis.b_id), self.problem.dim))
-                coords_id = self.gpc_matrix_gradient_coords_id[self.gradient_idx]
-                coords_id_ref = self.grid.coords_gradient_id[self.gradient_idx]
-                b_id = self.gpc_matrix_gradient_b_id
-                b_id_ref = self.basis.b_id
-                coords_norm = self.grid.coords_norm[self.gradient_idx]
-                ge_str = "(gradient)"
-
-            else:
-                matrix = self.gpc_matrix
-                matrix_updated = np.zeros((len(self.grid.coords_id), len(self.basis.b_id)))
-                coords_id = self.gpc_matrix_coords_id
-                coords_id_ref = self.grid.coords_id
-                b_id = self.gpc_matrix_b_id
-                b_id_ref = self.basis.b_id
-                coords_norm = self.grid.coords_norm
-                ge_str = ""
-
-            # # determine indices of new basis functions and grid_points
-            # idx_coords_new = [i for i, _id in enumerate(self.grid.coords_id) if _id not in self.gpc_matrix_coords_id]
-            # idx_basis_new = [i for i, _id in enumerate(self.basis.b_id) if _id not in self.gpc_matrix_b_id]
-
-            # determine indices of old grid points in updated gpc matrix
-            idx_coords_old = np.empty(len(coords_id)) * np.nan
-            for i, coords_id_old in enumerate(coords_id):
-                for j, coords_id_new in enumerate(coords_id_ref):
-                    if coords_id_old == coords_id_new:
-                        idx_coords_old[i] = j
-                        break
-
-            # determine indices of old basis functions in updated gpc matrix
-            idx_b_old = np.empty(len(b_id))*np.nan
-            for i, b_id_old in enumerate(b_id):
-                for j, b_id_new in enumerate(b_id_ref):
-                    if b_id_old == b_id_new:
-                        idx_b_old[i] = j
-                        break
-
-            # filter out non-existent rows and columns
-            matrix = matrix[~np.isnan(idx_coords_old), :, ]
-            matrix = matrix[:, ~np.isnan(idx_b_old), ]
-
-            idx_coords_old = idx_coords_old[~np.isnan(idx_coords_old)].astype(int)
-            idx_b_old = idx_b_old[~np.isnan(idx_b_old)].astype(int)
-
-            # indices of new coords and basis in updated gpc matrix (values have to be computed there)
-            idx_coords_new = np.array(list(set(np.arange(len(coords_id_ref))) - set(idx_coords_old))).astype(int)
-            idx_b_new = np.array(list(set(np.arange(len(b_id_ref))) - set(idx_b_old))).astype(int)
-
-            # write old results at correct location in updated gpc matrix
-            idx = get_cartesian_product([idx_coords_old, idx_b_old]).astype(int)
-            idx_row = np.reshape(idx[:, 0], matrix.shape[:2]).astype(int)
-            idx_col = np.reshape(idx[:, 1], matrix.shape[:2]).astype(int)
-
-            matrix_updated[idx_row, idx_col, ] = matrix
-
-            # determine new columns (new basis functions) with old grid
-            idx = get_cartesian_product([idx_coords_old, idx_b_new]).astype(int)
-            if idx.any():
-                iprint('Adding {} columns to gPC matrix {}...'.format(idx_b_new.size, ge_str), tab=0, verbose=True)
-
-                idx_row = np.reshape(idx[:, 0], (idx_coords_old.size, idx_b_new.size)).astype(int)
-                idx_col = np.reshape(idx[:, 1], (idx_coords_old.size, idx_b_new.size)).astype(int)
-
-                matrix_updated[idx_row, idx_col, ] = self.create_gpc_matrix(b=[self.basis.b[i] for i in idx_b_new],
-                                                                            x=coords_norm[idx_coords_old, :],
-                                                                            gradient=gradient,
-                                                                            verbose=False)
-
-            # determine new rows (new grid points) with all basis functions
-            idx = get_cartesian_product([idx_coords_new, np.arange(len(self.basis.b))]).astype(int)
-            if idx.any():
-                iprint('Adding {} rows to gPC matrix {}...'.format(idx_coords_new.size, ge_str), tab=0, verbose=True)
-
-                idx_row = np.reshape(idx[:, 0], (idx_coords_new.size, len(self.basis.b))).astype(int)
-                idx_col = np.reshape(idx[:, 1], (idx_coords_new.size, len(self.basis.b))).astype(int)
-
-                matrix_updated[idx_row, idx_col, ] = self.create_gpc_matrix(b=self.basis.b,
-                                                                            x=coords_norm[idx_coords_new, :],
-                                                                            gradient=gradient,
-                                                                            verbose=False)
-
-            # overwrite old attributes and append new sizes
-            if gradient:
-                # reshape from 3D to 2D
-                self.gpc_matrix_gradient = ten2mat(matrix_updated)
-                self.gpc_matrix_gradient_coords_id = copy.deepcopy(self.grid.coords_id)
-                self.gpc_matrix_gradient_b_id = copy.deepcopy(self.basis.b_id)
-            else:
-                self.gpc_matrix = matrix_updated
-                self.gpc_matrix_coords_id = copy.deepcopy(self.grid.coords_id)
-                self.gpc_matrix_b_id = copy.deepcopy(self.basis.b_id)
-                self.n_grid.append(self.gpc_matrix.shape[0])
-                self.n_basis.append(self.gpc_matrix.shape[1])
 
+            matrix_updated = np.empty((len(coords_id_ref), len(b_id_ref), self.problem.dim))
+        else:
+            coords_norm = self.grid.coords_norm
+            coords_id = self.gpc_matrix_coords_id
+            b_id = self.gpc_matrix_b_id
+            matrix = self.gpc_matrix
+            matrix_updated = np.empty((len(coords_id_ref), len(b_id_ref)))
+            ge_str = ""
+
+        # map UUIDs of old grid points and basis functions to their row and column in the old gpc matrix
+        coords_id_lookup = {_id: i for i, _id in enumerate(coords_id)}
+        b_id_lookup = {_id: i for i, _id in enumerate(b_id)}
+
+        # rows and columns of the updated gpc matrix, which are already known (and where they are in the old one)
+        idx_coords_old = np.array([i for i, _id in enumerate(coords_id_ref) if _id in coords_id_lookup], dtype=int)
+        idx_coords_old_src = np.array([coords_id_lookup[coords_id_ref[i]] for i in idx_coords_old], dtype=int)
+        idx_b_old = np.array([i for i, _id in enumerate(b_id_ref) if _id in b_id_lookup], dtype=int)
+        idx_b_old_src = np.array([b_id_lookup[b_id_ref[i]] for i in idx_b_old], dtype=int)
+
+        # indices of new coords and basis in updated gpc matrix (values have to be computed there)
+        idx_coords_new = np.setdiff1d(np.arange(len(coords_id_ref)), idx_coords_old)
+        idx_b_new = np.setdiff1d(np.arange(len(b_id_ref)), idx_b_old)
+
+        # write old results at correct location in updated gpc matrix
+        if idx_coords_old.size > 0 and idx_b_old.size > 0:
+            matrix_updated[np.ix_(idx_coords_old, idx_b_old)] = matrix[np.ix_(idx_coords_old_src, idx_b_old_src)]
+
+        # determine new columns (new basis functions) with old grid
+        if idx_coords_old.size > 0 and idx_b_new.size > 0:
+            iprint('Adding {} columns to gPC matrix {}...'.format(idx_b_new.size, ge_str), tab=0, verbose=True)
+
+            matrix_updated[np.ix_(idx_coords_old, idx_b_new)] = \
+                self._create_gpc_matrix(b=[self.basis.b[i] for i in idx_b_new],
+                                        x=coords_norm[idx_coords_old, :],
+                                        gradient=gradient)
+
+        # determine new rows (new grid points) with all basis functions
+        if idx_coords_new.size > 0:
+            iprint('Adding {} rows to gPC matrix {}...'.format(idx_coords_new.size, ge_str), tab=0, verbose=True)
+
+            matrix_updated[idx_coords_new, ] = self._create_gpc_matrix(b=self.basis.b,
+                                                                       x=coords_norm[idx_coords_new, :],
+                                                                       gradient=gradient)
+
+        # overwrite old attributes
+        if gradient:
+            # reshape from 3D to 2D
+            self.gpc_matrix_gradient = ten2mat(matrix_updated)
+            self.gpc_matrix_gradient_coords_id = copy.deepcopy(coords_id_ref)
+            self.gpc_matrix_gradient_b_id = copy.deepcopy(b_id_ref)
         else:
-            self.init_gpc_matrix()
+            self.gpc_matrix = matrix_updated
+            self.gpc_matrix_coords_id = copy.deepcopy(coords_id_ref)
+            self.gpc_matrix_b_id = copy.deepcopy(b_id_ref)
 
     def save_gpc_matrix_hdf5(self, hdf5_path_gpc_matrix=None, hdf5_path_gpc_matrix_gradient=None):
         """
@@ -898,6 +1860,122 @@ class GPC(object):
                                      dtype="float64",
                                      data=self.gpc_matrix_gradient)
 
+    def get_matrix_key(self):
+        """
+        Determines a hash of the gPC matrix used by GPC.solve from its content defining properties: the basis
+        (multi-indices and parameters of the polynomials), the normalized coordinates and the type of the grid, the
+        projection matrix and the grid points of the gradient gPC matrix. GPC objects with the same key have
+        identical gPC matrices (e.g. QoI specific gPCs with the same projection) and can share the factorization of
+        the gPC matrix.
+
+        key = GPC.get_matrix_key()
+
+        Returns
+        -------
+        key : str
+            Hash of the gPC matrix
+        """
+        sha1 = hashlib.sha1()
+        sha1.update(repr((type(self.grid).__name__,
+                          self.gradient,
+                          self.basis.basis_function_types,
+                          [sorted(p.items()) for p in self.basis.basis_function_params])).encode())
+
+        for arr in [self.basis.multi_indices,
+                    self.grid.coords_norm,
+                    self.p_matrix,
+                    self.gradient_idx if self.gradient else None]:
+            if arr is None:
+                sha1.update(b"None")
+            else:
+                arr = np.ascontiguousarray(arr)
+                sha1.update(repr((arr.shape, arr.dtype.name)).encode())
+                sha1.update(arr.tobytes())
+
+        return sha1.hexdigest()
+
+    def get_matrix_ids(self, gradient=False):
+        """
+        Determines identifiers of the rows and columns of the gPC matrix used by GPC.solve from the UUIDs of the grid
+        points and basis functions of the gPC matrix (gpc_matrix_coords_id, gpc_matrix_b_id). They are used to detect
+        appended and replaced rows and appended columns when the factorization of the gPC matrix is updated (see
+        LeastSquares.update). The rows of the gradient gPC matrix are identified by the UUID of the grid point and
+        the index of the derivative. The rows further depend on the projection matrix and, in case of row weights
+        (see GPC.solve), on all basis functions, which is considered by a hash in the identifiers of the rows.
+
+        row_id, col_id = GPC.get_matrix_ids(gradient=False)
+
+        Parameters
+        ----------
+        gradient : bool, optional, default: False
+            Identify the rows of the gradient enhanced gPC matrix [gpc_matrix, gpc_matrix_gradient]
+
+        Returns
+        -------
+        row_id : list of tuple [n_rows] or None
+            Identifiers of the rows of the gPC matrix (None if the UUIDs are not known)
+        col_id : list of UUID4() [n_basis] or None
+            Identifiers of the columns of the gPC matrix (None if the UUIDs are not known)
+        """
+        if self.gpc_matrix_coords_id is None or self.gpc_matrix_b_id is None or \
+                (gradient and self.gpc_matrix_gradient_coords_id is None):
+            return None, None
+
+        sha1 = hashlib.sha1()
+
+        if self.p_matrix is None:
+            sha1.update(b"None")
+        else:
+            p_matrix = np.ascontiguousarray(self.p_matrix)
+            sha1.update(repr(p_matrix.shape).encode())
+            sha1.update(p_matrix.tobytes())
+
+        if isinstance(self.grid, CO) or (isinstance(self.grid, L1) and not (["D"] in self.grid.criterion)):
+            sha1.update(repr(self.gpc_matrix_b_id).encode())
+
+        key = sha1.hexdigest()
+
+        row_id = [(_id, key) for _id in self.gpc_matrix_coords_id]
+
+        if gradient:
+            row_id += [(_id, i_dim, key) for _id in self.gpc_matrix_gradient_coords_id
+                       for i_dim in range(self.problem.dim)]
+
+        return row_id, list(self.gpc_matrix_b_id)
+
+    def is_matrix_factorization(self, shape, row_id=None, col_id=None, key=None):
+        """
+        Checks if self.matrix_factorization is the factorization of the gPC matrix, i.e. if its rows and columns have
+        the given identifiers (see GPC.get_matrix_ids) or if it is shared by the gPC of another QoI with an identical
+        gPC matrix (same key, see GPC.get_matrix_key and Algorithm.solve_shared).
+
+        is_factorization = GPC.is_matrix_factorization(shape, row_id=None, col_id=None, key=None)
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the gPC matrix [n_rows x n_basis]
+        row_id : list of tuple [n_rows], optional, default: None
+            Identifiers of the rows of the gPC matrix
+        col_id : list of UUID4() [n_basis], optional, default: None
+            Identifiers of the columns of the gPC matrix
+        key : str, optional, default: None
+            Key of the gPC matrix
+
+        Returns
+        -------
+        is_factorization : bool
+            True if self.matrix_factorization is the factorization of the gPC matrix
+        """
+        if self.matrix_factorization is None or self.matrix_factorization.shape != tuple(shape):
+            return False
+
+        if key is not None and self.matrix_factorization.key == key:
+            return True
+
+        return row_id is not None and col_id is not None and \
+            self.matrix_factorization.row_id == row_id and self.matrix_factorization.col_id == col_id
+
     def solve(self, results, gradient_results=None, solver=None, settings=None, matrix=None, verbose=False):
         """
         Determines gPC coefficients
@@ -910,15 +1988,31 @@ class GPC(object):
             Gradient of results in original parameter space in specific grid points
         solver : str
             Solver to determine the gPC coefficients
-            - 'Moore-Penrose' ... Pseudoinverse of gPC matrix (SGPC.Reg, EGPC)
+            - 'Moore-Penrose' ... Least squares solution (pseudoinverse) of gPC matrix using a QR decomposition
+                                  (SVD if rank deficient) (SGPC.Reg, EGPC)
             - 'OMP' ... Orthogonal Matching Pursuit, sparse recovery approach (SGPC.Reg, EGPC)
             - 'LarsLasso' ... Least-Angle Regression using Lasso model (SGPC.Reg, EGPC)
+            - 'LSQR' ... Iterative least squares solution (LSQR/LSMR) using self.gpc_matrix or a matrix-free gPC matrix
+                         if self.gpc_matrix is None (SGPC.Reg, EGPC)
+            - 'NormalEquations' ... Least squares solution of blockwise accumulated normal equations (SGPC.Reg, EGPC)
             - 'NumInt' ... Numerical integration, spectral projection (SGPC.Quad)
         settings : dict
             Solver settings
             - 'Moore-Penrose' ... None
             - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0 or "sparsity": float 0...1
+                        and/or {"tol": float} Relative residual at which the iterations are stopped
             - 'LarsLasso' ... {"alpha": float 0...1} Regularization parameter
+                              or "cv" (determined for each output by cross validation along the LARS path)
+                              {"n_folds": int} Number of folds of the cross validation (default: 5)
+                              {"n_cpu": int} Number of processes to solve the outputs in parallel
+                              {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'LSQR' ... {"method": str} "lsqr" (default) or "lsmr"
+                         {"atol": float, "btol": float} Stopping tolerances (default: 1e-10)
+                         {"iter_lim": int} Maximum number of iterations (default: 10 * n_basis)
+                         {"precondition": bool} Scale the columns of the gPC matrix to unit norm (default: True)
+                         {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'NormalEquations' ... {"block_size": int} Number of rows accumulated at once
+                                   {"fn_hdf5": str} .hdf5 file of the gPC matrix (see GPC.solve_normal_equations)
             - 'NumInt' ... None
         matrix : ndarray of float, optional, default: self.gpc_matrix or [self.gpc_matrix, self.gpc_matrix_gradient]
             Matrix to invert. Depending on gradient_enhanced option, this matrix consist of the standard gPC matrix and
@@ -934,8 +2028,40 @@ class GPC(object):
 
         ge_str = ""
 
+        # use default solver if not specified
+        if solver is None:
+            solver = self.solver
+
+        # use default solver settings if not specified
+        if settings is None:
+            settings = self.settings
+
+        if solver == 'NormalEquations':
+            iprint("Determine gPC coefficients using '{}' solver...".format(solver), tab=0, verbose=verbose)
+
+            return self.solve_normal_equations(results=results,
+                                               gradient_results=gradient_results,
+                                               settings=settings,
+                                               matrix=matrix)
+
+        if matrix is None and solver == 'LSQR' and self.gpc_matrix is None:
+            # matrix-free gPC matrix evaluated blockwise on the fly (if no gPC matrix was initialized)
+            if self.gradient and self.gradient_idx is not None:
+                matrix = GPCMatrixOperator(gpc=self, x=self.grid.coords_norm, gradient_idx=self.gradient_idx)
+                ge_str = "(gradient enhanced)"
+            else:
+                matrix = GPCMatrixOperator(gpc=self, x=self.grid.coords_norm)
+
+        # identifiers of the rows and columns of the gPC matrix (see GPC.get_matrix_ids)
+        row_id, col_id = None, None
+        matrix_key = None
+
         if matrix is None:
             matrix = self.gpc_matrix
+            row_id, col_id = self.get_matrix_ids()
+
+            if self.matrix_factorization is not None and self.matrix_factorization.key is not None:
+                matrix_key = self.get_matrix_key()
 
             if self.gradient is False:
                 matrix = self.gpc_matrix
@@ -944,20 +2070,13 @@ class GPC(object):
                 if not solver == 'NumInt':
                     if self.gpc_matrix_gradient is not None:
                         matrix = np.vstack((self.gpc_matrix, self.gpc_matrix_gradient))
+                        row_id, col_id = self.get_matrix_ids(gradient=True)
                     else:
                         matrix = self.gpc_matrix
                     ge_str = "(gradient enhanced)"
                 else:
                     Warning("Gradient enhanced version not applicable in case of numerical integration (quadrature).")
 
-        # use default solver if not specified
-        if solver is None:
-            solver = self.solver
-
-        # use default solver settings if not specified
-        if solver is None:
-            settings = self.settings
-
         iprint("Determine gPC coefficients using '{}' solver {}...".format(solver, ge_str),
                tab=0, verbose=verbose)
 
@@ -972,22 +2091,31 @@ class GPC(object):
         else:
             results_complete = results
 
-        self.coherence_matrix = matrix
+        self.coherence_matrix = matrix if isinstance(matrix, np.ndarray) else None
 
         if isinstance(self.grid, CO) or (isinstance(self.grid, L1) and not (["D"] in self.grid.criterion)):
-            w = np.diag(1/np.linalg.norm(matrix, axis=1))
-            matrix = np.matmul(w, matrix)
-            results_complete = np.matmul(w, results_complete)
+            if isinstance(matrix, GPCMatrixOperator):
+                matrix.init_row_weights()
+                results_complete = (results_complete.transpose() * matrix.row_weights).transpose()
+            else:
+                w = 1/np.linalg.norm(matrix, axis=1)
+                matrix = matrix * w[:, np.newaxis]
+                results_complete = (results_complete.transpose() * w).transpose()
 
         #################
         # Moore-Penrose #
         #################
         if solver == 'Moore-Penrose':
-            # determine pseudoinverse of gPC matrix
-            self.matrix_inv = np.linalg.pinv(matrix)
+            # least squares solution using a QR decomposition of the gPC matrix (SVD if it is rank deficient),
+            # the factorization is kept for further right hand sides and is updated if the gPC matrix only changed
+            # by appended rows (grid points), appended columns (basis functions) or replaced rows (resampling)
+            if not self.is_matrix_factorization(shape=matrix.shape, row_id=row_id, col_id=col_id, key=matrix_key) and \
+                    (self.matrix_factorization is None or
+                     not self.matrix_factorization.update(matrix, row_id=row_id, col_id=col_id)):
+                self.matrix_factorization = LeastSquares(matrix, row_id=row_id, col_id=col_id)
 
             try:
-                coeffs = np.matmul(self.matrix_inv, results_complete)
+                coeffs = self.matrix_factorization.solve(results_complete)
             except ValueError:
                 raise AttributeError("Please check format of parameter sim_results: [n_grid (* dim) x n_out] "
                                      "np.ndarray.")
@@ -996,12 +2124,7 @@ class GPC(object):
         # Orthogonal Matching Pursuit #
         ###############################
         elif solver == 'OMP':
-            try:
-                import fastmat as fm
-            except ImportError:
-                raise ImportError("Please install the fastmat package to use the OMP solver.")
-            # transform gPC matrix to fastmat format
-            matrix_fm = fm.Matrix(matrix)
+            from .sparse_solver import omp
 
             if results_complete.ndim == 1:
                 results_complete = results_complete[:, np.newaxis]
@@ -1011,10 +2134,16 @@ class GPC(object):
                 n_coeffs_sparse = int(settings["n_coeffs_sparse"])
             elif "sparsity" in settings.keys():
                 n_coeffs_sparse = int(np.ceil(matrix.shape[1]*settings["sparsity"]))
+            elif "tol" in settings.keys():
+                n_coeffs_sparse = None
             else:
-                raise AttributeError("Please specify 'n_coeffs_sparse' or 'sparsity' in solver settings dictionary!")
+                raise AttributeError("Please specify 'n_coeffs_sparse', 'sparsity' or 'tol' in solver settings "
+                                     "dictionary!")
 
-            coeffs = fm.algs.OMP(matrix_fm, results_complete, n_coeffs_sparse)
+            coeffs = omp(matrix=matrix,
+                         results=results_complete,
+                         n_coeffs_sparse=n_coeffs_sparse,
+                         tol=settings.get("tol", None))
 
         ################################
         # Least-Angle Regression Lasso #
@@ -1024,67 +2153,290 @@ class GPC(object):
             if results_complete.ndim == 1:
                 results_complete = results_complete[:, np.newaxis]
 
+            from .sparse_solver import lars_lasso
+
+            # warm start from the previous solution if the basis only grew (initial values of coordinate descent)
+            coeffs_init = None
+
+            if settings.get("warm_start", False) and self.lars_lasso_coeffs is not None and \
+                    not isinstance(settings["alpha"], str) and \
+                    self.lars_lasso_coeffs.shape[0] <= matrix.shape[1] and \
+                    self.lars_lasso_coeffs.shape[1] == results_complete.shape[1]:
+                coeffs_init = np.zeros((matrix.shape[1], results_complete.shape[1]))
+                coeffs_init[:self.lars_lasso_coeffs.shape[0], :] = self.lars_lasso_coeffs
+
             # determine gPC-coefficients of extended basis using LarsLasso
-            # from sklearn.preprocessing import normalize
-            # matrix_norm = normalize(matrix, axis=0, return_norm=False)
-            #
-            # reg = linear_model.LassoLars(alpha=settings["alpha"], fit_intercept=False, normalize=False)
-            # reg.fit(matrix_norm, results_complete)
-            # coeffs = reg.coef_
-
-            # reg = linear_model.LassoLars(alpha=settings["alpha"], fit_intercept=False, normalize=False)
-            reg = linear_model.LassoLars(alpha=settings["alpha"], fit_intercept=False)
-            reg.fit(matrix, results_complete)
-            coeffs = reg.coef_
-
-            if coeffs.ndim == 1:
-                coeffs = coeffs[:, np.newaxis]
+            coeffs, self.lars_lasso_alpha = lars_lasso(matrix=matrix,
+                                                       results=results_complete,
+                                                       alpha=settings["alpha"],
+                                                       coeffs_init=coeffs_init,
+                                                       n_cpu=settings.get("n_cpu", None),
+                                                       n_folds=settings.get("n_folds", 5))
+
+            if settings.get("warm_start", False):
+                self.lars_lasso_coeffs = coeffs
+
+        #######################################
+        # Iterative least squares (LSQR/LSMR) #
+        #######################################
+        elif solver == 'LSQR':
+            import scipy.sparse.linalg
+            from .sparse_solver import lsqr
+
+            if results_complete.ndim == 1:
+                results_complete = results_complete[:, np.newaxis]
+
+            if settings is None:
+                settings = dict()
+
+            # diagonal preconditioning: scale the columns of the gPC matrix to unit norm
+            col_scale = np.ones(matrix.shape[1])
+
+            if settings.get("precondition", True):
+                if isinstance(matrix, GPCMatrixOperator):
+                    matrix.init_col_scale()
+                    col_scale = matrix.col_scale
+                else:
+                    col_norm = np.linalg.norm(matrix, axis=0)
+                    col_norm[col_norm == 0] = 1
+                    col_scale = 1 / col_norm
+                    matrix = matrix * col_scale[np.newaxis, :]
+
+            # warm start from the previous solution if the basis only grew
+            coeffs_init = np.zeros((matrix.shape[1], results_complete.shape[1]))
+
+            if settings.get("warm_start", False) and self.lsqr_coeffs is not None and \
+                    self.lsqr_coeffs.shape[0] <= matrix.shape[1] and \
+                    self.lsqr_coeffs.shape[1] == results_complete.shape[1]:
+                coeffs_init[:self.lsqr_coeffs.shape[0], :] = self.lsqr_coeffs
+
+            iter_lim = settings.get("iter_lim", 10 * matrix.shape[1])
+
+            if settings.get("method", "lsqr") == "lsmr":
+                coeffs = np.zeros((matrix.shape[1], results_complete.shape[1]))
+
+                for i_out in range(results_complete.shape[1]):
+                    coeffs[:, i_out] = scipy.sparse.linalg.lsmr(matrix, results_complete[:, i_out],
+                                                                x0=coeffs_init[:, i_out] / col_scale,
+                                                                atol=settings.get("atol", 1e-10),
+                                                                btol=settings.get("btol", 1e-10),
+                                                                maxiter=iter_lim)[0]
             else:
-                coeffs = coeffs.transpose()
+                # joint iterations of all outputs (one pass over the matrix-free gPC matrix per iteration)
+                coeffs = lsqr(matrix=matrix,
+                              results=results_complete,
+                              coeffs_init=coeffs_init / col_scale[:, np.newaxis],
+                              atol=settings.get("atol", 1e-10),
+                              btol=settings.get("btol", 1e-10),
+                              iter_lim=iter_lim)
+
+            coeffs = coeffs * col_scale[:, np.newaxis]
+
+            if settings.get("warm_start", False):
+                self.lsqr_coeffs = coeffs
 
         #########################
         # Numerical Integration #
         #########################
         elif solver == 'NumInt':
-            # check if quadrature rule (grid) fits to the probability density distribution (pdf)
-            grid_pdf_fit = True
+            # scale rows of gpc matrix with quadrature weights
+            matrix_weighted = matrix * self.get_quadrature_weights()[:, np.newaxis]
+
+            # determine gpc coefficients [n_coeffs x n_output]
+            coeffs = np.matmul(results_complete.transpose(), matrix_weighted).transpose()
+
+        else:
+            raise AttributeError("Unknown solver: '{}'!")
+
+        return coeffs
+
+    def get_quadrature_weights(self):
+        """
+        Determines the quadrature weights of the grid points (e.g. TensorGrid, SparseGrid) with respect to the
+        probability density function of the random parameters. If the quadrature rule does not fit to the pdf of the
+        random parameters (e.g. a Legendre grid for beta distributed parameters), the weights are multiplied by the
+        joint pdf.
+
+        weights = GPC.get_quadrature_weights()
+
+        Returns
+        -------
+        weights : ndarray of float [n_grid]
+            Quadrature weights of the grid points
+        """
+        weights = np.asarray(self.grid.weights, dtype=float).flatten()
+
+        # check if quadrature rule (grid) fits to the probability density distribution (pdf)
+        grid_pdf_fit = True
+        for i_p, p in enumerate(self.problem.parameters_random):
+            if self.problem.parameters_random[p].pdf_type == 'beta':
+                if not (self.grid.grid_type[i_p] == 'jacobi'):
+                    grid_pdf_fit = False
+                    break
+            elif self.problem.parameters_random[p].pdf_type in ['norm', 'normal']:
+                if not (self.grid.grid_type[i_p] == 'hermite'):
+                    grid_pdf_fit = False
+                    break
+
+        # if not, weight with the joint pdf
+        if not grid_pdf_fit:
+            joint_pdf = np.ones(self.grid.coords_norm.shape)
+
             for i_p, p in enumerate(self.problem.parameters_random):
-                if self.problem.parameters_random[p].pdf_type == 'beta':
-                    if not (self.grid.grid_type[i_p] == 'jacobi'):
-                        grid_pdf_fit = False
-                        break
-                elif self.problem.parameters_random[p].pdf_type in ['norm', 'normal']:
-                    if not (self.grid.grid_type[i_p] == 'hermite'):
-                        grid_pdf_fit = False
-                        break
+                joint_pdf[:, i_p] = \
+                    self.problem.parameters_random[p].pdf_norm(x=self.grid.coords_norm[:, i_p])
 
-            # if not, calculate joint pdf
-            if not grid_pdf_fit:
-                joint_pdf = np.ones(self.grid.coords_norm.shape)
+            weights = weights * np.prod(joint_pdf, axis=1) * 2 ** self.problem.dim
 
-                for i_p, p in enumerate(self.problem.parameters_random):
-                    joint_pdf[:, i_p] = \
-                        self.problem.parameters_random[p].pdf_norm(x=self.grid.coords_norm[:, i_p])
+        return weights
 
-                joint_pdf = np.array([np.prod(joint_pdf, axis=1)]).transpose()
+    def solve_normal_equations(self, results, gradient_results=None, settings=None, matrix=None):
+        """
+        Determines the gPC coefficients from the normal equations Psi^T W Psi coeffs = Psi^T W y ("NormalEquations"
+        solver), which are accumulated block by block of rows. The gPC matrix and the gradient gPC matrix are never
+        stacked. The rows are taken from (in this order of priority) the given matrix, the datasets of an .hdf5 file
+        (settings["fn_hdf5"]), self.gpc_matrix and self.gpc_matrix_gradient or are evaluated blockwise on the fly if
+        the gPC matrix was not initialized. The weighting of coherence optimal and L1 grids (rows normalized by their
+        2-norm) and the quadrature weights of tensor and sparse grids (see GPC.get_quadrature_weights) are applied per
+        block. The rows of the gradient gPC matrix are weighted with the quadrature weights of their grid points.
 
-                # weight sim_results with the joint pdf
-                results_complete = results_complete * joint_pdf * 2 ** self.problem.dim
+        coeffs = GPC.solve_normal_equations(results, gradient_results=None, settings=None, matrix=None)
 
-            # scale rows of gpc matrix with quadrature weights
-            matrix_weighted = np.matmul(np.diag(self.grid.weights), matrix)
+        Parameters
+        ----------
+        results : ndarray of float or h5py.Dataset [n_grid x n_out]
+            Results from simulations with N_out output quantities (read blockwise)
+        gradient_results : ndarray of float [n_gradient x n_out x dim], optional, default: None
+            Gradient of results in original parameter space in specific grid points
+        settings : dict, optional, default: None
+            Solver settings
+            - "block_size": int Number of rows accumulated at once (Default: determined from self.memory_limit)
+            - "fn_hdf5": str .hdf5 file containing the gPC matrix (and the gradient gPC matrix)
+            - "hdf5_path_gpc_matrix": str Path of the gPC matrix in the .hdf5 file (Default: "gpc_matrix")
+            - "hdf5_path_gpc_matrix_gradient": str Path of the gradient gPC matrix in the .hdf5 file
+              (Default: "gpc_matrix_gradient")
+        matrix : ndarray of float [n_grid (+ n_gradient * dim) x n_basis], optional, default: None
+            GPC matrix (with appended rows of the gradient gPC matrix)
 
-            # determine gpc coefficients [n_coeffs x n_output]
-            coeffs = np.matmul(results_complete.transpose(), matrix_weighted).transpose()
+        Returns
+        -------
+        coeffs: ndarray of float [n_basis x n_out]
+            gPC coefficients
+        """
+        if settings is None:
+            settings = dict()
+
+        weighted = isinstance(self.grid, CO) or (isinstance(self.grid, L1) and not (["D"] in self.grid.criterion))
+
+        # quadrature weights of the rows (numerical integration)
+        quadrature_weights = None
 
+        if isinstance(self.grid, (TensorGrid, SparseGrid)) and self.grid.weights is not None:
+            quadrature_weights = self.get_quadrature_weights()
+
+        # results of the rows of the gradient gPC matrix
+        if gradient_results is not None:
+            if self.p_matrix is not None:
+                gradient_results = np.matmul(gradient_results,
+                                             self.p_matrix.transpose() * self.p_matrix_norm[np.newaxis, :])
+
+            if quadrature_weights is not None:
+                quadrature_weights = np.hstack((quadrature_weights,
+                                                np.repeat(quadrature_weights[self.gradient_idx],
+                                                          gradient_results.shape[2])))
+
+            gradient_results = ten2mat(gradient_results)
+
+        def get_matrix_blocks(f=None):
+            """
+            Yields the rows of the gPC matrix and the gradient gPC matrix block by block
+            (row_start, row_stop, matrix_block)
+            """
+            if matrix is None and f is None and self.gpc_matrix is None:
+                # gPC matrix is evaluated blockwise on the fly
+                gradient_idx = self.gradient_idx if gradient_results is not None else None
+
+                for block in GPCMatrixOperator(gpc=self,
+                                               x=self.grid.coords_norm,
+                                               gradient_idx=gradient_idx,
+                                               block_size=settings.get("block_size", None)).get_blocks():
+                    yield block
+                return
+
+            if matrix is not None:
+                parts = [matrix]
+            elif f is not None:
+                parts = [f[settings.get("hdf5_path_gpc_matrix", "gpc_matrix")]]
+                if gradient_results is not None:
+                    parts.append(f[settings.get("hdf5_path_gpc_matrix_gradient", "gpc_matrix_gradient")])
+            else:
+                parts = [self.gpc_matrix]
+                if gradient_results is not None and self.gpc_matrix_gradient is not None:
+                    parts.append(self.gpc_matrix_gradient)
+
+            block_size = self.get_block_size(block_size=settings.get("block_size", None), n_basis=parts[0].shape[1])
+            row_offset = 0
+
+            for part in parts:
+                for i_start in range(0, part.shape[0], block_size):
+                    matrix_block = np.asarray(part[i_start:i_start + block_size, :], dtype=float)
+                    yield row_offset + i_start, row_offset + i_start + matrix_block.shape[0], matrix_block
+
+                row_offset += part.shape[0]
+
+        def get_results_block(row_start, row_stop):
+            """
+            Returns the rows of the results (and the gradient results)
+            """
+            if row_stop <= results.shape[0]:
+                return results[row_start:row_stop]
+            elif row_start >= results.shape[0]:
+                return gradient_results[row_start - results.shape[0]:row_stop - results.shape[0]]
+            else:
+                return np.vstack((results[row_start:], gradient_results[:row_stop - results.shape[0]]))
+
+        def accumulate(f=None):
+            """
+            Accumulates the normal equations of all blocks
+            """
+            normal_equations = None
+
+            for row_start, row_stop, matrix_block in get_matrix_blocks(f):
+                if normal_equations is None:
+                    normal_equations = NormalEquations(n_basis=matrix_block.shape[1])
+
+                # weights of the normal equations are the squared row weights (row 2-norm)^-1 or the quadrature weights
+                if weighted:
+                    weights = 1 / np.sum(matrix_block ** 2, axis=1)
+                elif quadrature_weights is not None:
+                    weights = quadrature_weights[row_start:row_stop]
+                else:
+                    weights = None
+
+                normal_equations.add(matrix=matrix_block,
+                                     results=get_results_block(row_start, row_stop),
+                                     weights=weights)
+
+            return normal_equations
+
+        if matrix is None and "fn_hdf5" in settings.keys():
+            with h5py.File(settings["fn_hdf5"], "r") as f:
+                normal_equations = accumulate(f)
         else:
-            raise AttributeError("Unknown solver: '{}'!")
+            normal_equations = accumulate()
 
-        return coeffs
+        n_rows = results.shape[0] + (gradient_results.shape[0] if gradient_results is not None else 0)
+
+        if normal_equations.n_rows != n_rows:
+            raise AttributeError("Please check format of parameter sim_results: [n_grid (* dim) x n_out] "
+                                 "np.ndarray.")
+
+        return normal_equations.solve()
 
     def create_validation_set(self, n_samples, n_cpu=1):
         """
-        Creates a ValidationSet instance (calls the model)
+        Creates a ValidationSet instance (calls the model). If options["validation_store"] is given, the validation set
+        is loaded from (and extended in) the validation set store (see ValidationSet.create_stored).
 
         Parameters
         ----------
@@ -1102,6 +2454,14 @@ class GPC(object):
         else:
             problem = self.problem
 
+        # reuse (and extend) the validation set of the problem in the validation set store
+        if self.options["validation_store"] is not None:
+            self.validation = ValidationSet(problem=problem).create_stored(fname=self.options["validation_store"],
+                                                                           n_samples=n_samples,
+                                                                           seed=self.options["seed"],
+                                                                           n_cpu=n_cpu)
+            return
+
         grid = Random(parameters_random=problem.parameters_random,
                       n_grid=n_samples,
                       options={"seed": self.options["seed"]})
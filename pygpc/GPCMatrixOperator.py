@@ -0,0 +1,192 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+from .misc import ten2mat
+
+
+class GPCMatrixOperator(LinearOperator):
+    """
+    Matrix-free representation of the gPC matrix (and the gradient gPC matrix) as scipy LinearOperator. The products
+    Psi * c and Psi^T * r are computed blockwise by evaluating the basis functions for block_size sample points at a
+    time, such that the memory is limited to one block of the gPC matrix. If the whole gPC matrix fits into
+    gpc.memory_limit, the evaluated blocks are cached during the first pass and reused by the following products.
+    The rows and columns can be scaled by row_weights and col_scale (e.g. weighting of coherence optimal grids and
+    preconditioning of iterative solvers).
+
+    Parameters
+    ----------
+    gpc : GPC object instance
+        GPC object containing the basis and the backend to evaluate the gPC matrix
+    x : ndarray of float [n_x x n_dim]
+        Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+    gradient_idx : ndarray of int [n_gradient], optional, default: None
+        Indices of the sample points where the rows of the gradient gPC matrix are appended (point by point as in
+        ten2mat)
+    block_size : int, optional, default: None
+        Number of sample points evaluated at once (Default: gpc.block_size or determined from gpc.memory_limit)
+    cache : bool, optional, default: None
+        Cache the evaluated blocks of the gPC matrix (Default: if the gPC matrix fits into gpc.memory_limit)
+
+    Attributes
+    ----------
+    row_weights : ndarray of float [n_rows] or None
+        Weights of the rows of the gPC matrix
+    col_scale : ndarray of float [n_basis] or None
+        Scaling factors of the columns of the gPC matrix
+    blocks : list of tuple or None
+        Cached (unscaled) blocks (row_start, row_stop, matrix_block) of the gPC matrix (None if not evaluated yet)
+    """
+
+    def __init__(self, gpc, x, gradient_idx=None, block_size=None, cache=None):
+        """
+        Constructor; Initializes the GPCMatrixOperator
+        """
+        self.gpc = gpc
+        self.b = gpc.basis.b
+        self.x = x
+        self.gradient_idx = gradient_idx
+        self.block_size = gpc.get_block_size(block_size=block_size, n_basis=len(self.b))
+        self.row_weights = None
+        self.col_scale = None
+        self.blocks = None
+
+        n_rows = x.shape[0]
+
+        if gradient_idx is not None:
+            n_rows += len(gradient_idx) * x.shape[1]
+
+        if cache is None:
+            cache = n_rows * len(self.b) * np.dtype("float64").itemsize <= gpc.memory_limit
+
+        self.cache = cache
+
+        super(GPCMatrixOperator, self).__init__(dtype=np.dtype("float64"), shape=(n_rows, len(self.b)))
+
+    def get_blocks(self):
+        """
+        Evaluates the (scaled) gPC matrix block by block.
+
+        for row_start, row_stop, matrix_block in GPCMatrixOperator.get_blocks(): ...
+
+        Yields
+        ------
+        row_start : int
+            Index of the first row of the block
+        row_stop : int
+            Index after the last row of the block
+        matrix_block : ndarray of float [row_stop - row_start x n_basis]
+            Rows of the gPC matrix
+        """
+        for row_start, row_stop, matrix_block in (self.blocks if self.blocks is not None else self.evaluate_blocks()):
+            if self.row_weights is not None:
+                matrix_block = matrix_block * self.row_weights[row_start:row_stop, np.newaxis]
+
+            if self.col_scale is not None:
+                matrix_block = matrix_block * self.col_scale[np.newaxis, :]
+
+            yield row_start, row_stop, matrix_block
+
+    def evaluate_blocks(self):
+        """
+        Evaluates the (unscaled) gPC matrix block by block and caches the blocks if self.cache is True.
+
+        for row_start, row_stop, matrix_block in GPCMatrixOperator.evaluate_blocks(): ...
+
+        Yields
+        ------
+        row_start : int
+            Index of the first row of the block
+        row_stop : int
+            Index after the last row of the block
+        matrix_block : ndarray of float [row_stop - row_start x n_basis]
+            Rows of the gPC matrix
+        """
+        blocks = []
+
+        # (coordinates, gradient, index of the first row, number of rows per sample point)
+        parts = [(self.x, False, 0, 1)]
+
+        if self.gradient_idx is not None:
+            parts.append((self.x[self.gradient_idx, :], True, self.x.shape[0], self.x.shape[1]))
+
+        for x, gradient, row_offset, n_rows_point in parts:
+            block_size = max(1, self.block_size // n_rows_point)
+
+            for i_start in range(0, x.shape[0], block_size):
+                matrix_block = self.gpc._create_gpc_matrix(b=self.b, x=x[i_start:i_start + block_size, :],
+                                                           gradient=gradient)
+
+                if gradient:
+                    matrix_block = ten2mat(matrix_block)
+
+                row_start = row_offset + i_start * n_rows_point
+                row_stop = row_start + matrix_block.shape[0]
+
+                if self.cache:
+                    blocks.append((row_start, row_stop, matrix_block))
+
+                yield row_start, row_stop, matrix_block
+
+        if self.cache:
+            self.blocks = blocks
+
+    def init_row_weights(self):
+        """
+        Determines the row weights (row 2-norm)^-1 of the gPC matrix (weighting of coherence optimal grids) in one
+        pass over the gPC matrix.
+        """
+        self.row_weights = None
+        self.col_scale = None
+        row_weights = np.zeros(self.shape[0])
+
+        for row_start, row_stop, matrix_block in self.get_blocks():
+            row_weights[row_start:row_stop] = 1 / np.linalg.norm(matrix_block, axis=1)
+
+        self.row_weights = row_weights
+
+    def init_col_scale(self):
+        """
+        Determines the column scaling (column 2-norm)^-1 of the (row weighted) gPC matrix (diagonal preconditioning
+        of iterative solvers) in one pass over the gPC matrix. Columns without entries are not scaled.
+        """
+        self.col_scale = None
+        col_norm2 = np.zeros(self.shape[1])
+
+        for row_start, row_stop, matrix_block in self.get_blocks():
+            col_norm2 += np.sum(matrix_block ** 2, axis=0)
+
+        col_norm2[col_norm2 == 0] = 1
+        self.col_scale = 1 / np.sqrt(col_norm2)
+
+    def _matmat(self, x):
+        """
+        Product of the gPC matrix with the matrix x [n_basis x n] (blockwise)
+        """
+        out = np.zeros((self.shape[0], x.shape[1]), dtype=np.result_type(self.dtype, x.dtype))
+
+        for row_start, row_stop, matrix_block in self.get_blocks():
+            out[row_start:row_stop, :] = np.matmul(matrix_block, x)
+
+        return out
+
+    def _rmatmat(self, x):
+        """
+        Product of the transposed gPC matrix with the matrix x [n_rows x n] (blockwise)
+        """
+        out = np.zeros((self.shape[1], x.shape[1]), dtype=np.result_type(self.dtype, x.dtype))
+
+        for row_start, row_stop, matrix_block in self.get_blocks():
+            out += np.matmul(matrix_block.transpose(), x[row_start:row_stop, :])
+
+        return out
+
+    def _matvec(self, x):
+        """
+        Product of the gPC matrix with the vector x [n_basis] (blockwise)
+        """
+        return self._matmat(x.reshape(-1, 1)).reshape(-1)
+
+    def _rmatvec(self, x):
+        """
+        Product of the transposed gPC matrix with the vector x [n_rows] (blockwise)
+        """
+        return self._rmatmat(x.reshape(-1, 1)).reshape(-1)
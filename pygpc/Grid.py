@@ -980,7 +980,7 @@ class RandomGrid(Grid):
         self.coords_norm = np.delete(self.coords_norm, idx, axis=0)
 
         # remove unique IDs of grid points
-        self.coords_id = [self.coords_id[i] for i in range(self.n_grid) if i not in idx]
+        self.coords_id = [self.coords_id[i] for i in range(len(self.coords_id)) if i not in idx]
 
         # delete gradient grid points
         if self.coords_gradient is not None:
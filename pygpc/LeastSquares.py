@@ -0,0 +1,289 @@
+import numpy as np
+import scipy.linalg
+
+
+class LeastSquares(object):
+    """
+    Factorization of the gPC matrix to determine least squares solutions min ||matrix * coeffs - results||.
+    The matrix is factorized once by a QR decomposition and the factorization is reused for every right hand side
+    (e.g. additional QoIs or cross validation). If the matrix is underdetermined, rank deficient or ill conditioned
+    (estimated reciprocal condition number of R below rcond_qr), the factorization falls back to a SVD, which yields
+    the same minimum norm solution as the pseudoinverse (np.linalg.pinv).
+
+    Parameters
+    ----------
+    matrix : ndarray of float [n_samples x n_basis]
+        Matrix of the system of equations (gPC matrix)
+    rcond_qr : float, optional, default: max(n_samples, n_basis) * eps
+        Minimum reciprocal condition number of R to use the QR decomposition
+    rcond_svd : float, optional, default: 1e-15
+        Cutoff for small singular values relative to the largest singular value (see np.linalg.pinv)
+    row_id : list [n_samples], optional, default: None
+        Identifiers of the rows of the matrix (e.g. UUIDs of the grid points, see GPC.get_matrix_ids)
+    col_id : list [n_basis], optional, default: None
+        Identifiers of the columns of the matrix (e.g. UUIDs of the basis functions, see GPC.get_matrix_ids)
+    key : str, optional, default: None
+        Key of the matrix (e.g. hash of the gPC matrix, see GPC.get_matrix_key)
+
+    Attributes
+    ----------
+    method : str
+        Factorization used to solve the system of equations ("qr" or "svd")
+    shape : tuple of int
+        Shape of the matrix [n_samples x n_basis]
+    rank : int
+        Numerical rank of the matrix
+    q : ndarray of float [n_samples x n_basis]
+        Orthogonal factor of the QR decomposition (method="qr")
+    r : ndarray of float [n_basis x n_basis]
+        Upper triangular factor of the QR decomposition (method="qr")
+    u : ndarray of float [n_samples x rank]
+        Left singular vectors of the SVD (method="svd")
+    s : ndarray of float [rank]
+        Singular values of the SVD (method="svd")
+    vt : ndarray of float [rank x n_basis]
+        Right singular vectors of the SVD (method="svd")
+    row_id : list [n_samples]
+        Identifiers of the rows of the factorized matrix to detect changes of the matrix in LeastSquares.update
+    col_id : list [n_basis]
+        Identifiers of the columns of the factorized matrix to detect changes of the matrix in LeastSquares.update
+    key : str or None
+        Key of the factorized matrix to share the factorization by reference between objects with identical matrices
+        (e.g. the gPCs of different QoIs, see Algorithm.solve_shared), reset if the factorization is changed by
+        LeastSquares.update
+    """
+
+    def __init__(self, matrix, rcond_qr=None, rcond_svd=1e-15, row_id=None, col_id=None, key=None):
+        """
+        Constructor; Factorizes the matrix
+        """
+        self.shape = matrix.shape
+        self.rcond_qr = rcond_qr if rcond_qr is not None else max(matrix.shape) * np.finfo(matrix.dtype).eps
+        self.rcond_svd = rcond_svd
+        self.method = None
+        self.rank = None
+        self.q = None
+        self.r = None
+        self.u = None
+        self.s = None
+        self.vt = None
+        self.row_id = list(row_id) if row_id is not None else None
+        self.col_id = list(col_id) if col_id is not None else None
+        self.key = key
+
+        if matrix.shape[0] >= matrix.shape[1] > 0:
+            self.q, self.r = scipy.linalg.qr(matrix, mode="economic", check_finite=False)
+
+            if self.get_rcond() > self.rcond_qr:
+                self.method = "qr"
+                self.rank = matrix.shape[1]
+                return
+
+        self.init_svd(matrix)
+
+    def init_svd(self, matrix):
+        """
+        Factorizes the matrix by a SVD and removes the singular values below the cutoff (fallback of the QR
+        decomposition).
+
+        Parameters
+        ----------
+        matrix : ndarray of float [n_samples x n_basis]
+            Matrix of the system of equations
+        """
+        u, s, vt = np.linalg.svd(matrix, full_matrices=False)
+
+        self.rank = int(np.sum(s > self.rcond_svd * np.max(s, initial=0)))
+        self.u, self.s, self.vt = u[:, :self.rank], s[:self.rank], vt[:self.rank, :]
+        self.q = None
+        self.r = None
+        self.method = "svd"
+
+    def update(self, matrix, row_id, col_id):
+        """
+        Updates the QR decomposition to the changed matrix instead of factorizing it again. The new matrix may
+        contain appended rows (e.g. new grid points), appended columns (e.g. new basis functions) and replaced rows
+        (e.g. resampled grid points) of the factorized matrix, which are identified by the identifiers of the rows and
+        columns (the matrix itself is not compared). The rows are deleted and inserted and the columns are
+        inserted by Givens rotations and Householder reflections (scipy.linalg.qr_delete and scipy.linalg.qr_insert),
+        which requires O(n_samples * n_basis) operations per row or column instead of O(n_samples * n_basis^2)
+        operations for the factorization.
+
+        success = LeastSquares.update(matrix, row_id, col_id)
+
+        Parameters
+        ----------
+        matrix : ndarray of float [n_samples_new x n_basis_new]
+            Changed matrix of the system of equations
+        row_id : list [n_samples_new]
+            Identifiers of the rows of the changed matrix (rows of the factorized matrix keep their position)
+        col_id : list [n_basis_new]
+            Identifiers of the columns of the changed matrix (columns of the factorized matrix keep their position)
+
+        Returns
+        -------
+        success : bool
+            True if the factorization was updated, False if the matrix has to be factorized again (e.g. not a QR
+            decomposition, unknown identifiers, rows or columns were deleted, too many changes or the matrix became
+            ill conditioned)
+        """
+        if self.method != "qr" or self.row_id is None or self.col_id is None or row_id is None or col_id is None:
+            return False
+
+        n_rows, n_cols = self.shape
+
+        if len(row_id) != matrix.shape[0] or len(col_id) != matrix.shape[1] or \
+                matrix.shape[0] < n_rows or matrix.shape[1] < n_cols or matrix.shape[0] < matrix.shape[1]:
+            return False
+
+        # columns of the factorized matrix have to be kept
+        if list(col_id[:n_cols]) != self.col_id:
+            return False
+
+        # replaced rows of the factorized matrix
+        idx_rows_replaced = np.array([i for i in range(n_rows) if row_id[i] != self.row_id[i]], dtype=int)
+
+        n_updates = 2 * len(idx_rows_replaced) + (matrix.shape[0] - n_rows) + (matrix.shape[1] - n_cols)
+
+        if n_updates == 0:
+            return True
+
+        # factorization is cheaper than the updates
+        if n_updates > n_cols / 2:
+            return False
+
+        q, r = self.q, self.r
+
+        try:
+            for i_row in idx_rows_replaced[::-1]:
+                q, r = scipy.linalg.qr_delete(q, r, k=i_row, p=1, which="row", check_finite=False)
+
+            # columns of the remaining rows of the factorized matrix
+            if matrix.shape[1] > n_cols:
+                idx_rows_remaining = np.setdiff1d(np.arange(n_rows), idx_rows_replaced)
+                q, r = scipy.linalg.qr_insert(q, r, matrix[idx_rows_remaining, n_cols:], k=n_cols, which="col",
+                                              check_finite=False)
+
+            for i_row in idx_rows_replaced:
+                q, r = scipy.linalg.qr_insert(q, r, matrix[i_row, :], k=i_row, which="row", check_finite=False)
+
+            if matrix.shape[0] > n_rows:
+                q, r = scipy.linalg.qr_insert(q, r, matrix[n_rows:, :], k=n_rows, which="row", check_finite=False)
+
+        except (np.linalg.LinAlgError, ValueError):
+            return False
+
+        self.q, self.r = q, r
+        self.key = None
+
+        if not self.get_rcond() > self.rcond_qr:
+            # keep the factorization consistent, it has to be replaced by a SVD of the matrix
+            self.method = None
+            return False
+
+        self.shape = matrix.shape
+        self.rank = matrix.shape[1]
+        self.row_id = list(row_id)
+        self.col_id = list(col_id)
+
+        return True
+
+    def get_rcond(self):
+        """
+        Estimates the reciprocal condition number of the matrix (1-norm) from the triangular factor R of the QR
+        decomposition in O(n_basis^2) (LAPACK trcon).
+
+        Returns
+        -------
+        rcond : float
+            Estimated reciprocal condition number (0 if R is singular)
+        """
+        if not np.isfinite(self.r).all() or (np.diag(self.r) == 0).any():
+            return 0.
+
+        trcon, = scipy.linalg.lapack.get_lapack_funcs(("trcon",), (self.r,))
+        rcond, info = trcon(self.r, norm="1", uplo="U", diag="N")
+
+        return rcond if info == 0 else 0.
+
+    def solve(self, results):
+        """
+        Determines the least squares solution for the given right hand side(s).
+
+        coeffs = LeastSquares.solve(results)
+
+        Parameters
+        ----------
+        results : ndarray of float [n_samples x n_out] or [n_samples]
+            Right hand side(s) of the system of equations
+
+        Returns
+        -------
+        coeffs : ndarray of float [n_basis x n_out] or [n_basis]
+            Least squares solution(s)
+        """
+        if results.shape[0] != self.shape[0]:
+            raise ValueError("Number of rows of the right hand side ({}) does not match the matrix ({})".format(
+                results.shape[0], self.shape[0]))
+
+        if self.method == "qr":
+            return scipy.linalg.solve_triangular(self.r, np.matmul(self.q.transpose(), results), check_finite=False)
+        else:
+            u_results = np.matmul(self.u.transpose(), results)
+
+            if u_results.ndim == 1:
+                return np.matmul(self.vt.transpose(), u_results / self.s)
+            else:
+                return np.matmul(self.vt.transpose(), u_results / self.s[:, np.newaxis])
+
+    def get_hat_diag(self):
+        """
+        Determines the diagonal of the hat matrix H = matrix * pinv(matrix) (leverages of the samples).
+
+        h = LeastSquares.get_hat_diag()
+
+        Returns
+        -------
+        h : ndarray of float [n_samples]
+            Diagonal of the hat matrix
+        """
+        if self.method == "qr":
+            return np.sum(self.q ** 2, axis=1)
+        else:
+            return np.sum(self.u ** 2, axis=1)
+
+    def get_loo_residuals(self, results):
+        """
+        Determines the leave-one-out residuals of the least squares solution in closed form without refitting:
+
+        e_i = (y_i - y_hat_i) / (1 - h_i)
+
+        where y_hat is the least squares approximation using all samples and h is the diagonal of the hat matrix.
+
+        loo_residuals = LeastSquares.get_loo_residuals(results)
+
+        Parameters
+        ----------
+        results : ndarray of float [n_samples x n_out]
+            Right hand side(s) of the system of equations
+
+        Returns
+        -------
+        loo_residuals : ndarray of float [n_samples x n_out] or None
+            Leave-one-out residuals (None if a sample has a leverage of 1, i.e. it can not be predicted from the
+            other samples)
+        """
+        h = self.get_hat_diag()
+
+        if (1 - h < np.sqrt(np.finfo(h.dtype).eps)).any():
+            return None
+
+        if self.method == "qr":
+            residuals = results - np.matmul(self.q, np.matmul(self.q.transpose(), results))
+        else:
+            residuals = results - np.matmul(self.u, np.matmul(self.u.transpose(), results))
+
+        if residuals.ndim == 1:
+            return residuals / (1 - h)
+        else:
+            return residuals / (1 - h)[:, np.newaxis]
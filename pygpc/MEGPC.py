@@ -18,6 +18,7 @@ from .Computation import *
 from .Classifier import *
 from .Grid import *
 from .SGPC import *
+from .CrossValidation import CrossValidation
 
 
 class MEGPC(object):
@@ -54,11 +55,19 @@ class MEGPC(object):
         - 'Moore-Penrose' ... Pseudoinverse of gPC matrix (SGPC.Reg, EGPC)
         - 'OMP' ... Orthogonal Matching Pursuit, sparse recovery approach (SGPC.Reg, EGPC)
         - 'LarsLasso' ... {"alpha": float 0...1} Regularization parameter
+                          or "cv" (determined for each output by cross validation along the LARS path)
+                          {"n_folds": int} Number of folds of the cross validation (default: 5)
+                          {"n_cpu": int} Number of processes to solve the outputs in parallel
+                          {"warm_start": bool} Start from the previous solution if the basis only grew
+        - 'LSQR' ... Iterative least squares solution (LSQR/LSMR) with a matrix-free gPC matrix (SGPC.Reg, EGPC)
+        - 'NormalEquations' ... Least squares solution of blockwise accumulated normal equations (SGPC.Reg, EGPC)
         - 'NumInt' ... Numerical integration, spectral projection (SGPC.Quad)
     verbose: bool
         boolean value to determine if to print out the progress into the standard output
     fn_results : string, optional, default=None
         If provided, model evaluations are saved in fn_results.hdf5 file and gpc object in fn_results.pkl file
+    loocv_statistics: dict
+        Error statistics of the outputs of the last cross validation (see CrossValidation.run)
     options : dict
         Options of gPC algorithm
     """
@@ -82,6 +91,7 @@ class MEGPC(object):
         self.n_out = []
         self.n_gpc = None
         self.relative_error_loocv = []
+        self.loocv_statistics = None
         self.relative_error_nrmsd = []
         self.error = []
         self.gradient_idx = None
@@ -94,6 +104,28 @@ class MEGPC(object):
         if "fn_results" not in options.keys():
             options["fn_results"] = None
         self.fn_results = options["fn_results"]
+
+        if "n_threads" not in options.keys():
+            options["n_threads"] = None
+
+        if "validation_store" not in options.keys():
+            options["validation_store"] = None
+
+        if "cv_scheme" not in options.keys():
+            options["cv_scheme"] = "leave_p_out"
+
+        if "cv_n_folds" not in options.keys():
+            options["cv_n_folds"] = 10
+
+        if "cv_p" not in options.keys():
+            options["cv_p"] = 1
+
+        if "cv_n_max" not in options.keys():
+            options["cv_n_max"] = 25
+
+        if "cv_seed" not in options.keys():
+            options["cv_seed"] = 1
+
         self.options = options
         self.matlab_model = options["matlab_model"]
 
@@ -224,7 +256,10 @@ class MEGPC(object):
         """
         Perform leave-one-out cross validation of gPC approximation and add error value to self.relative_error_loocv.
         The loocv error is calculated analytically after eq. (35) in [1] but omitting the "1 - " term, i.e. it
-        corresponds to 1 - Q^2.
+        corresponds to 1 - Q^2. The sub-gPCs are solved again for the test sets of the cross validation scheme
+        (options "cv_scheme", "cv_n_folds", "cv_p", "cv_n_max", "cv_seed"), which are solved concurrently
+        (see CrossValidation). The error is the mean of the relative norms of the residuals of the tested samples.
+        The error statistics of the outputs are stored in self.loocv_statistics.
 
         relative_error_loocv = GPC.loocv(sim_results, coeffs)
 
@@ -257,61 +292,56 @@ class MEGPC(object):
            for stochastic finite element analysis. Probabilistic Engineering Mechanics, 25(2), 183-197.
         """
 
-        n_loocv = 25
-
         if domain is not None:
-            results_domain = copy.deepcopy(results[self.domains == domain, :])
-            domain_idx = copy.deepcopy(domain)
+            sample_idx = np.where(self.domains == domain)[0]
         else:
-            results_domain = copy.deepcopy(results)
-
-        # define number of performed cross validations (max 25)
-        n_loocv_points = np.min((results_domain.shape[0], n_loocv))
+            sample_idx = np.arange(results.shape[0])
 
-        # make list of indices, which are randomly sampled (this index is w.r.t. to all points if domain is None)
-        loocv_point_idx = random.sample(list(range(results_domain.shape[0])), n_loocv_points)
-
-        start = time.time()
-        relative_error = np.zeros(n_loocv_points)
+        cross_validation = CrossValidation(scheme=self.options["cv_scheme"],
+                                           n_folds=self.options["cv_n_folds"],
+                                           p=self.options["cv_p"],
+                                           n_max=self.options["cv_n_max"],
+                                           seed=self.options["cv_seed"],
+                                           n_threads=self.options["n_threads"],
+                                           error_norm=error_norm)
 
-        for i in range(n_loocv_points):
+        # the folds may be solved in worker threads, which must not start processes (e.g. LarsLasso with n_cpu > 1)
+        settings = self.options["settings"]
 
-            if domain is None:
-                # determine domain of loocv point
-                domain_idx = int(self.classifier.predict(self.grid.coords_norm[loocv_point_idx[i]][np.newaxis, :]))
-                results_domain = results[self.domains == domain_idx, ]
+        if settings is not None and "n_cpu" in settings:
+            settings = {key: value for key, value in settings.items() if key != "n_cpu"}
 
-            # determine row in sub-gPC matrix of loocv point
-            loocv_point_idx_domain = np.sum(np.array(self.domains == domain_idx)[0:loocv_point_idx[i]])
+        def approximate_fold(test_idx):
+            test_idx = sample_idx[test_idx]
+            approximation = np.zeros((len(test_idx), results.shape[1]))
 
-            # get mask of eliminated row
-            mask = np.arange(results_domain.shape[0]) != loocv_point_idx_domain
+            for domain_idx in np.unique(self.domains[test_idx]):
+                # rows of the sub-gPC matrix of the domain and of the test samples in the domain
+                domain_sample_idx = np.where(self.domains == domain_idx)[0]
+                mask = np.logical_not(np.isin(domain_sample_idx, test_idx))
+                test_mask = self.domains[test_idx] == domain_idx
+                test_rows = np.searchsorted(domain_sample_idx, test_idx[test_mask])
 
-            # select right gpc matrix
-            matrix = self.gpc[domain_idx].gpc_matrix
+                # select right gpc matrix
+                matrix = self.gpc[domain_idx].gpc_matrix
 
-            # determine gpc coefficients (this takes a lot of time for large problems)
-            coeffs_loo = self.gpc[domain_idx].solve(results=results_domain[mask, :],
-                                                    solver=self.options["solver"],
-                                                    matrix=matrix[mask, :],
-                                                    settings=self.options["settings"],
-                                                    verbose=False)
+                # determine gpc coefficients (this takes a lot of time for large problems)
+                coeffs_fold = copy.copy(self.gpc[domain_idx]).solve(results=results[domain_sample_idx[mask], :],
+                                                                    solver=self.options["solver"],
+                                                                    matrix=matrix[mask, :],
+                                                                    settings=settings,
+                                                                    verbose=False)
 
-            sim_results_temp = results_domain[loocv_point_idx_domain, :]
+                approximation[test_mask, :] = np.matmul(matrix[test_rows, :], coeffs_fold)
 
-            if error_norm == "relative":
-                norm = scipy.linalg.norm(sim_results_temp)
-            else:
-                norm = 1.
+            return approximation
 
-            # determine error
-            relative_error[i] = scipy.linalg.norm(sim_results_temp - np.matmul(matrix[loocv_point_idx_domain, :],
-                                                                            coeffs_loo)) \
-                                / norm
-            display_fancy_bar("LOOCV", int(i + 1), int(n_loocv_points))
+        start = time.time()
+        self.loocv_statistics = cross_validation.run(fun=approximate_fold, results=results[sample_idx, :])
+        self.loocv_statistics["sample_idx"] = sample_idx[self.loocv_statistics["sample_idx"]]
 
         # store result in relative_error_loocv
-        relative_error_loocv = np.mean(relative_error)
+        relative_error_loocv = self.loocv_statistics["error"]
         iprint("LOOCV computation time: {} sec".format(time.time() - start), tab=0, verbose=True)
 
         return relative_error_loocv
@@ -555,7 +585,7 @@ class MEGPC(object):
         to self.basis.b_id and self.grid.coords_id. New rows and columns are computed when differences are found.
         """
         for i, gpc in enumerate(self.gpc):
-            gpc.update_gpc_matrix(gradient=gradient)
+            gpc.update_gpc_matrix()
 
     def save_gpc_matrices_hdf5(self):
         """
@@ -582,12 +612,25 @@ class MEGPC(object):
             - 'Moore-Penrose' ... Pseudoinverse of gPC matrix (SGPC.Reg, EGPC)
             - 'OMP' ... Orthogonal Matching Pursuit, sparse recovery approach (SGPC.Reg, EGPC)
             - 'LarsLasso' ... Least-Angle Regression using Lasso model (SGPC.Reg, EGPC)
+            - 'LSQR' ... Iterative least squares solution (LSQR/LSMR) with a matrix-free gPC matrix (SGPC.Reg, EGPC)
+            - 'NormalEquations' ... Least squares solution of blockwise accumulated normal equations (SGPC.Reg, EGPC)
             - 'NumInt' ... Numerical integration, spectral projection (SGPC.Quad)
         settings : dict
             Solver settings
             - 'Moore-Penrose' ... None
             - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0 or "sparsity": float 0...1
             - 'LarsLasso' ... {"alpha": float 0...1} Regularization parameter
+                              or "cv" (determined for each output by cross validation along the LARS path)
+                              {"n_folds": int} Number of folds of the cross validation (default: 5)
+                              {"n_cpu": int} Number of processes to solve the outputs in parallel
+                              {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'LSQR' ... {"method": str} "lsqr" (default) or "lsmr"
+                         {"atol": float, "btol": float} Stopping tolerances (default: 1e-10)
+                         {"iter_lim": int} Maximum number of iterations (default: 10 * n_basis)
+                         {"precondition": bool} Scale the columns of the gPC matrix to unit norm (default: True)
+                         {"warm_start": bool} Start from the previous solution if the basis only grew
+            - 'NormalEquations' ... {"block_size": int} Number of rows accumulated at once
+                                   {"fn_hdf5": str} .hdf5 file of the gPC matrix (see GPC.solve_normal_equations)
             - 'NumInt' ... None
         verbose : bool
             boolean value to determine if to print out the progress into the standard output
@@ -650,7 +693,8 @@ class MEGPC(object):
 
     def create_validation_set(self, n_samples, n_cpu=1, gradient=False):
         """
-        Creates a ValidationSet instance (calls the model)
+        Creates a ValidationSet instance (calls the model). If options["validation_store"] is given, the validation set
+        is loaded from (and extended in) the validation set store (see ValidationSet.create_stored).
 
         Parameters
         ----------
@@ -665,6 +709,15 @@ class MEGPC(object):
         # create set of validation points
         n_samples = n_samples
 
+        # reuse (and extend) the validation set of the problem in the validation set store (without gradient)
+        if self.options["validation_store"] is not None and not gradient:
+            self.validation = ValidationSet(problem=self.problem).create_stored(
+                fname=self.options["validation_store"],
+                n_samples=n_samples,
+                seed=self.options["seed"],
+                n_cpu=n_cpu)
+            return
+
         grid = Random(parameters_random=self.problem.parameters_random,
                       n_grid=n_samples,
                       options={"seed": self.options["seed"]})
@@ -0,0 +1,177 @@
+import os
+import uuid
+import hashlib
+import numpy as np
+
+
+class MatrixCache(object):
+    """
+    Persistent on-disk cache of gPC matrices. Every gPC matrix is stored as .npy file in the cache directory under
+    a hash of the basis functions (multi-indices and parameters of the polynomials), the coordinates and the type of
+    the matrix. Files are written to a temporary file first and renamed afterwards, such that several processes can
+    share the same cache directory. If the total size of the cache exceeds max_size, the least recently used
+    matrices are deleted.
+
+    Parameters
+    ----------
+    path : str
+        Cache directory (created if it does not exist)
+    max_size : float, optional, default: 2**30
+        Maximum size of the cache in bytes
+    """
+
+    def __init__(self, path, max_size=2**30):
+        """
+        Constructor; Initializes MatrixCache object
+        """
+        self.path = path
+        self.max_size = max_size
+
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def get_key(b, x, gradient=False, dtype="float64"):
+        """
+        Determines the hash of a gPC matrix from the basis functions, the coordinates and the type of the matrix.
+
+        Parameters
+        ----------
+        b : list of BasisFunction object instances [n_basis][n_dim]
+            Parameter wise basis function objects used in gPC (Basis.b or a subset of it)
+        x : ndarray of float [n_x x n_dim]
+            Coordinates of x = (x1, x2, ..., x_dim) where the rows of the gPC matrix are evaluated (normalized [-1, 1])
+        gradient : bool, optional, default: False
+            Gradient gPC matrix
+        dtype : str, optional, default: "float64"
+            Floating point precision of the gPC matrix ("float64" or "float32")
+
+        Returns
+        -------
+        key : str
+            Hash of the gPC matrix
+        """
+        x = np.ascontiguousarray(x)
+
+        sha1 = hashlib.sha1()
+        sha1.update(repr((gradient, np.dtype(dtype).name, x.shape, x.dtype.name)).encode())
+
+        # multi-indices and parameters of the polynomials (p["i"] is the order of the polynomial)
+        for _b in b:
+            sha1.update(repr([(type(_b_dim).__name__, sorted(_b_dim.p.items())) for _b_dim in _b]).encode())
+
+        sha1.update(x.tobytes())
+
+        return sha1.hexdigest()
+
+    def get_fn(self, key):
+        """
+        Returns the filename of the gPC matrix with the given key.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the gPC matrix
+
+        Returns
+        -------
+        fn : str
+            Filename of the .npy file in the cache directory
+        """
+        return os.path.join(self.path, key + ".npy")
+
+    def get(self, key):
+        """
+        Loads a gPC matrix from the cache and marks it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the gPC matrix
+
+        Returns
+        -------
+        gpc_matrix : ndarray of float or None
+            GPC matrix (None if it is not in the cache)
+        """
+        fn = self.get_fn(key)
+
+        try:
+            gpc_matrix = np.load(fn)
+            os.utime(fn)
+        except (OSError, ValueError):
+            # not in cache or deleted by another process in the meantime
+            return None
+
+        return gpc_matrix
+
+    def put(self, key, gpc_matrix):
+        """
+        Saves a gPC matrix in the cache and deletes least recently used matrices if the cache is full.
+        Matrices larger than the cache are not stored.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the gPC matrix
+        gpc_matrix : ndarray of float
+            GPC matrix
+        """
+        if gpc_matrix.nbytes > self.max_size:
+            return
+
+        fn = self.get_fn(key)
+        fn_tmp = os.path.join(self.path, f"{key}_{uuid.uuid4().hex}.tmp")
+
+        try:
+            with open(fn_tmp, "wb") as f:
+                np.save(f, gpc_matrix)
+
+            # atomic, other processes see the complete file or no file
+            os.replace(fn_tmp, fn)
+        except OSError:
+            if os.path.exists(fn_tmp):
+                os.remove(fn_tmp)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes the least recently used gPC matrices until the size of the cache is below max_size.
+        """
+        files = []
+
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum([f[1] for f in files])
+
+        for _, file_size, fn in sorted(files):
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(fn)
+            except OSError:
+                # already deleted by another process
+                pass
+
+            size -= file_size
+
+    def clear(self):
+        """
+        Deletes all gPC matrices from the cache.
+        """
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
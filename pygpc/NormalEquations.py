@@ -0,0 +1,109 @@
+import numpy as np
+import scipy.linalg
+
+
+class NormalEquations(object):
+    """
+    Least squares solution min ||W^(1/2) * (matrix * coeffs - results)|| determined from the normal equations
+    (matrix^T * W * matrix) * coeffs = matrix^T * W * results, which are accumulated block by block of rows.
+    Only the [n_basis x n_basis] and [n_basis x n_out] sums are kept in memory, such that the rows of the matrix
+    (e.g. of the gPC matrix and the gradient gPC matrix or of datasets in .hdf5 files) never have to be stored
+    at once. W is a diagonal matrix of row weights, which is applied by broadcasting. The normal equations are solved
+    by a Cholesky decomposition. If the matrix is rank deficient or ill conditioned (estimated reciprocal condition
+    number below rcond), the minimum norm solution is determined from the eigendecomposition of matrix^T * W * matrix.
+    Note that the condition number of the normal equations is the square of the condition number of the matrix.
+
+    Parameters
+    ----------
+    n_basis : int
+        Number of columns of the matrix (basis functions)
+    rcond : float, optional, default: n_basis * eps
+        Minimum reciprocal condition number of matrix^T * W * matrix to use the Cholesky decomposition
+
+    Attributes
+    ----------
+    gram : ndarray of float [n_basis x n_basis]
+        Accumulated matrix^T * W * matrix
+    correlation : ndarray of float [n_basis x n_out]
+        Accumulated matrix^T * W * results
+    n_rows : int
+        Number of accumulated rows
+    """
+
+    def __init__(self, n_basis, rcond=None):
+        """
+        Constructor; Initializes the NormalEquations object
+        """
+        self.n_basis = n_basis
+        self.rcond = rcond if rcond is not None else max(n_basis, 1) * np.finfo(float).eps
+        self.gram = np.zeros((n_basis, n_basis))
+        self.correlation = None
+        self.n_rows = 0
+
+    def add(self, matrix, results, weights=None):
+        """
+        Adds a block of rows to the normal equations.
+
+        NormalEquations.add(matrix, results, weights=None)
+
+        Parameters
+        ----------
+        matrix : ndarray of float [n_rows_block x n_basis]
+            Rows of the matrix
+        results : ndarray of float [n_rows_block x n_out] or [n_rows_block]
+            Rows of the right hand side(s)
+        weights : ndarray of float [n_rows_block], optional, default: None
+            Weights of the rows (diagonal of W)
+        """
+        results = np.asarray(results)
+
+        if results.ndim == 1:
+            results = results[:, np.newaxis]
+
+        if matrix.shape[0] != results.shape[0]:
+            raise ValueError("Number of rows of the right hand side ({}) does not match the matrix ({})".format(
+                results.shape[0], matrix.shape[0]))
+
+        if weights is not None:
+            matrix_weighted = matrix * weights[:, np.newaxis]
+        else:
+            matrix_weighted = matrix
+
+        if self.correlation is None:
+            self.correlation = np.zeros((self.n_basis, results.shape[1]))
+
+        self.gram += np.matmul(matrix_weighted.transpose(), matrix)
+        self.correlation += np.matmul(matrix_weighted.transpose(), results)
+        self.n_rows += matrix.shape[0]
+
+    def solve(self):
+        """
+        Solves the accumulated normal equations.
+
+        coeffs = NormalEquations.solve()
+
+        Returns
+        -------
+        coeffs : ndarray of float [n_basis x n_out]
+            Least squares solution(s)
+        """
+        if self.correlation is None:
+            raise ValueError("No rows were added to the normal equations")
+
+        try:
+            cho = scipy.linalg.cho_factor(self.gram, lower=False, check_finite=False)
+
+            # estimate of the reciprocal condition number from the diagonal of the Cholesky factor
+            diag = np.abs(np.diag(cho[0]))
+
+            if (np.min(diag) / np.max(diag)) ** 2 > self.rcond:
+                return scipy.linalg.cho_solve(cho, self.correlation, check_finite=False)
+
+        except np.linalg.LinAlgError:
+            pass
+
+        # minimum norm solution (rank deficient or ill conditioned)
+        s, v = np.linalg.eigh(self.gram)
+        mask = s > self.rcond * np.max(np.abs(s), initial=0)
+
+        return np.matmul(v[:, mask], np.matmul(v[:, mask].transpose(), self.correlation) / s[mask, np.newaxis])
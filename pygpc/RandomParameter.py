@@ -175,7 +175,28 @@ class Beta(RandomParameter):
         order: int
             Order of basis function
         """
-        return Jacobi({"i": order, "p": self.pdf_shape[0], "q": self.pdf_shape[1]})
+        return get_basis_function(Jacobi, {"i": order, "p": self.pdf_shape[0], "q": self.pdf_shape[1]})
+
+    def get_basis_function_tables(self, order_max):
+        """
+        Returns the tables of the normalization factors and the integrals of the Jacobi polynomials and their
+        derivatives w.r.t. the pdf for the orders 0 ... order_max (determined only once for all basis functions).
+
+        Parameters
+        ----------
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the basis functions
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the basis functions w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the basis functions w.r.t. the pdf
+        """
+        return get_basis_function_tables(Jacobi, {"p": self.pdf_shape[0], "q": self.pdf_shape[1]}, order_max)
 
     def pdf(self, x=None, a=None, b=None):
         """
@@ -381,7 +402,29 @@ class Norm(RandomParameter):
         order: int
             Order of basis function
         """
-        return Hermite({"i": order})
+        return get_basis_function(Hermite, {"i": order})
+
+    @staticmethod
+    def get_basis_function_tables(order_max):
+        """
+        Returns the tables of the normalization factors and the integrals of the Hermite polynomials and their
+        derivatives w.r.t. the pdf for the orders 0 ... order_max (determined only once for all basis functions).
+
+        Parameters
+        ----------
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the basis functions
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the basis functions w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the basis functions w.r.t. the pdf
+        """
+        return get_basis_function_tables(Hermite, dict(), order_max)
 
     def pdf(self, x=None):
         """
@@ -581,7 +624,28 @@ class Gamma(RandomParameter):
         order: int
             Order of basis function
         """
-        return Laguerre({"i": order, "alpha": self.pdf_shape[0]-1, "beta": self.pdf_shape[1]})
+        return get_basis_function(Laguerre, {"i": order, "alpha": self.pdf_shape[0]-1, "beta": self.pdf_shape[1]})
+
+    def get_basis_function_tables(self, order_max):
+        """
+        Returns the tables of the normalization factors and the integrals of the Laguerre polynomials and their
+        derivatives w.r.t. the pdf for the orders 0 ... order_max (determined only once for all basis functions).
+
+        Parameters
+        ----------
+        order_max : int
+            Maximum order
+
+        Returns
+        -------
+        fun_norm : ndarray of float [order_max + 1]
+            Normalization factors of the basis functions
+        fun_int : ndarray of float [order_max + 1]
+            Integrals of the basis functions w.r.t. the pdf
+        fun_der_int : ndarray of float [order_max + 1]
+            Integrals of the derivatives of the basis functions w.r.t. the pdf
+        """
+        return get_basis_function_tables(Laguerre, {"alpha": self.pdf_shape[0]-1, "beta": self.pdf_shape[1]}, order_max)
 
     def pdf(self, x=None):
         """
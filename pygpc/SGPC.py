@@ -113,7 +113,8 @@ class SGPC(GPC):
                                    order_max=order_max,
                                    order_max_norm=order_max_norm,
                                    interaction_order=interaction_order,
-                                   interaction_order_current=interaction_order_current)
+                                   interaction_order_current=interaction_order_current,
+                                   n_cpu=self.n_cpu_basis)
 
     @staticmethod
     def get_mean(coeffs=None, samples=None):
@@ -243,7 +244,7 @@ class SGPC(GPC):
 
             # Generate boolean matrix of all basis functions where order > 0 = True
             # size: [n_basis x dim]
-            multi_indices = np.array([list(map(lambda _b:_b.p["i"], b_row)) for b_row in self.basis.b])
+            multi_indices = self.basis.multi_indices
             sobol_mask = multi_indices != 0
 
             # look for unique combinations (i.e. available sobol combinations)
@@ -360,8 +361,9 @@ class SGPC(GPC):
             b_int_global = np.zeros([self.problem.dim, self.basis.n_basis])
 
             # construct matrix with integral expressions [n_basis x dim]
-            b_int = np.array([list(map(lambda _b: _b.fun_int, b_row)) for b_row in self.basis.b])
-            b_int_der = np.array([list(map(lambda _b: _b.fun_der_int, b_row)) for b_row in self.basis.b])
+            i_dim = np.arange(self.problem.dim)[np.newaxis, :]
+            b_int = self.basis.b_int_table[i_dim, self.basis.multi_indices]
+            b_int_der = self.basis.b_int_der_table[i_dim, self.basis.multi_indices]
 
             for i_sens in range(self.problem.dim):
                 # replace column with integral expressions from derivative of parameter[i_dim]
@@ -512,7 +514,8 @@ class Reg(SGPC):
     settings: dict
         Solver settings
         - 'Moore-Penrose' ... None
-        - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0
+        - 'OMP' ... {"n_coeffs_sparse": int} Number of gPC coefficients != 0 or "sparsity": float 0...1
+                    and/or {"tol": float} Relative residual at which the iterations are stopped
         - 'NumInt' ... None
     """
 
@@ -1,5 +1,6 @@
 import h5py
 import os
+import hashlib
 from .misc import ten2mat
 from .misc import mat2ten
 from .Grid import Grid
@@ -64,6 +65,138 @@ class ValidationSet(object):
         if self.results.ndim == 1:
             self.results = self.results[:, np.newaxis]
 
+    @staticmethod
+    def get_key(problem, seed=None):
+        """
+        Determines the hash of the validation set of a problem from the model class, the constant parameters, the
+        definitions of the random parameters and the seed of the random grid. The state of the model instance is not
+        considered (it is changed by the simulations), i.e. the model has to be fully defined by its parameters.
+
+        key = ValidationSet.get_key(problem, seed=None)
+
+        Parameters
+        ----------
+        problem : Problem instance
+            GPC problem
+        seed : float, optional, default: None
+            Seed of the random grid of the validation set
+
+        Returns
+        -------
+        key : str
+            Hash of the validation set
+        """
+        sha1 = hashlib.sha1()
+        sha1.update(repr((type(problem.model).__module__, type(problem.model).__qualname__, seed)).encode())
+
+        for p in problem.parameters_keys:
+            if p in problem.parameters_random.keys():
+                sha1.update(repr((p, problem.parameters_random[p].pdf_type,
+                                  list(np.asarray(problem.parameters_random[p].pdf_shape, dtype=float).flatten()),
+                                  list(np.asarray(problem.parameters_random[p].pdf_limits, dtype=float).flatten()))
+                                 ).encode())
+            else:
+                value = np.asarray(problem.parameters[p])
+                sha1.update(repr((p, value.dtype.name, value.shape)).encode())
+                sha1.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value).encode())
+
+        return sha1.hexdigest()
+
+    def create_stored(self, fname, n_samples, seed=None, n_cpu=1):
+        """
+        Loads the validation set of self.problem from the validation set store fname (.hdf5 file), where it is saved
+        under "validation_store/<key>" (see get_key). If the store contains less than n_samples samples, the validation
+        set is extended and the model is only evaluated in the new samples. If the seeded random grid of n_samples
+        samples starts with the stored samples (Random grids are constructed element wise in case of seeding), the
+        validation set is identical to a newly created one. Otherwise, the new samples are drawn with a seed derived
+        from the seed and the number of stored samples, such that the extension is reproducible. The extended
+        validation set is written back to the store.
+
+        ValidationSet.create_stored(fname, n_samples, seed=None, n_cpu=1)
+
+        Parameters
+        ----------
+        fname : str
+            Filename of the validation set store (.hdf5 file)
+        n_samples : int
+            Number of samples of the validation set
+        seed : float, optional, default: None
+            Seed of the random grid of the validation set
+        n_cpu : int, optional, default: 1
+            Number of CPU cores to use to evaluate the model in the new samples
+
+        Returns
+        -------
+        val : ValidationSet Object
+            ValidationSet object containing the grid points and the results data
+        """
+        n_samples = int(n_samples)
+        folder = "validation_store/" + self.get_key(problem=self.problem, seed=seed)
+        coords = np.zeros((0, self.problem.dim))
+        coords_norm = np.zeros((0, self.problem.dim))
+        results = None
+
+        if os.path.exists(fname):
+            with h5py.File(fname, 'r') as f:
+                if folder in f:
+                    coords = f[folder + "/grid/coords"][:]
+                    coords_norm = f[folder + "/grid/coords_norm"][:]
+                    results = f[folder + "/model_evaluations/results"][:]
+
+        n_stored = coords.shape[0]
+
+        if n_stored < n_samples:
+            grid = Random(parameters_random=self.problem.parameters_random,
+                          n_grid=n_samples,
+                          options={"seed": seed})
+
+            if n_stored == 0 or np.array_equal(grid.coords_norm[:n_stored, :], coords_norm):
+                coords_new = grid.coords[n_stored:, :]
+                coords_norm_new = grid.coords_norm[n_stored:, :]
+            else:
+                # reproducible seed of the new samples (different from the seed of the stored samples)
+                if seed is not None:
+                    seed_new = int(np.random.SeedSequence([int(seed), n_stored]).generate_state(1)[0])
+                else:
+                    seed_new = None
+
+                grid = Random(parameters_random=self.problem.parameters_random,
+                              n_grid=n_samples - n_stored,
+                              options={"seed": seed_new})
+                coords_new = grid.coords
+                coords_norm_new = grid.coords_norm
+
+            # Evaluate original model at new grid points
+            com = Computation(n_cpu=n_cpu, matlab_model=self.problem.model.matlab_model)
+            results_new = com.run(model=self.problem.model, problem=self.problem, coords=coords_new)
+
+            if results_new.ndim == 1:
+                results_new = results_new[:, np.newaxis]
+
+            coords = np.vstack((coords, coords_new))
+            coords_norm = np.vstack((coords_norm, coords_norm_new))
+            results = results_new if results is None else np.vstack((results, results_new))
+
+            # write extended validation set back to the store
+            with h5py.File(fname, 'a') as f:
+                if folder in f:
+                    del f[folder]
+
+            self.grid = Grid(parameters_random=self.problem.parameters_random, coords=coords, coords_norm=coords_norm)
+            self.results = results
+            self.gradient_results = None
+            self.gradient_idx = None
+            self.write(fname=fname, folder=folder)
+
+        self.grid = Random(parameters_random=self.problem.parameters_random,
+                           coords=coords[:n_samples, :],
+                           coords_norm=coords_norm[:n_samples, :])
+        self.results = results[:n_samples, :]
+        self.gradient_results = None
+        self.gradient_idx = None
+
+        return self
+
     def write(self, fname, folder=None, overwrite=False):
         """
         Save ValidationSet in .hdf5 format
@@ -13,6 +13,7 @@ from .Problem import *
 from .Algorithm import *
 from .TestBench import *
 from .validation import *
+from .sparse_solver import *
 from .Visualization import *
 from .postprocessing import *
 from .RandomParameter import *
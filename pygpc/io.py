@@ -8,6 +8,7 @@ import inspect
 import logging
 import numpy as np
 from .misc import is_instance
+from .misc import get_state
 from collections import OrderedDict
 from importlib import import_module
 
@@ -417,9 +418,22 @@ def read_basis_from_hdf5(fn_hdf5, folder, verbose=False):
     # initialize basis
     basis = b(**args_dict)
 
-    # write content in self
+    # compact representation (multi-indices and tables of the univariate basis functions)
+    if "b" not in basis_dict:
+        for key in basis_dict:
+            if key not in ["b_id", "multi_indices_idx"]:
+                setattr(basis, key, basis_dict[key])
+
+        # empty parameter dicts of the basis functions are read as None
+        basis.basis_function_params = [dict() if p is None else p for p in basis.basis_function_params]
+        basis.b_id = [uuid.uuid4() for _ in range(basis.n_basis)]
+        basis.init_multi_indices_idx()
+
+        return basis
+
+    # write content in self (the basis functions and the derived attributes are restored by extend_basis)
     for key in basis_dict:
-        if key != "b":
+        if key not in ["b", "b_id", "b_array", "b_array_grad", "n_basis", "multi_indices", "multi_indices_idx"]:
             setattr(basis, key,  basis_dict[key])
 
     b = [[0 for _ in range(basis_dict["dim"])] for _ in range(basis_dict["n_basis"])]
@@ -827,13 +841,14 @@ def write_dict_to_hdf5(fn_hdf5, data, folder, verbose=False):
                 f[str(folder)].attrs.__setitem__("dtype", dt)
 
             # write content
-            for key in data.__dict__:
+            state = get_state(data)
+            for key in state:
                 if len(folder.split("/")) >= max_recursion_depth:
-                    data.__dict__[key] = "None"
+                    state[key] = "None"
 
                 write_arr_to_hdf5(fn_hdf5=fn_hdf5,
                                   arr_name=folder+"/"+key,
-                                  data=data.__dict__[key],
+                                  data=state[key],
                                   verbose=verbose)
 
     # mappingproxy (can not be saved)
@@ -958,7 +973,7 @@ def write_arr_to_hdf5(fn_hdf5, arr_name, data, overwrite_arr=True, verbose=False
                 f[str(arr_name)].attrs.__setitem__("dtype", dt)
 
             write_dict_to_hdf5(fn_hdf5=fn_hdf5,
-                               data=data.__dict__,
+                               data=get_state(data),
                                folder=arr_name,
                                verbose=verbose)
             return
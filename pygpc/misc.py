@@ -71,6 +71,27 @@ def is_instance(obj):
         return False
 
 
+def get_state(obj):
+    """
+    Returns the attributes of a class instance, which are saved (e.g. in .hdf5 files). If the class defines
+    __getstate__ (like Basis), its state is returned, otherwise obj.__dict__.
+
+    Parameters
+    ----------
+    obj : any
+        Class instance
+
+    Returns
+    -------
+    state : dict
+        Attributes of the class instance
+    """
+    if getattr(type(obj), "__getstate__", None) is not getattr(object, "__getstate__", None):
+        return obj.__getstate__()
+    else:
+        return obj.__dict__
+
+
 def display_fancy_bar(text, i, n_i, more_text=None):
     """
     Display a simple progress bar. Call in each iteration and start with i=1.
@@ -0,0 +1,418 @@
+import numpy as np
+import multiprocessing
+import scipy.sparse.linalg
+from sklearn import linear_model
+
+
+def omp(matrix, results, n_coeffs_sparse=None, tol=None, n_elements_max=2**24):
+    """
+    Orthogonal Matching Pursuit (OMP) for multiple outputs (Batch-OMP [1]). The Gram matrix Psi^T Psi and the
+    correlations Psi^T Y are determined only once. In every iteration, the basis function with the highest
+    (normalized) correlation to the residual is selected for every output, and the least squares solutions on the
+    selected basis functions are determined for all outputs at once by progressive updates of the inverse Cholesky
+    factors of the Gram matrices of the selected basis functions.
+
+    coeffs = omp(matrix, results, n_coeffs_sparse=None, tol=None)
+
+    Parameters
+    ----------
+    matrix : ndarray of float [n_samples x n_basis]
+        GPC matrix
+    results : ndarray of float [n_samples x n_out] or [n_samples]
+        Results of the model evaluations
+    n_coeffs_sparse : int, optional, default: min(n_samples, n_basis)
+        Maximum number of gPC coefficients != 0 of each output
+    tol : float, optional, default: None
+        Relative residual ||Y - Psi * coeffs|| / ||Y|| of each output at which the iterations are stopped (values
+        below sqrt(n_basis * eps) are limited by the rounding errors of the residual)
+    n_elements_max : int, optional, default: 2**24
+        Maximum number of elements of the intermediate arrays (the outputs are processed in chunks)
+
+    Returns
+    -------
+    coeffs : ndarray of float [n_basis x n_out]
+        GPC coefficients
+
+    Notes
+    -----
+    .. [1] Rubinstein, R., Zibulevsky, M., & Elad, M. (2008). Efficient implementation of the K-SVD algorithm using
+       batch orthogonal matching pursuit. Technion, CS Technical Report, 40(8), 1-15.
+    """
+    if results.ndim == 1:
+        results = results[:, np.newaxis]
+
+    n_coeffs_max = min(matrix.shape)
+
+    if n_coeffs_sparse is None:
+        n_coeffs_sparse = n_coeffs_max
+    n_coeffs_sparse = max(0, min(int(n_coeffs_sparse), n_coeffs_max))
+
+    gram = np.matmul(matrix.transpose(), matrix)
+    correlation = np.matmul(matrix.transpose(), results)
+    results_norm2 = np.sum(results ** 2, axis=0)
+
+    coeffs = np.zeros((matrix.shape[1], results.shape[1]), dtype=np.result_type(matrix, results))
+
+    if n_coeffs_sparse == 0:
+        return coeffs
+
+    # process outputs in chunks to limit the memory of the intermediate arrays
+    n_chunk = max(1, int(n_elements_max / (matrix.shape[1] * n_coeffs_sparse)))
+
+    for i_start in range(0, results.shape[1], n_chunk):
+        i_stop = min(i_start + n_chunk, results.shape[1])
+
+        idx, gamma = omp_gram(gram=gram,
+                              correlation=correlation[:, i_start:i_stop],
+                              results_norm2=results_norm2[i_start:i_stop],
+                              n_coeffs_sparse=n_coeffs_sparse,
+                              tol=tol)
+
+        i_out = np.arange(i_start, i_stop)[:, np.newaxis]
+        mask = idx >= 0
+        coeffs[idx[mask], np.broadcast_to(i_out, idx.shape)[mask]] = gamma[mask]
+
+    return coeffs
+
+
+def omp_gram(gram, correlation, results_norm2, n_coeffs_sparse, tol=None):
+    """
+    Batch-OMP kernel operating on the Gram matrix and the correlations of the outputs (see omp).
+
+    idx, gamma = omp_gram(gram, correlation, results_norm2, n_coeffs_sparse, tol=None)
+
+    Parameters
+    ----------
+    gram : ndarray of float [n_basis x n_basis]
+        Gram matrix Psi^T Psi
+    correlation : ndarray of float [n_basis x n_out]
+        Correlations Psi^T Y of the basis functions and the outputs
+    results_norm2 : ndarray of float [n_out]
+        Squared norms of the outputs ||Y||^2
+    n_coeffs_sparse : int
+        Maximum number of gPC coefficients != 0 of each output
+    tol : float, optional, default: None
+        Relative residual of each output at which the iterations are stopped
+
+    Returns
+    -------
+    idx : ndarray of int [n_out x n_coeffs_sparse]
+        Indices of the selected basis functions of each output (-1 if not selected)
+    gamma : ndarray of float [n_out x n_coeffs_sparse]
+        Coefficients of the selected basis functions of each output
+    """
+    n_basis, n_out = correlation.shape
+
+    norm = np.sqrt(np.diag(gram)).copy()
+    norm[norm == 0] = np.inf
+
+    idx = -np.ones((n_out, n_coeffs_sparse), dtype=int)
+    gamma = np.zeros((n_out, n_coeffs_sparse), dtype=correlation.dtype)
+
+    # inverse of the lower Cholesky factors of the Gram matrices of the selected basis functions
+    l_inv = np.zeros((n_out, n_coeffs_sparse, n_coeffs_sparse), dtype=correlation.dtype)
+
+    # correlations of the basis functions and the residuals
+    correlation_res = correlation.copy()
+
+    active = results_norm2 > 0
+
+    for k in range(n_coeffs_sparse):
+        i_out = np.where(active)[0]
+
+        if len(i_out) == 0:
+            break
+
+        idx_k = idx[i_out, :k]
+
+        # select basis functions with the highest correlation to the residual (skip selected ones)
+        score = np.abs(correlation_res[:, i_out]) / norm[:, np.newaxis]
+        score[idx_k.transpose(), np.arange(len(i_out))[np.newaxis, :]] = -np.inf
+        i_new = np.argmax(score, axis=0)
+
+        # progressive update of the inverse Cholesky factor: L_new = [[L, 0], [w^T, d]]
+        w = np.matmul(l_inv[i_out, :k, :k], gram[idx_k, i_new[:, np.newaxis]][:, :, np.newaxis])[:, :, 0]
+        d2 = gram[i_new, i_new] - np.sum(w ** 2, axis=1)
+
+        # selected basis function is linearly dependent on the previously selected ones
+        independent = d2 > n_basis * np.finfo(gram.dtype).eps * gram[i_new, i_new]
+        active[i_out[~independent]] = False
+
+        i_out, i_new, w, d2 = i_out[independent], i_new[independent], w[independent], d2[independent]
+
+        if len(i_out) == 0:
+            break
+
+        i_out_col = i_out[:, np.newaxis]
+        d = np.sqrt(d2)
+
+        l_inv[i_out, k, :k] = -np.matmul(w[:, np.newaxis, :], l_inv[i_out, :k, :k])[:, 0, :] / d[:, np.newaxis]
+        l_inv[i_out, k, k] = 1 / d
+        idx[i_out, k] = i_new
+
+        # least squares solution on the selected basis functions: gamma = L^-T L^-1 Psi_I^T y
+        idx_k = idx[i_out, :k + 1]
+        correlation_k = correlation[idx_k, i_out_col]
+        l_inv_k = l_inv[i_out, :k + 1, :k + 1]
+        z = np.matmul(l_inv_k, correlation_k[:, :, np.newaxis])
+        gamma[i_out, :k + 1] = np.matmul(np.transpose(l_inv_k, (0, 2, 1)), z)[:, :, 0]
+
+        # correlations with the new residuals: Psi^T r = Psi^T y - G_I gamma
+        correlation_res[:, i_out] = correlation[:, i_out] - \
+            np.einsum("bok,ok->bo", gram[:, idx_k], gamma[i_out, :k + 1])
+
+        # residuals: ||r||^2 = ||y||^2 - gamma^T Psi_I^T y (accurate down to the rounding errors of ||y||^2)
+        if tol is not None:
+            residual2 = results_norm2[i_out] - np.sum(gamma[i_out, :k + 1] * correlation_k, axis=1)
+            tol2 = max(tol ** 2, n_basis * np.finfo(gram.dtype).eps)
+            active[i_out[residual2 <= tol2 * results_norm2[i_out]]] = False
+
+    return idx, gamma
+
+
+def lsqr(matrix, results, coeffs_init=None, atol=1e-10, btol=1e-10, conlim=1e8, iter_lim=None):
+    """
+    Iterative least squares solution min ||Y - Psi * coeffs|| for multiple outputs by LSQR [1]. The LSQR iterations of
+    all outputs are performed jointly, such that every iteration requires one product Psi * V and one product
+    Psi^T * U with the matrices of the Lanczos vectors of all outputs (e.g. one pass over a matrix-free gPC matrix,
+    see GPCMatrixOperator). The scalars of the bidiagonalization, the stopping criteria and the iterates are
+    determined for every output separately (as in scipy.sparse.linalg.lsqr). The iterates of converged outputs are
+    not changed anymore.
+
+    coeffs = lsqr(matrix, results, coeffs_init=None, atol=1e-10, btol=1e-10, conlim=1e8, iter_lim=None)
+
+    Parameters
+    ----------
+    matrix : ndarray of float or LinearOperator [n_samples x n_basis]
+        GPC matrix
+    results : ndarray of float [n_samples x n_out] or [n_samples]
+        Results of the model evaluations
+    coeffs_init : ndarray of float [n_basis x n_out], optional, default: None
+        Initial values of the gPC coefficients
+    atol : float, optional, default: 1e-10
+        Stopping tolerance of the relative residual of the normal equations ||Psi^T r|| / (||Psi|| ||r||)
+    btol : float, optional, default: 1e-10
+        Stopping tolerance of the relative residual ||r|| / ||Y||
+    conlim : float, optional, default: 1e8
+        Iterations are stopped if the estimated condition number of Psi exceeds conlim
+    iter_lim : int, optional, default: 2 * n_basis
+        Maximum number of iterations
+
+    Returns
+    -------
+    coeffs : ndarray of float [n_basis x n_out]
+        GPC coefficients
+
+    Notes
+    -----
+    .. [1] Paige, C. C., & Saunders, M. A. (1982). LSQR: An algorithm for sparse linear equations and sparse least
+       squares. ACM Transactions on Mathematical Software, 8(1), 43-71.
+    """
+    matrix = scipy.sparse.linalg.aslinearoperator(matrix)
+
+    if results.ndim == 1:
+        results = results[:, np.newaxis]
+
+    n_basis, n_out = matrix.shape[1], results.shape[1]
+    eps = np.finfo(float).eps
+
+    if iter_lim is None:
+        iter_lim = 2 * n_basis
+
+    if coeffs_init is None:
+        coeffs = np.zeros((n_basis, n_out))
+        u = np.array(results, dtype=float)
+    else:
+        coeffs = np.array(coeffs_init, dtype=float).reshape(n_basis, n_out)
+        u = results - matrix.matmat(coeffs)
+
+    def normalize(x):
+        x_norm = np.linalg.norm(x, axis=0)
+        x[:, x_norm > 0] /= x_norm[x_norm > 0]
+        return x_norm
+
+    # Golub-Kahan bidiagonalization of all outputs
+    beta = normalize(u)
+    v = matrix.rmatmat(u)
+    alpha = normalize(v)
+
+    w = v.copy()
+    phibar = beta.copy()
+    rhobar = alpha.copy()
+    b_norm = beta.copy()
+    a_norm = np.zeros(n_out)
+    dd_norm = np.zeros(n_out)
+
+    # outputs which are solved exactly by the initial values
+    active = alpha * beta > 0
+
+    for _ in range(iter_lim):
+        if not active.any():
+            break
+
+        u = matrix.matmat(v) - alpha * u
+        beta = normalize(u)
+        a_norm = np.sqrt(a_norm ** 2 + alpha ** 2 + beta ** 2)
+
+        v = matrix.rmatmat(u) - beta * v
+        alpha = normalize(v)
+
+        # plane rotation eliminating the subdiagonal element beta of the lower bidiagonal matrix
+        rho = np.sqrt(rhobar ** 2 + beta ** 2)
+        rho[rho == 0] = 1
+        cs = rhobar / rho
+        sn = beta / rho
+        theta = sn * alpha
+        rhobar = -cs * alpha
+        phi = cs * phibar
+        phibar = sn * phibar
+        tau = sn * phi
+
+        # update of the iterates of the active outputs
+        coeffs[:, active] += (phi / rho)[active] * w[:, active]
+        dd_norm[active] += np.sum((w[:, active] / rho[active]) ** 2, axis=0)
+        w = v - (theta / rho) * w
+
+        # stopping criteria
+        x_norm = np.linalg.norm(coeffs, axis=0)
+        r_norm = phibar
+        ar_norm = alpha * np.abs(tau)
+        test1 = r_norm / b_norm
+        test2 = ar_norm / (a_norm * r_norm + eps)
+        test3 = 1 / (a_norm * np.sqrt(dd_norm) + eps)
+        rtol = btol + atol * a_norm * x_norm / b_norm
+
+        active &= ~((test1 <= rtol) | (test2 <= atol) | (test3 <= 1 / conlim) | (1 + test2 <= 1) | (alpha == 0))
+
+    return coeffs
+
+
+def lars_lasso(matrix, results, alpha, coeffs_init=None, n_cpu=None, n_folds=5):
+    """
+    Lasso regression min 1 / (2 * n_samples) * ||Y - Psi * coeffs||^2 + alpha * ||coeffs||_1 for multiple outputs.
+    The outputs are split into blocks, which are solved in parallel by a pool of n_cpu processes. Without initial
+    values, the solutions are determined by Least-Angle Regression (LassoLars) using the Gram matrix, which is
+    computed only once for all outputs of a block. If initial values of the coefficients are given (e.g. the solution
+    of the previous iteration of an adaptive algorithm), the same problem is solved by coordinate descent (Lasso)
+    starting from the initial values (warm start), which converges in a few iterations if the active set of basis
+    functions did not change much. With alpha="cv", every output determines its own regularization parameter by
+    K-fold cross validation along the LARS path (LassoLarsCV).
+
+    coeffs, alpha = lars_lasso(matrix, results, alpha, coeffs_init=None, n_cpu=None, n_folds=5)
+
+    Parameters
+    ----------
+    matrix : ndarray of float [n_samples x n_basis]
+        GPC matrix
+    results : ndarray of float [n_samples x n_out] or [n_samples]
+        Results of the model evaluations
+    alpha : float, ndarray of float [n_out] or str
+        Regularization parameter (of each output) or "cv" to determine it for each output by cross validation
+    coeffs_init : ndarray of float [n_basis x n_out], optional, default: None
+        Initial values of the gPC coefficients (warm start, ignored if alpha="cv")
+    n_cpu : int, optional, default: None
+        Number of processes to solve the outputs in parallel (if None, in the current process)
+    n_folds : int, optional, default: 5
+        Number of folds of the cross validation (alpha="cv")
+
+    Returns
+    -------
+    coeffs : ndarray of float [n_basis x n_out]
+        GPC coefficients
+    alpha : ndarray of float [n_out]
+        Regularization parameters of the outputs
+    """
+    if results.ndim == 1:
+        results = results[:, np.newaxis]
+
+    n_out = results.shape[1]
+
+    if not isinstance(alpha, str):
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_out,))
+
+    if n_cpu is not None and n_cpu > 1 and n_out > 1:
+        idx_blocks = np.array_split(np.arange(n_out), min(n_cpu, n_out))
+    else:
+        idx_blocks = [np.arange(n_out)]
+
+    args = [(matrix,
+             results[:, idx],
+             alpha if isinstance(alpha, str) else alpha[idx],
+             coeffs_init[:, idx] if coeffs_init is not None else None,
+             n_folds) for idx in idx_blocks]
+
+    if len(idx_blocks) > 1:
+        with multiprocessing.Pool(len(idx_blocks)) as pool:
+            out = pool.starmap(lars_lasso_block, args)
+    else:
+        out = [lars_lasso_block(*args[0])]
+
+    coeffs = np.hstack([o[0] for o in out])
+    alpha = np.hstack([o[1] for o in out])
+
+    return coeffs, alpha
+
+
+def lars_lasso_block(matrix, results, alpha, coeffs_init=None, n_folds=5):
+    """
+    Worker function of lars_lasso to solve a block of outputs (called by multiprocessing.pool).
+
+    coeffs, alpha = lars_lasso_block(matrix, results, alpha, coeffs_init=None, n_folds=5)
+
+    Parameters
+    ----------
+    matrix : ndarray of float [n_samples x n_basis]
+        GPC matrix
+    results : ndarray of float [n_samples x n_out]
+        Results of the model evaluations
+    alpha : ndarray of float [n_out] or str
+        Regularization parameters of the outputs or "cv" to determine them by cross validation
+    coeffs_init : ndarray of float [n_basis x n_out], optional, default: None
+        Initial values of the gPC coefficients (warm start, ignored if alpha="cv")
+    n_folds : int, optional, default: 5
+        Number of folds of the cross validation (alpha="cv")
+
+    Returns
+    -------
+    coeffs : ndarray of float [n_basis x n_out]
+        GPC coefficients
+    alpha : ndarray of float [n_out]
+        Regularization parameters of the outputs
+    """
+    coeffs = np.zeros((matrix.shape[1], results.shape[1]))
+
+    # regularization parameter of each output by cross validation along the LARS path
+    if isinstance(alpha, str):
+        if alpha != "cv":
+            raise ValueError("Please specify a float or 'cv' as alpha of the LarsLasso solver!")
+
+        alpha = np.zeros(results.shape[1])
+
+        for i_out in range(results.shape[1]):
+            reg = linear_model.LassoLarsCV(fit_intercept=False, cv=n_folds)
+            reg.fit(matrix, results[:, i_out])
+            coeffs[:, i_out] = reg.coef_
+            alpha[i_out] = reg.alpha_
+
+        return coeffs, alpha
+
+    # Gram matrix is shared by all outputs (and all regularization parameters)
+    gram = np.matmul(matrix.transpose(), matrix)
+
+    alpha_unique, idx_alpha = np.unique(alpha, return_inverse=True)
+
+    for i_alpha, alpha_i in enumerate(alpha_unique):
+        i_out = np.where(idx_alpha == i_alpha)[0]
+
+        if coeffs_init is None:
+            reg = linear_model.LassoLars(alpha=alpha_i, fit_intercept=False, precompute=gram)
+        else:
+            # coordinate descent starting from the initial values
+            reg = linear_model.Lasso(alpha=alpha_i, fit_intercept=False, precompute=gram, warm_start=True,
+                                     tol=1e-8, max_iter=10000)
+            reg.coef_ = coeffs_init[:, i_out].transpose().copy()
+
+        reg.fit(matrix, results[:, i_out])
+        coeffs[:, i_out] = reg.coef_.reshape(len(i_out), matrix.shape[1]).transpose()
+
+    return coeffs, np.array(alpha)
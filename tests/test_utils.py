@@ -2,6 +2,8 @@ import os
 import sys
 import copy
 import time
+import pickle
+import copyreg
 import h5py
 import pygpc
 import shutil
@@ -190,14 +192,14 @@ class TestPygpcMethods(unittest.TestCase):
 
     def test_utils_003_backends(self):
         """
-        Test the different backends ["python", "cpu", "omp", "cuda"]
+        Test the different backends ["python", "threads", "cpu", "omp", "cuda"]
         """
 
         global folder, gpu
         test_name = "test_utils_003_backends"
         print(test_name)
 
-        backends = ["python", "cpu", "omp", "cuda"]
+        backends = ["python", "threads", "cpu", "omp", "cuda"]
 
         # define model
         model = pygpc.testfunctions.Peaks()
@@ -402,6 +404,1462 @@ class TestPygpcMethods(unittest.TestCase):
 
         print("done!\n")
 
+    def test_utils_005_update_gpc_matrix(self):
+        """
+        Test the incremental update of the gPC matrices after adding and deleting grid points and basis functions
+        """
+
+        global folder, gpu
+        test_name = "test_utils_005_update_gpc_matrix"
+        print(test_name)
+
+        # define model
+        model = pygpc.testfunctions.Peaks()
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = 1.25
+        parameters["x3"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(model, parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["order"] = [5, 5]
+        options["order_max"] = 5
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["gradient_enhanced"] = True
+
+        for b in ["python", "cpu", "omp"]:
+            options["backend"] = b
+
+            # setup gPC
+            gpc = pygpc.Reg(
+                problem=problem,
+                order=[5, 5],
+                order_max=5,
+                order_max_norm=1,
+                interaction_order=2,
+                interaction_order_current=2,
+                options=options,
+                validation=None,
+            )
+
+            gpc.grid = pygpc.Random(
+                parameters_random=problem.parameters_random, n_grid=30, options={"seed": 1}
+            )
+            gpc.init_gpc_matrix(gradient_idx=np.arange(0, 30, 2))
+
+            # modify grid and basis
+            gpc.grid.extend_random_grid(n_grid_new=50)
+            gpc.grid.delete(idx=np.array([1, 4]))
+            gpc.basis.extend_basis(
+                [[problem.parameters_random["x1"].init_basis_function(order=6),
+                  problem.parameters_random["x3"].init_basis_function(order=0)],
+                 [problem.parameters_random["x1"].init_basis_function(order=0),
+                  problem.parameters_random["x3"].init_basis_function(order=6)]]
+            )
+            gradient_idx = np.arange(0, 48, 3)
+
+            # update gPC matrices and compare to newly initialized ones
+            gpc.update_gpc_matrix(gradient_idx=gradient_idx)
+            gpc_matrix_updated = copy.deepcopy(gpc.gpc_matrix)
+            gpc_matrix_gradient_updated = copy.deepcopy(gpc.gpc_matrix_gradient)
+
+            gpc.init_gpc_matrix(gradient_idx=gradient_idx)
+
+            self.expect_isclose(
+                gpc_matrix_updated,
+                gpc.gpc_matrix,
+                atol=1e-12,
+                msg="updated gpc matrix ({}) differs from initialized one".format(b),
+            )
+
+            self.expect_isclose(
+                gpc_matrix_gradient_updated,
+                gpc.gpc_matrix_gradient,
+                atol=1e-12,
+                msg="updated gpc gradient matrix ({}) differs from initialized one".format(b),
+            )
+
+        print("done!\n")
+
+    def test_utils_006_get_approximation_blocks(self):
+        """
+        Test the blockwise evaluation of the gPC approximation (get_approximation and get_approximation_blocks)
+        in double and single precision
+        """
+
+        global folder, gpu
+        test_name = "test_utils_006_get_approximation_blocks"
+        print(test_name)
+
+        # define model
+        model = pygpc.testfunctions.Peaks()
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = 1.25
+        parameters["x3"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(model, parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["order"] = [5, 5]
+        options["order_max"] = 5
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+
+        # setup gPC
+        gpc = pygpc.Reg(
+            problem=problem,
+            order=[5, 5],
+            order_max=5,
+            order_max_norm=1,
+            interaction_order=2,
+            interaction_order_current=2,
+            options=options,
+            validation=None,
+        )
+
+        np.random.seed(1)
+        coeffs = np.random.rand(gpc.basis.n_basis, 3)
+        x = np.random.rand(1001, 2) * 2 - 1
+
+        # evaluate gPC in one block and in several blocks
+        pce = gpc.get_approximation(coeffs, x, block_size=x.shape[0])
+        pce_blocks = gpc.get_approximation(coeffs, x, block_size=64)
+        pce_generator = np.vstack([p for p in gpc.get_approximation_blocks(coeffs, x, output_idx=[0, 2],
+                                                                           block_size=100)])
+
+        self.expect_isclose(
+            pce,
+            pce_blocks,
+            atol=1e-12,
+            msg="blockwise gPC approximation differs from the one evaluated at once",
+        )
+
+        self.expect_isclose(
+            pce[:, [0, 2]],
+            pce_generator,
+            atol=1e-12,
+            msg="gPC approximation of generator differs from the one evaluated at once",
+        )
+
+        # evaluate gPC in single precision
+        gpc.dtype = "float32"
+        pce_float32 = gpc.get_approximation(coeffs, x, block_size=64)
+
+        self.expect_true(
+            pce_float32.dtype == np.float32,
+            msg="gPC approximation is not evaluated in single precision",
+        )
+
+        self.expect_isclose(
+            pce,
+            pce_float32,
+            atol=1e-4,
+            rtol=1e-4,
+            msg="gPC approximation in single precision differs from the one in double precision",
+        )
+
+        print("done!\n")
+
+    def test_utils_007_sparse_approximation(self):
+        """
+        Test the evaluation of sparse gPC expansions using a reduced basis
+        """
+
+        global folder, gpu
+        test_name = "test_utils_007_sparse_approximation"
+        print(test_name)
+
+        # define model
+        model = pygpc.testfunctions.Peaks()
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = 1.25
+        parameters["x3"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(model, parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "OMP"
+        options["settings"] = None
+        options["order"] = [8, 8]
+        options["order_max"] = 8
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+        options["sparse_tol"] = None
+
+        # setup gPC
+        gpc = pygpc.Reg(
+            problem=problem,
+            order=[8, 8],
+            order_max=8,
+            order_max_norm=1,
+            interaction_order=2,
+            interaction_order_current=2,
+            options=options,
+            validation=None,
+        )
+
+        # sparse coefficients
+        coeffs = np.zeros((gpc.basis.n_basis, 2))
+        coeffs[[0, 3, 7, 20], 0] = [1.0, 0.5, -0.2, 1e-6]
+        coeffs[[0, 5], 1] = [0.3, 2.0]
+        x = np.random.rand(500, 2) * 2 - 1
+
+        pce = gpc.get_approximation(coeffs, x)
+
+        # skip basis functions with zero coefficients (exact)
+        gpc.sparse_tol = 0.
+        pce_sparse = gpc.get_approximation(coeffs, x)
+
+        self.expect_true(
+            (gpc.sparse_basis_idx == np.array([0, 3, 5, 7, 20])).all(),
+            msg="wrong basis functions in sparse basis",
+        )
+
+        self.expect_isclose(
+            pce,
+            pce_sparse,
+            atol=1e-12,
+            msg="sparse gPC approximation differs from full one",
+        )
+
+        # neglect small coefficients
+        gpc.sparse_tol = 1e-3
+        pce_truncated = gpc.get_approximation(coeffs, x)
+
+        self.expect_isclose(
+            gpc.sparse_basis_error,
+            np.array([1e-6, 0]),
+            atol=1e-12,
+            msg="wrong truncation error bound of sparse basis",
+        )
+
+        self.expect_isclose(
+            pce,
+            pce_truncated,
+            atol=1e-4,
+            msg="truncated gPC approximation differs from full one",
+        )
+
+        print("done!\n")
+
+    def test_utils_008_tensor_gpc_matrix(self):
+        """
+        Test the construction of the gPC matrix on tensor grids using Kronecker products of 1D tables
+        """
+
+        global folder, gpu
+        test_name = "test_utils_008_tensor_gpc_matrix"
+        print(test_name)
+
+        # define model
+        model = pygpc.testfunctions.Peaks()
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = 1.25
+        parameters["x3"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(model, parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "quad"
+        options["solver"] = "NumInt"
+        options["settings"] = None
+        options["order"] = [6, 6]
+        options["order_max"] = 6
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+
+        # setup gPC
+        gpc = pygpc.Quad(
+            problem=problem,
+            order=[6, 6],
+            order_max=6,
+            order_max_norm=1,
+            interaction_order=2,
+            interaction_order_current=2,
+            options=options,
+            validation=None,
+        )
+
+        # tensor grid with shuffled grid points
+        grid = pygpc.TensorGrid(
+            parameters_random=problem.parameters_random,
+            options={"grid_type": ["jacobi", "jacobi"], "n_dim": [7, 5]},
+        )
+        grid.coords_norm = grid.coords_norm[np.random.permutation(grid.coords_norm.shape[0]), :]
+        x = grid.coords_norm
+
+        knots_dim_list, _ = gpc.get_tensor_knots(x)
+
+        self.expect_true(
+            knots_dim_list is not None,
+            msg="tensor structure of grid not detected",
+        )
+
+        # construct gPC matrices point by point
+        gpc_matrix_ref = np.vstack([gpc.create_gpc_matrix(gpc.basis.b, x[i:i+1, :]) for i in range(x.shape[0])])
+        gpc_matrix_gradient_ref = np.vstack([gpc.create_gpc_matrix(gpc.basis.b, x[i:i+1, :], gradient=True,
+                                                                   gradient_idx=np.array([0]))
+                                             for i in range(x.shape[0])])
+
+        # construct gPC matrices of the grid at once (tensor structure, 1D tables evaluated by the backend)
+        gpc.grid = grid
+
+        for backend in ["python", "cpu", "omp"]:
+            gpc.backend = backend
+            gpc.grid_tensor_knots = None
+
+            gpc_matrix = gpc.create_gpc_matrix(gpc.basis.b, x)
+            grid_tensor_knots = gpc.grid_tensor_knots
+            gpc_matrix_gradient = gpc.create_gpc_matrix(gpc.basis.b, x, gradient=True,
+                                                        gradient_idx=np.arange(x.shape[0]))
+
+            self.expect_true(
+                grid_tensor_knots is not None and grid_tensor_knots[2] is not None,
+                msg="tensor structure of grid not detected ({} backend)".format(backend),
+            )
+
+            self.expect_true(
+                gpc.grid_tensor_knots is grid_tensor_knots,
+                msg="tensor structure of grid detected again ({} backend)".format(backend),
+            )
+
+            self.expect_isclose(
+                gpc_matrix,
+                gpc_matrix_ref,
+                atol=1e-10,
+                msg="gpc matrix of tensor grid differs from point-wise evaluation ({} backend)".format(backend),
+            )
+
+            self.expect_isclose(
+                gpc_matrix_gradient,
+                gpc_matrix_gradient_ref,
+                atol=1e-10,
+                msg="gpc gradient matrix of tensor grid differs from point-wise evaluation ({} backend)".format(
+                    backend),
+            )
+
+        # changed grid points are detected again
+        gpc.grid.coords_norm = gpc.grid.coords_norm[1:, :]
+        gpc.grid.coords_id = gpc.grid.coords_id[1:]
+        gpc.create_gpc_matrix(gpc.basis.b, gpc.grid.coords_norm)
+
+        self.expect_true(
+            gpc.grid_tensor_knots[2] is None,
+            msg="tensor structure of grid with deleted grid point detected",
+        )
+
+        print("done!\n")
+
+    def test_utils_009_matrix_cache(self):
+        """
+        Test the persistent on-disk cache of gPC matrices
+        """
+
+        global folder, gpu
+        test_name = "test_utils_009_matrix_cache"
+        print(test_name)
+
+        # define model
+        model = pygpc.testfunctions.Peaks()
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = 1.25
+        parameters["x3"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(model, parameters)
+
+        matrix_cache_dir = os.path.join(folder, test_name)
+        shutil.rmtree(matrix_cache_dir, ignore_errors=True)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["order"] = [6, 6]
+        options["order_max"] = 6
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+        options["matrix_cache_dir"] = matrix_cache_dir
+
+        grid = pygpc.Random(
+            parameters_random=problem.parameters_random, n_grid=100, options={"seed": 1}
+        )
+
+        gpc_matrix = []
+
+        # the second gPC uses the matrices of the first one
+        for i in range(2):
+            gpc = pygpc.Reg(
+                problem=problem,
+                order=[6, 6],
+                order_max=6,
+                order_max_norm=1,
+                interaction_order=2,
+                interaction_order_current=2,
+                options=options,
+                validation=None,
+            )
+            gpc.grid = grid
+            gpc_matrix.append(gpc.create_gpc_matrix(gpc.basis.b, grid.coords_norm))
+
+        self.expect_true(
+            len(os.listdir(matrix_cache_dir)) == 1,
+            msg="gPC matrix was not stored in cache",
+        )
+
+        self.expect_isclose(
+            gpc_matrix[0],
+            gpc_matrix[1],
+            atol=1e-14,
+            msg="cached gpc matrix differs from original one",
+        )
+
+        # different coordinates and basis functions are stored separately
+        gpc.create_gpc_matrix(gpc.basis.b, grid.coords_norm[:50, :])
+        gpc.create_gpc_matrix(gpc.basis.b[:10], grid.coords_norm)
+
+        self.expect_true(
+            len(os.listdir(matrix_cache_dir)) == 3,
+            msg="gPC matrices with different keys were not stored separately",
+        )
+
+        # least recently used matrices are deleted if the cache is full
+        matrix_cache = pygpc.MatrixCache(path=matrix_cache_dir)
+        fn_subset = matrix_cache.get_fn(matrix_cache.get_key(gpc.basis.b[:10], grid.coords_norm))
+        matrix_cache.max_size = os.path.getsize(fn_subset)
+        matrix_cache.evict()
+
+        self.expect_true(
+            os.listdir(matrix_cache_dir) == [os.path.basename(fn_subset)],
+            msg="least recently used gPC matrices were not deleted",
+        )
+
+        print("done!\n")
+
+    def test_utils_010_basis_extension(self):
+        """
+        Test the extension of the basis using the hash index of the multi-indices
+        """
+
+        global folder, gpu
+        test_name = "test_utils_010_basis_extension"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Norm(pdf_shape=[0.5, 0.2])
+        parameters["x3"] = pygpc.Beta(pdf_shape=[2, 3], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Ishigami(), parameters)
+
+        basis = pygpc.Basis()
+        basis.init_basis_sgpc(
+            problem=problem,
+            order=[3, 3, 3],
+            order_max=3,
+            order_max_norm=1,
+            interaction_order=3,
+        )
+
+        # extend basis (contains all basis functions of the initial basis)
+        basis.set_basis_poly(
+            order=[5, 5, 5],
+            order_max=5,
+            order_max_norm=1,
+            interaction_order=3,
+            interaction_order_current=3,
+            problem=problem,
+        )
+
+        multi_indices_ref = pygpc.get_multi_indices(
+            order=[5, 5, 5],
+            order_max=5,
+            order_max_norm=1,
+            interaction_order=3,
+            interaction_order_current=3,
+        )
+
+        multi_indices = np.array([[_b_dim.p["i"] for _b_dim in _b] for _b in basis.b])
+
+        self.expect_true(
+            basis.n_basis == multi_indices_ref.shape[0] and len(basis.b_id) == basis.n_basis,
+            msg="number of basis functions after extension is wrong",
+        )
+
+        self.expect_true(
+            (multi_indices == basis.multi_indices).all()
+            and np.unique(multi_indices, axis=0).shape[0] == basis.n_basis,
+            msg="multi-indices of the basis are not consistent",
+        )
+
+        self.expect_isclose(
+            basis.b_array,
+            basis.get_basis_array(basis.b)[0],
+            atol=1e-14,
+            msg="polynomial coefficients of the basis are not consistent",
+        )
+
+        # duplicates are skipped
+        basis.add_basis_poly_by_order(multi_indices=multi_indices_ref[:5, :], problem=problem)
+        basis.extend_basis(basis.b[:3])
+
+        self.expect_true(
+            basis.n_basis == multi_indices_ref.shape[0],
+            msg="duplicate basis functions were added",
+        )
+
+        self.expect_true(
+            (basis.get_basis_idx(multi_indices[::-1, :]) == np.arange(basis.n_basis)[::-1]).all()
+            and basis.get_basis_idx(np.array([[6, 0, 0]]))[0] == -1,
+            msg="lookup of basis functions by multi-indices failed",
+        )
+
+        print("done!\n")
+
+    def test_utils_011_basis_compact(self):
+        """
+        Test the compact representation of the basis (multi-indices and tables of the univariate basis functions)
+        """
+
+        global folder, gpu
+        test_name = "test_utils_011_basis_compact"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Norm(pdf_shape=[0.5, 0.2])
+        parameters["x3"] = pygpc.Beta(pdf_shape=[2, 3], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Ishigami(), parameters)
+
+        basis = pygpc.Basis()
+        basis.init_basis_sgpc(
+            problem=problem,
+            order=[4, 4, 4],
+            order_max=4,
+            order_max_norm=1,
+            interaction_order=3,
+        )
+
+        x = np.random.uniform(-1, 1, (50, 3))
+
+        # univariate tables vs. BasisFunction objects
+        idx, tables, tables_der, idx_x = basis.get_univariate_tables(x=x, derivative=True)
+        psi = np.prod([tables[i_dim][idx_x[:, i_dim][:, np.newaxis], idx[:, i_dim][np.newaxis, :]]
+                       for i_dim in range(3)], axis=0)
+        psi_ref = np.prod([[[_b[i_dim](x[i_x, i_dim]) for _b in basis.b] for i_x in range(x.shape[0])]
+                           for i_dim in range(3)], axis=0)
+
+        self.expect_isclose(psi, psi_ref, atol=1e-12, msg="basis functions evaluated from the tables are wrong")
+
+        self.expect_isclose(
+            basis.b_norm,
+            np.array([[_b_dim.fun_norm for _b_dim in _b] for _b in basis.b]),
+            atol=1e-14,
+            msg="normalization factors from the tables are wrong",
+        )
+
+        # the BasisFunction objects are not saved and restored on demand
+        fn_hdf5 = os.path.join(folder, test_name + ".hdf5")
+        if os.path.exists(fn_hdf5):
+            os.remove(fn_hdf5)
+
+        pygpc.write_dict_to_hdf5(fn_hdf5=fn_hdf5, data=basis, folder="basis")
+
+        with h5py.File(fn_hdf5, "r") as f:
+            self.expect_true("b" not in f["basis"].keys(), msg="BasisFunction objects were saved")
+
+        for basis_restored in [pygpc.read_basis_from_hdf5(fn_hdf5=fn_hdf5, folder="basis"), copy.deepcopy(basis)]:
+            basis_restored.add_basis_poly_by_order(multi_indices=np.array([[5, 0, 0], [0, 6, 1]]), problem=problem)
+
+            self.expect_true(
+                basis_restored.n_basis == basis.n_basis + 2
+                and [_b_dim.p for _b_dim in basis_restored.b[-1]] == [{"p": 1, "q": 1, "i": 0},
+                                                                       {"i": 6},
+                                                                       {"p": 2, "q": 3, "i": 1}],
+                msg="restored basis can not be extended",
+            )
+
+            self.expect_isclose(
+                basis_restored.b_array,
+                basis.get_basis_array(basis_restored.b)[0],
+                atol=1e-14,
+                msg="polynomial coefficients of the restored basis are not consistent",
+            )
+
+        print("done!\n")
+
+    def test_utils_012_basis_function_tables(self):
+        """
+        Test the tables of the normalization factors and integrals of the basis functions of the random parameters
+        """
+
+        global folder, gpu
+        test_name = "test_utils_012_basis_function_tables"
+        print(test_name)
+
+        order_max = 8
+
+        for parameter, knots, weights in [
+            (pygpc.Beta(pdf_shape=[2.5, 1.5], pdf_limits=[0, 1]), *pygpc.get_quadrature_jacobi_1d(40, 1.5, 0.5)),
+            (pygpc.Norm(pdf_shape=[0.5, 0.2]), *pygpc.get_quadrature_hermite_1d(40)),
+            (pygpc.Gamma(pdf_shape=[2.5, 2., 0.]), *pygpc.get_quadrature_laguerre_1d(40, alpha=1.5))]:
+
+            fun_norm, fun_int, fun_der_int = parameter.get_basis_function_tables(order_max)
+            b = [parameter.init_basis_function(order=o) for o in range(order_max + 1)]
+
+            # reference: numerical integration with the corresponding quadrature
+            fun_norm_ref = [np.dot((b[o].fun * np.sqrt(b[o].fun_norm))(knots) ** 2, weights) / np.sum(weights)
+                            for o in range(order_max + 1)]
+            fun_der_int_ref = [np.dot(b[o](knots, derivative=True), weights) for o in range(order_max + 1)]
+
+            self.expect_isclose(fun_norm, fun_norm_ref, rtol=1e-8, atol=1e-10,
+                                msg="normalization factors of {} are wrong".format(type(b[0]).__name__))
+
+            self.expect_isclose(fun_int[1:], 0., atol=1e-12,
+                                msg="integrals of {} are wrong".format(type(b[0]).__name__))
+
+            self.expect_isclose(fun_der_int[1:], fun_der_int_ref[1:], rtol=1e-8, atol=1e-10,
+                                msg="integrals of the derivatives of {} are wrong".format(type(b[0]).__name__))
+
+            self.expect_true(all([b[o].fun_der_int == fun_der_int[o] for o in range(order_max + 1)]),
+                             msg="basis functions do not use the tables")
+
+            # the tables and basis functions are shared between all bases
+            self.expect_true(not fun_norm.flags.writeable, msg="shared tables are writeable")
+            self.expect_true(parameter.init_basis_function(order=order_max) is b[-1],
+                             msg="basis functions are not shared")
+
+        print("done!\n")
+
+    def test_utils_013_least_squares(self):
+        """
+        Test the least squares solver (QR decomposition with SVD fallback) against the pseudoinverse
+        """
+
+        global folder, gpu
+        test_name = "test_utils_013_least_squares"
+        print(test_name)
+
+        np.random.seed(1)
+
+        matrix_rank_deficient = np.random.rand(100, 10)
+        matrix_rank_deficient[:, 3] = 2 * matrix_rank_deficient[:, 2]
+
+        for matrix, method in [(np.random.rand(200, 50), "qr"),
+                               (np.random.rand(30, 60), "svd"),
+                               (matrix_rank_deficient, "svd")]:
+            results = np.random.rand(matrix.shape[0], 3)
+
+            lstsq = pygpc.LeastSquares(matrix)
+            coeffs = lstsq.solve(results)
+
+            self.expect_true(lstsq.method == method,
+                             msg="wrong factorization ({} instead of {})".format(lstsq.method, method))
+
+            self.expect_isclose(coeffs, np.matmul(np.linalg.pinv(matrix), results), atol=1e-10,
+                                msg="least squares solution ({}) differs from pseudoinverse".format(method))
+
+            self.expect_isclose(lstsq.solve(results[:, 0]), coeffs[:, 0], atol=1e-14,
+                                msg="least squares solution of 1D right hand side is wrong")
+
+        print("done!\n")
+
+    def test_utils_014_loocv_closed_form(self):
+        """
+        Test the closed form leave-one-out residuals (hat matrix) against repeated least squares fits
+        """
+
+        global folder, gpu
+        test_name = "test_utils_014_loocv_closed_form"
+        print(test_name)
+
+        np.random.seed(1)
+
+        matrix = np.random.rand(40, 10)
+        results = np.random.rand(40, 2)
+
+        loo_residuals = pygpc.LeastSquares(matrix).get_loo_residuals(results)
+
+        loo_residuals_ref = np.zeros(results.shape)
+        for i in range(matrix.shape[0]):
+            mask = np.arange(matrix.shape[0]) != i
+            coeffs = np.linalg.lstsq(matrix[mask, :], results[mask, :], rcond=None)[0]
+            loo_residuals_ref[i, :] = results[i, :] - np.matmul(matrix[i, :], coeffs)
+
+        self.expect_isclose(loo_residuals, loo_residuals_ref, atol=1e-10,
+                            msg="closed form leave-one-out residuals are wrong")
+
+        # samples with leverage 1 can not be predicted from the other samples
+        self.expect_true(pygpc.LeastSquares(matrix[:10, :]).get_loo_residuals(results[:10, :]) is None,
+                         msg="leave-one-out residuals of a square system should not exist")
+
+        print("done!\n")
+
+    def test_utils_015_least_squares_update(self):
+        """
+        Test the update of the QR decomposition for appended rows, appended columns and replaced rows
+        """
+
+        global folder, gpu
+        test_name = "test_utils_015_least_squares_update"
+        print(test_name)
+
+        np.random.seed(1)
+
+        matrix = np.random.rand(200, 30)
+        lstsq = pygpc.LeastSquares(matrix, row_id=list(range(200)), col_id=list(range(30)))
+
+        # append grid points and basis functions and replace (resample) grid points
+        matrix_new = np.hstack((np.vstack((matrix, np.random.rand(4, 30))), np.random.rand(204, 3)))
+        matrix_new[[5, 120], :] = np.random.rand(2, 33)
+        row_id = list(range(204))
+        row_id[5], row_id[120] = 1005, 1120
+        col_id = list(range(33))
+        results = np.random.rand(204, 2)
+
+        self.expect_true(lstsq.update(matrix_new, row_id=row_id, col_id=col_id),
+                         msg="QR decomposition was not updated")
+
+        self.expect_isclose(np.matmul(lstsq.q, lstsq.r), matrix_new, atol=1e-12,
+                            msg="updated QR decomposition is wrong")
+
+        self.expect_isclose(lstsq.solve(results), np.matmul(np.linalg.pinv(matrix_new), results), atol=1e-10,
+                            msg="least squares solution of updated QR decomposition is wrong")
+
+        # deleted rows require a new factorization
+        self.expect_true(not lstsq.update(matrix_new[1:, :], row_id=row_id[1:], col_id=col_id),
+                         msg="QR decomposition was updated for deleted rows")
+
+        # columns of the factorized matrix have to be kept
+        self.expect_true(not lstsq.update(matrix_new[:, 1:], row_id=row_id, col_id=col_id[1:]),
+                         msg="QR decomposition was updated for deleted columns")
+
+        print("done!\n")
+
+    def test_utils_016_omp(self):
+        """
+        Test the batched multi-output OMP solver against a sequential OMP for every output
+        """
+
+        global folder, gpu
+        test_name = "test_utils_016_omp"
+        print(test_name)
+
+        np.random.seed(1)
+
+        matrix = np.random.randn(100, 40)
+        coeffs_ref = np.zeros((40, 5))
+
+        for i_out in range(5):
+            coeffs_ref[np.random.permutation(40)[:i_out + 2], i_out] = np.random.rand(i_out + 2) + 0.5
+
+        results = np.matmul(matrix, coeffs_ref)
+
+        # sequential OMP for every output
+        coeffs_seq = np.zeros((40, 5))
+
+        for i_out in range(5):
+            idx = []
+            residual = results[:, i_out]
+            for k in range(8):
+                score = np.abs(np.matmul(matrix.transpose(), residual)) / np.linalg.norm(matrix, axis=0)
+                score[idx] = -np.inf
+                idx.append(np.argmax(score))
+                gamma = np.linalg.lstsq(matrix[:, idx], results[:, i_out], rcond=None)[0]
+                residual = results[:, i_out] - np.matmul(matrix[:, idx], gamma)
+            coeffs_seq[idx, i_out] = gamma
+
+        coeffs = pygpc.omp(matrix, results, n_coeffs_sparse=8, n_elements_max=100)
+
+        self.expect_isclose(coeffs, coeffs_seq, atol=1e-10, msg="batched OMP differs from sequential OMP")
+
+        # stop by residual tolerance recovers the sparse coefficients
+        coeffs = pygpc.omp(matrix, results, tol=1e-10)
+
+        self.expect_isclose(coeffs, coeffs_ref, atol=1e-8, msg="OMP with residual tolerance is wrong")
+        self.expect_true(((coeffs != 0) == (coeffs_ref != 0)).all(), msg="OMP selected wrong basis functions")
+
+        print("done!\n")
+
+    def test_utils_017_lars_lasso(self):
+        """
+        Test the LarsLasso solver with outputs split across processes, warm start and cross validated alpha
+        """
+
+        global folder, gpu
+        test_name = "test_utils_017_lars_lasso"
+        print(test_name)
+
+        from sklearn import linear_model
+
+        np.random.seed(1)
+
+        matrix = np.random.randn(200, 60)
+        coeffs_ref = np.zeros((60, 4))
+        coeffs_ref[:8, :] = np.random.randn(8, 4)
+        results = np.matmul(matrix, coeffs_ref) + 1e-3 * np.random.randn(200, 4)
+
+        reg = linear_model.LassoLars(alpha=1e-3, fit_intercept=False)
+        reg.fit(matrix, results)
+        coeffs_lars = reg.coef_.transpose()
+
+        # outputs split across processes
+        coeffs, alpha = pygpc.lars_lasso(matrix, results, alpha=1e-3, n_cpu=2)
+
+        self.expect_isclose(coeffs, coeffs_lars, atol=1e-10, msg="parallel LarsLasso differs from LassoLars")
+
+        # warm start from the solution of a smaller basis
+        coeffs_init = np.zeros((60, 4))
+        coeffs_init[:50, :] = coeffs_lars[:50, :]
+        coeffs, alpha = pygpc.lars_lasso(matrix, results, alpha=1e-3, coeffs_init=coeffs_init)
+
+        self.expect_isclose(coeffs, coeffs_lars, atol=1e-6, msg="warm started LarsLasso differs from LassoLars")
+
+        # regularization parameter of each output by cross validation
+        coeffs, alpha = pygpc.lars_lasso(matrix, results, alpha="cv", n_folds=5)
+
+        self.expect_true(alpha.shape == (4,) and (alpha >= 0).all(), msg="wrong regularization parameters")
+        self.expect_isclose(coeffs, coeffs_ref, atol=1e-2, msg="cross validated LarsLasso is wrong")
+
+        print("done!\n")
+
+    def test_utils_018_lsqr_matrix_free(self):
+        """
+        Test the LSQR/LSMR solver with the matrix-free gPC matrix against the least squares solution
+        """
+
+        global folder, gpu
+        test_name = "test_utils_018_lsqr_matrix_free"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "LSQR"
+        options["settings"] = None
+        options["order"] = [6, 6]
+        options["order_max"] = 6
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+        options["block_size"] = 17
+
+        gpc = pygpc.Reg(problem=problem, order=[6, 6], order_max=6, order_max_norm=1, interaction_order=2,
+                        interaction_order_current=2, options=options, validation=None)
+        gpc.grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=100, options={"seed": 1})
+
+        np.random.seed(1)
+        results = np.random.rand(100, 2)
+
+        # blockwise products
+        matrix = gpc.create_gpc_matrix(b=gpc.basis.b, x=gpc.grid.coords_norm)
+        operator = pygpc.GPCMatrixOperator(gpc=gpc, x=gpc.grid.coords_norm)
+
+        self.expect_isclose(operator.matmat(np.eye(gpc.basis.n_basis)), matrix, atol=1e-12,
+                            msg="matrix-free gPC matrix is wrong")
+        self.expect_isclose(operator.rmatmat(results), np.matmul(matrix.transpose(), results), atol=1e-12,
+                            msg="transposed matrix-free gPC matrix is wrong")
+
+        # the evaluated blocks are cached if the gPC matrix fits into memory_limit
+        operator_uncached = pygpc.GPCMatrixOperator(gpc=gpc, x=gpc.grid.coords_norm, cache=False)
+
+        self.expect_true(operator.blocks is not None and len(operator.blocks) == 6,
+                         msg="blocks of matrix-free gPC matrix were not cached")
+        self.expect_isclose(operator_uncached.matmat(np.eye(gpc.basis.n_basis)), matrix, atol=1e-12,
+                            msg="matrix-free gPC matrix without cache is wrong")
+        self.expect_true(operator_uncached.blocks is None, msg="blocks of matrix-free gPC matrix were cached")
+
+        # iterative solution without forming the gPC matrix
+        coeffs_ref = np.linalg.lstsq(matrix, results, rcond=None)[0]
+
+        for settings in [{"method": "lsqr"}, {"method": "lsmr", "precondition": False}, {"warm_start": True}]:
+            coeffs = gpc.solve(results=results, solver="LSQR", settings=settings)
+
+            self.expect_isclose(coeffs, coeffs_ref, atol=1e-6,
+                                msg="LSQR solution with settings {} is wrong".format(settings))
+
+        self.expect_true(gpc.gpc_matrix is None, msg="gPC matrix was formed by the matrix-free solver")
+
+        # iterative solution using the initialized gPC matrix
+        gpc.init_gpc_matrix()
+        coeffs = gpc.solve(results=results, solver="LSQR", settings={"method": "lsqr"})
+
+        self.expect_isclose(coeffs, coeffs_ref, atol=1e-6, msg="LSQR solution using the gPC matrix is wrong")
+
+        print("done!\n")
+
+    def test_utils_019_normal_equations(self):
+        """
+        Test the blockwise accumulation of the weighted normal equations against the least squares solution
+        """
+
+        global folder, gpu
+        test_name = "test_utils_019_normal_equations"
+        print(test_name)
+
+        np.random.seed(1)
+
+        matrix = np.random.rand(200, 30)
+        results = np.random.rand(200, 2)
+        weights = np.random.rand(200) + 0.5
+
+        normal_equations = pygpc.NormalEquations(n_basis=30)
+
+        for i_start in range(0, 200, 37):
+            normal_equations.add(matrix=matrix[i_start:i_start + 37, :],
+                                 results=results[i_start:i_start + 37, :],
+                                 weights=weights[i_start:i_start + 37])
+
+        coeffs_ref = np.linalg.lstsq(matrix * np.sqrt(weights)[:, np.newaxis],
+                                     results * np.sqrt(weights)[:, np.newaxis], rcond=None)[0]
+
+        self.expect_true(normal_equations.n_rows == 200, msg="wrong number of accumulated rows")
+        self.expect_isclose(normal_equations.solve(), coeffs_ref, atol=1e-10,
+                            msg="solution of the normal equations is wrong")
+
+        # rank deficient matrix yields the minimum norm solution
+        normal_equations = pygpc.NormalEquations(n_basis=31)
+        normal_equations.add(matrix=np.hstack((matrix, matrix[:, :1])), results=results)
+
+        self.expect_isclose(normal_equations.solve(),
+                            np.matmul(np.linalg.pinv(np.hstack((matrix, matrix[:, :1]))), results), atol=1e-6,
+                            msg="minimum norm solution of the normal equations is wrong")
+
+        print("done!\n")
+
+    def test_utils_020_shared_factorization(self):
+        """
+        Test the sharing of the factorization of identical gPC matrices between QoI specific gPCs
+        """
+
+        global folder, gpu
+        test_name = "test_utils_020_shared_factorization"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["order"] = [5, 5]
+        options["order_max"] = 5
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+
+        grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=60, options={"seed": 1})
+
+        # QoI specific gPCs (the last one has a different grid)
+        gpc = []
+        for i_qoi in range(3):
+            gpc.append(pygpc.Reg(problem=problem, order=[5, 5], order_max=5, order_max_norm=1, interaction_order=2,
+                                 interaction_order_current=2, options=options, validation=None))
+            gpc[i_qoi].grid = copy.deepcopy(grid) if i_qoi < 2 else \
+                pygpc.Random(parameters_random=problem.parameters_random, n_grid=60, options={"seed": 2})
+            gpc[i_qoi].init_gpc_matrix()
+
+        self.expect_true(gpc[0].get_matrix_key() == gpc[1].get_matrix_key(), msg="keys of identical matrices differ")
+        self.expect_true(gpc[0].get_matrix_key() != gpc[2].get_matrix_key(), msg="keys of different matrices match")
+
+        np.random.seed(1)
+        matrix_factorizations = dict()
+
+        for i_qoi in range(3):
+            results = np.random.rand(60, 1)
+            coeffs = pygpc.Algorithm.solve_shared(gpc=gpc[i_qoi],
+                                                  matrix_factorizations=matrix_factorizations,
+                                                  results=results,
+                                                  solver="Moore-Penrose")
+
+            self.expect_isclose(coeffs, np.linalg.lstsq(gpc[i_qoi].gpc_matrix, results, rcond=None)[0], atol=1e-10,
+                                msg="solution with shared factorization is wrong")
+
+        self.expect_true(gpc[1].matrix_factorization is gpc[0].matrix_factorization,
+                         msg="factorization of identical gPC matrix was not shared")
+        self.expect_true(len(matrix_factorizations) == 2, msg="wrong number of factorizations")
+
+        # QoIs with identical gPC matrices are solved at once
+        matrix_factorizations = dict()
+
+        for i_qoi in range(3):
+            gpc[i_qoi].matrix_factorization = None
+
+        results = [np.random.rand(60, i_qoi + 1) for i_qoi in range(3)]
+        n_solve = []
+
+        def solve_counted(_gpc):
+            def solve(**kwargs):
+                n_solve.append(kwargs["results"].shape[1])
+                return pygpc.Reg.solve(_gpc, **kwargs)
+            return solve
+
+        for i_qoi in range(3):
+            gpc[i_qoi].solve = solve_counted(gpc[i_qoi])
+
+        try:
+            coeffs = pygpc.Algorithm.solve_shared(gpc=gpc,
+                                                  matrix_factorizations=matrix_factorizations,
+                                                  results=results,
+                                                  solver="Moore-Penrose")
+        finally:
+            for i_qoi in range(3):
+                del gpc[i_qoi].solve
+
+        for i_qoi in range(3):
+            self.expect_isclose(coeffs[i_qoi], np.linalg.lstsq(gpc[i_qoi].gpc_matrix, results[i_qoi], rcond=None)[0],
+                                atol=1e-10, msg="solution of grouped QoIs is wrong")
+
+        self.expect_true(n_solve == [3, 3], msg="QoIs with identical gPC matrices were not solved at once")
+        self.expect_true(gpc[1].matrix_factorization is gpc[0].matrix_factorization and
+                         gpc[2].matrix_factorization is not gpc[0].matrix_factorization,
+                         msg="factorization of grouped QoIs was not shared")
+
+        # the factorization is not saved
+        gpc_loaded = pickle.loads(pickle.dumps(gpc[0]))
+
+        self.expect_true("matrix_factorization" not in gpc[0].__getstate__() and
+                         gpc_loaded.matrix_factorization is None,
+                         msg="factorization of the gPC matrix was saved")
+
+        print("done!\n")
+
+    def test_utils_021_cross_validation(self):
+        """
+        Test the cross validation engine (K-fold and leave-p-out) against a serial reference
+        """
+
+        global folder, gpu
+        test_name = "test_utils_021_cross_validation"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["order"] = [6, 6]
+        options["order_max"] = 6
+        options["interaction_order"] = 2
+        options["error_type"] = "loocv"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+        options["n_threads"] = 4
+
+        # underdetermined system (no closed form of the leave-one-out residuals)
+        gpc = pygpc.Reg(problem=problem, order=[6, 6], order_max=6, order_max_norm=1, interaction_order=2,
+                        interaction_order_current=2, options=options, validation=None)
+        gpc.grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=20, options={"seed": 1})
+        gpc.init_gpc_matrix()
+
+        np.random.seed(1)
+        results = np.random.rand(20, 3)
+        coeffs = gpc.solve(results=results, solver="Moore-Penrose", settings=None)
+        matrix_factorization = gpc.matrix_factorization
+
+        for cv_scheme, n_folds, p, n_max in [("kfold", 5, 1, 25), ("leave_p_out", 10, 1, 10),
+                                             ("leave_p_out", 10, 2, 8)]:
+            gpc.cv_scheme = cv_scheme
+            gpc.cv_n_folds = n_folds
+            gpc.cv_p = p
+            gpc.cv_n_max = n_max
+
+            error = gpc.get_loocv(coeffs=coeffs, results=results)
+
+            self.expect_true(error == gpc.get_loocv(coeffs=coeffs, results=results),
+                             msg="cross validation error is not reproducible")
+
+            # serial reference
+            folds = pygpc.CrossValidation(scheme=cv_scheme, n_folds=n_folds, p=p, n_max=n_max).get_folds(20)
+            residuals = []
+            for test_idx in folds:
+                mask = np.ones(20, dtype=bool)
+                mask[test_idx] = False
+                coeffs_fold = np.linalg.pinv(gpc.gpc_matrix[mask, :]) @ results[mask, :]
+                residuals.append(results[test_idx, :] - gpc.gpc_matrix[test_idx, :] @ coeffs_fold)
+            residuals = np.vstack(residuals)
+            sample_idx = np.concatenate(folds)
+
+            self.expect_true(len(folds) == {"kfold": 5, "leave_p_out": n_max}[cv_scheme],
+                             msg="wrong number of folds")
+            self.expect_isclose(error, np.mean(np.linalg.norm(residuals, axis=1) /
+                                               np.linalg.norm(results[sample_idx, :], axis=1)),
+                                atol=1e-10, msg="cross validation error is wrong")
+            self.expect_isclose(gpc.loocv_statistics["error_rms"], np.sqrt(np.mean(residuals ** 2, axis=0)),
+                                atol=1e-10, msg="error statistics of the outputs are wrong")
+
+        self.expect_true(np.array_equal(np.sort(np.concatenate(
+            pygpc.CrossValidation(scheme="kfold", n_folds=5).get_folds(20))), np.arange(20)),
+            msg="folds of kfold scheme are not a partition of the samples")
+        self.expect_true(gpc.matrix_factorization is matrix_factorization,
+                         msg="cross validation changed the solver state of the gPC")
+
+        print("done!\n")
+
+    def test_utils_022_validation_matrix(self):
+        """
+        Test the cached gPC matrix of the validation set, which is extended by the columns of new basis functions
+        """
+
+        global folder, gpu
+        test_name = "test_utils_022_validation_matrix"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        parameters["x3"] = 0.
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "reg"
+        options["solver"] = "Moore-Penrose"
+        options["settings"] = None
+        options["error_type"] = "nrmsd"
+        options["error_norm"] = "relative"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+        options["verbose"] = False
+
+        # validation set
+        grid_val = pygpc.Random(parameters_random=problem.parameters_random, n_grid=200, options={"seed": 2})
+        results_val = pygpc.Computation(n_cpu=0).run(model=problem.model, problem=problem, coords=grid_val.coords)
+        validation = pygpc.ValidationSet(grid=grid_val, results=results_val)
+
+        gpc = pygpc.Reg(problem=problem, order=[3, 3], order_max=3, order_max_norm=1, interaction_order=2,
+                        interaction_order_current=2, options=options, validation=validation)
+        gpc.grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=100, options={"seed": 1})
+        gpc.init_gpc_matrix()
+        results = pygpc.Computation(n_cpu=0).run(model=problem.model, problem=problem, coords=gpc.grid.coords)
+
+        # basis of higher order (the basis functions of the lower order keep their ids)
+        gpc_extended = pygpc.Reg(problem=problem, order=[6, 6], order_max=6, order_max_norm=1, interaction_order=2,
+                                 interaction_order_current=2, options=options, validation=None)
+
+        for i_iter in range(2):
+            coeffs = gpc.solve(results=results, solver="Moore-Penrose", settings=None)
+            error = gpc.validate(coeffs=coeffs, results=results)
+            gpc_results = gpc.get_approximation(coeffs, grid_val.coords_norm)
+
+            self.expect_isclose(error, float(np.mean(pygpc.nrmsd(gpc_results, results_val, error_norm="relative",
+                                                                 x_axis=False))), atol=1e-10,
+                                msg="validation error with cached gPC matrix is wrong")
+            self.expect_true(gpc.validation_matrix.shape == (200, gpc.basis.n_basis),
+                             msg="wrong shape of cached gPC matrix of validation set")
+
+            if i_iter == 0:
+                validation_matrix = gpc.validation_matrix.copy()
+                n_basis = gpc.basis.n_basis
+                gpc.basis.extend_basis(gpc_extended.basis.b)
+                gpc.update_gpc_matrix()
+
+        self.expect_true(np.array_equal(gpc.validation_matrix[:, :n_basis], validation_matrix),
+                         msg="columns of cached gPC matrix of validation set were not reused")
+        self.expect_isclose(gpc.validation_matrix, gpc.create_gpc_matrix(b=gpc.basis.b, x=grid_val.coords_norm),
+                            atol=1e-12, msg="cached gPC matrix of validation set is wrong")
+
+        # the cached gPC matrix of the validation set is not saved and is rebuilt on demand
+        gpc_copy = copy.deepcopy(gpc)
+
+        self.expect_true(gpc_copy.validation_matrix is None, msg="cached gPC matrix of validation set was saved")
+        self.expect_isclose(gpc_copy.get_validation_matrix(), gpc.validation_matrix, atol=1e-12,
+                            msg="rebuilt gPC matrix of validation set is wrong")
+
+        print("done!\n")
+
+    def test_utils_023_validation_store(self):
+        """
+        Test the reuse and the incremental extension of validation sets in the validation set store
+        """
+
+        global folder, gpu
+        test_name = "test_utils_023_validation_store"
+        print(test_name)
+
+        fn_store = os.path.join(folder, test_name + ".hdf5")
+
+        if os.path.exists(fn_store):
+            os.remove(fn_store)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        parameters["x3"] = 0.
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        validation = pygpc.ValidationSet(problem=problem).create_stored(fname=fn_store, n_samples=100, seed=1, n_cpu=0)
+        key = pygpc.ValidationSet.get_key(problem=problem, seed=1)
+
+        # modify stored results to detect if they are reused
+        with h5py.File(fn_store, "a") as f:
+            f["validation_store/" + key + "/model_evaluations/results"][:] *= 2
+
+        validation_reused = pygpc.ValidationSet(problem=problem).create_stored(fname=fn_store, n_samples=100, seed=1,
+                                                                               n_cpu=0)
+        self.expect_isclose(validation_reused.results, 2 * validation.results, atol=1e-12,
+                            msg="validation set was not reused")
+
+        # extension (only the new samples are evaluated and the grid is identical to a newly created one)
+        validation_extended = pygpc.ValidationSet(problem=problem).create_stored(fname=fn_store, n_samples=150,
+                                                                                 seed=1, n_cpu=0)
+        grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=150, options={"seed": 1})
+        results = pygpc.Computation(n_cpu=0).run(model=problem.model, problem=problem, coords=grid.coords)
+
+        self.expect_isclose(validation_extended.grid.coords, grid.coords, atol=1e-12,
+                            msg="extended validation set has wrong grid")
+        self.expect_isclose(validation_extended.results[:100, :], 2 * validation.results, atol=1e-12,
+                            msg="stored samples were not reused in extended validation set")
+        self.expect_isclose(validation_extended.results[100:, :], results[100:, :], atol=1e-12,
+                            msg="extended validation set has wrong results")
+
+        # extension of stored samples, which are not the start of the seeded random grid, is reproducible
+        fn_store_copy = os.path.join(folder, test_name + "_copy.hdf5")
+
+        with h5py.File(fn_store, "a") as f:
+            f["validation_store/" + key + "/grid/coords_norm"][0, 0] *= 0.5
+
+        shutil.copyfile(fn_store, fn_store_copy)
+
+        validation_extended = [pygpc.ValidationSet(problem=problem).create_stored(fname=fn, n_samples=200, seed=1,
+                                                                                  n_cpu=0)
+                               for fn in [fn_store, fn_store_copy]]
+
+        self.expect_isclose(validation_extended[0].grid.coords_norm, validation_extended[1].grid.coords_norm,
+                            atol=1e-12, msg="extension of validation set is not reproducible")
+        self.expect_isclose(validation_extended[0].grid.coords[:150, :], grid.coords, atol=1e-12,
+                            msg="stored samples were not reused in extended validation set")
+        self.expect_true(not np.isclose(validation_extended[0].grid.coords_norm[150:, :],
+                                        grid.coords_norm[:50, :]).all(),
+                         msg="extension of validation set repeats the stored samples")
+
+        # different problem (constant parameter) and different seed use separate entries
+        parameters["x3"] = 0.5
+        problem_modified = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+        self.expect_true(pygpc.ValidationSet.get_key(problem=problem_modified, seed=1) != key,
+                         msg="key does not depend on constant parameters")
+        self.expect_true(pygpc.ValidationSet.get_key(problem=problem, seed=2) != key,
+                         msg="key does not depend on seed")
+
+        print("done!\n")
+
+    def test_utils_024_basis_legacy_pickle(self):
+        """
+        Test loading a pickled Basis object of the former layout, which contains the BasisFunction objects (b)
+        """
+
+        global folder, gpu
+        test_name = "test_utils_024_basis_legacy_pickle"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[2, 3], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Norm(pdf_shape=[0.5, 0.2])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        basis = pygpc.Basis()
+        basis.init_basis_sgpc(problem=problem, order=[4, 4], order_max=4, order_max_norm=1, interaction_order=2)
+
+        # state of the former layout (BasisFunction objects instead of the tables of the univariate basis functions)
+        state_legacy = {"b": basis.b,
+                        "b_array": None,
+                        "b_array_grad": None,
+                        "b_id": basis.b_id,
+                        "b_norm": basis.b_norm,
+                        "b_norm_basis": basis.b_norm_basis,
+                        "dim": basis.dim,
+                        "n_basis": basis.n_basis,
+                        "multi_indices": basis.multi_indices}
+
+        class BasisLegacy(object):
+            def __reduce_ex__(self, protocol):
+                return copyreg._reconstructor, (pygpc.Basis, object, None), state_legacy
+
+        basis_legacy = pickle.loads(pickle.dumps(BasisLegacy()))
+
+        self.expect_true(isinstance(basis_legacy, pygpc.Basis), msg="legacy pickle was not loaded as Basis")
+        self.expect_true(basis_legacy.b_id == basis.b_id, msg="IDs of basis functions were not kept")
+        self.expect_true([[_b_dim.p for _b_dim in _b] for _b in basis_legacy.b] ==
+                         [[_b_dim.p for _b_dim in _b] for _b in basis.b],
+                         msg="basis functions of legacy pickle are wrong")
+
+        for key in ["multi_indices", "b_array", "b_array_grad", "b_norm", "b_norm_basis", "b_coeffs_table"]:
+            self.expect_isclose(getattr(basis_legacy, key), getattr(basis, key), atol=1e-12,
+                                msg="{} of legacy pickle is wrong".format(key))
+
+        print("done!\n")
+
+    def test_utils_025_gradient_gpc_matrix(self):
+        """
+        Test the gradient gPC matrix of the backends ["python", "cpu", "omp"] against finite differences
+        """
+
+        global folder, gpu
+        test_name = "test_utils_025_gradient_gpc_matrix"
+        print(test_name)
+
+        # define problem (Jacobi, Hermite and Laguerre polynomials)
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[2.5, 1.5], pdf_limits=[0, 1])
+        parameters["x2"] = pygpc.Norm(pdf_shape=[0.5, 0.2])
+        parameters["x3"] = pygpc.Gamma(pdf_shape=[2.5, 2., 0.])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        grid = pygpc.Random(parameters_random=problem.parameters_random, n_grid=20, options={"seed": 1})
+        x = grid.coords_norm
+        dx = 1e-6
+
+        for backend in ["python", "cpu", "omp"]:
+            options = dict()
+            options["backend"] = backend
+            options["gradient_enhanced"] = True
+
+            gpc = pygpc.Reg(problem=problem, order=[5, 5, 5], order_max=5, order_max_norm=1, interaction_order=3,
+                            interaction_order_current=3, options=options, validation=None)
+
+            try:
+                gpc_matrix_gradient = gpc.create_gpc_matrix(b=gpc.basis.b, x=x, gradient=True,
+                                                            gradient_idx=np.arange(x.shape[0]))
+            except NotImplementedError:
+                warnings.warn("Skipping {} (not installed)...".format(backend))
+                continue
+
+            # reference: central differences of the gPC matrix
+            gpc_matrix_gradient_ref = np.stack(
+                [(gpc.create_gpc_matrix(b=gpc.basis.b, x=x + dx * np.eye(3)[i_dim]) -
+                  gpc.create_gpc_matrix(b=gpc.basis.b, x=x - dx * np.eye(3)[i_dim])) / (2 * dx)
+                 for i_dim in range(3)], axis=2)
+
+            self.expect_isclose(gpc_matrix_gradient, gpc_matrix_gradient_ref, rtol=1e-6, atol=1e-6,
+                                msg="gradient gPC matrix of {} backend is wrong".format(backend))
+
+            # subset of the basis (polynomial coefficients collected on the fly)
+            self.expect_isclose(gpc.create_gpc_matrix(b=gpc.basis.b[::3], x=x, gradient=True),
+                                gpc_matrix_gradient_ref[:, ::3, :], rtol=1e-6, atol=1e-6,
+                                msg="gradient gPC matrix of basis subset of {} backend is wrong".format(backend))
+
+        print("done!\n")
+
+    def test_utils_026_normal_equations_quadrature(self):
+        """
+        Test the normal equations weighted with the quadrature weights of a tensor grid against the numerical
+        integration
+        """
+
+        global folder, gpu
+        test_name = "test_utils_026_normal_equations_quadrature"
+        print(test_name)
+
+        # define problem
+        parameters = OrderedDict()
+        parameters["x1"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[1.2, 2])
+        parameters["x2"] = pygpc.Beta(pdf_shape=[1, 1], pdf_limits=[0, 0.6])
+        problem = pygpc.Problem(pygpc.testfunctions.Peaks(), parameters)
+
+        # gPC options
+        options = dict()
+        options["method"] = "quad"
+        options["solver"] = "NumInt"
+        options["settings"] = None
+        options["order"] = [6, 6]
+        options["order_max"] = 6
+        options["interaction_order"] = 2
+        options["error_type"] = "nrmsd"
+        options["n_cpu"] = 0
+        options["fn_results"] = None
+        options["backend"] = "python"
+
+        # setup gPC on a tensor grid integrating the products of the basis functions exactly
+        gpc = pygpc.Quad(problem=problem, order=[6, 6], order_max=6, order_max_norm=1, interaction_order=2,
+                         interaction_order_current=2, options=options, validation=None)
+        gpc.grid = pygpc.TensorGrid(parameters_random=problem.parameters_random,
+                                    options={"grid_type": ["jacobi", "jacobi"], "n_dim": [7, 7]})
+        gpc.init_gpc_matrix()
+
+        results = np.vstack((np.exp(gpc.grid.coords_norm[:, 0]) * np.sin(gpc.grid.coords_norm[:, 1]),
+                             gpc.grid.coords_norm[:, 0] ** 3 * gpc.grid.coords_norm[:, 1])).transpose()
+
+        coeffs_ref = gpc.solve(results=results, solver="NumInt")
+
+        for settings in [{"block_size": 10}, {}]:
+            coeffs = gpc.solve(results=results, solver="NormalEquations", settings=settings)
+
+            self.expect_isclose(coeffs, coeffs_ref, atol=1e-10,
+                                msg="normal equations with settings {} do not match the numerical "
+                                    "integration".format(settings))
+
+        # gPC matrix evaluated on the fly
+        gpc.gpc_matrix = None
+        coeffs = gpc.solve(results=results, solver="NormalEquations", settings={"block_size": 10})
+
+        self.expect_isclose(coeffs, coeffs_ref, atol=1e-10,
+                            msg="matrix-free normal equations do not match the numerical integration")
+
+        print("done!\n")
+
 
 if __name__ == "__main__":
     unittest.main()